@@ -1,4 +1,11 @@
 from .meeting_points import router as meeting_points_router
+from .saved_meeting_points import router as saved_meeting_points_router
+from .metrics import router as metrics_router
 from .health import router as health_router
 
-__all__ = ["meeting_points_router", "health_router"]
\ No newline at end of file
+__all__ = [
+    "meeting_points_router",
+    "saved_meeting_points_router",
+    "metrics_router",
+    "health_router"
+]
@@ -1,35 +1,147 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import json
+import time
 
 from app.schemas import (
     MeetingPointRequest,
     MeetingPointResponse,
-    LocationInput
+    LocationInput,
+    GeocodeBatchRequest,
+    MeetingPointBatchRequest,
+    BatchSummary
 )
-from app.services import TfLService, GeocodingService, MeetingCalculator
+from app.services import (
+    TfLService,
+    GeocodingService,
+    MeetingCalculator,
+    PersistentStore,
+    Gazetteer,
+    TravelMatrix
+)
+from app.services.polyline import encode_paths
+from app.services.response_shaping import response_exclusions, serialize_response
+from app.api.responses import json_response
 from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS
+from app.core.constants import STATION_CATALOGUE
 
 router = APIRouter()
 
-tfl_service = TfLService(settings.tfl_app_id, settings.tfl_app_key)
-geocoding_service = GeocodingService()
-meeting_calculator = MeetingCalculator(tfl_service, geocoding_service)
+_CALCULATE_SECONDS = STAGE_SECONDS.labels("calculate")
+_SERIALIZE_SECONDS = STAGE_SECONDS.labels("serialize")
+
+persistent_store = (
+    PersistentStore(settings.persistent_store_path)
+    if settings.persistent_store_path
+    else None
+)
+tfl_service = TfLService(settings.tfl_app_id, settings.tfl_app_key, store=persistent_store)
+gazetteer = Gazetteer.from_bundled_data()
+geocoding_service = GeocodingService(store=persistent_store, gazetteer=gazetteer)
+travel_matrix = TravelMatrix.load(
+    settings.travel_matrix_path,
+    settings.travel_matrix_access_stations
+)
+meeting_calculator = MeetingCalculator(tfl_service, geocoding_service, travel_matrix)
+
+
+def _shape(response: MeetingPointResponse, request: MeetingPointRequest) -> MeetingPointResponse:
+    """Apply the request's output options to a calculated response"""
+    if request.path_format == "polyline" and request.detail == "full":
+        return encode_paths(response)
+    return response
+
+
+def _render(response: MeetingPointResponse, request: MeetingPointRequest) -> bytes:
+    """Shaped response JSON: path format, then detail level and leg fields"""
+    with _SERIALIZE_SECONDS.time():
+        return serialize_response(_shape(response, request), request.detail, request.leg_fields)
 
 
 @router.post("/calculate", response_model=MeetingPointResponse)
-async def calculate_meeting_point(request: MeetingPointRequest):
+async def calculate_meeting_point(request: MeetingPointRequest, http_request: Request):
     try:
-        result = await meeting_calculator.find_meeting_point(
-            request.locations,
-            request.use_tfl_api
-        )
-        return result
+        with _CALCULATE_SECONDS.time():
+            result = await meeting_calculator.find_meeting_point(
+                request.locations,
+                request.use_tfl_api,
+                request.use_travel_matrix,
+                request.strategy,
+                request.max_api_calls
+            )
+        start = time.perf_counter()
+        body = _render(result, request)
+        return json_response(body, http_request, time.perf_counter() - start)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/calculate/stream")
+async def calculate_meeting_point_stream(request: MeetingPointRequest):
+    """Server-Sent Events variant of /calculate.
+    
+    Emits ``estimate`` (distance-model ranking) straight away, ``station`` as
+    each TfL journey resolves, then ``result`` with the MeetingPointResponse,
+    or ``error`` if the request cannot be answered.
+    """
+    async def events():
+        try:
+            async for event, payload in meeting_calculator.stream_meeting_point(
+                request.locations,
+                request.use_tfl_api,
+                request.use_travel_matrix,
+                request.strategy,
+                request.max_api_calls
+            ):
+                if isinstance(payload, MeetingPointResponse):
+                    data = _render(payload, request).decode()
+                else:
+                    data = json.dumps(payload)
+                yield f"event: {event}\ndata: {data}\n\n"
+        except ValueError as e:
+            yield f"event: error\ndata: {json.dumps({'status': 400, 'detail': str(e)})}\n\n"
+        except Exception as e:
+            error = {'status': 500, 'detail': f'Internal server error: {str(e)}'}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/calculate/batch")
+async def calculate_meeting_points_batch(request: MeetingPointBatchRequest):
+    """Answer many meeting-point requests, streaming NDJSON as each completes.
+    
+    Each line is ``{"index", "result", "error"}``; the last line is
+    ``{"summary": {...}}`` with the journey deduplication counts.
+    """
+    async def results():
+        async for item in meeting_calculator.find_meeting_points_batch(request.requests):
+            if isinstance(item, BatchSummary):
+                yield json.dumps({"summary": item.model_dump()}) + "\n"
+            else:
+                item_request = request.requests[item.index]
+                with _SERIALIZE_SECONDS.time():
+                    exclude = None
+                    if item.result:
+                        item.result = _shape(item.result, item_request)
+                        exclusions = response_exclusions(
+                            item_request.detail, item_request.leg_fields
+                        )
+                        exclude = {"result": exclusions} if exclusions else None
+                    line = item.model_dump_json(exclude=exclude) + "\n"
+                yield line
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.post("/geocode")
 async def geocode_address(address: str):
     try:
@@ -46,17 +158,65 @@ async def geocode_address(address: str):
         raise HTTPException(status_code=500, detail=f"Geocoding error: {str(e)}")
 
 
+@router.post("/geocode/batch")
+async def geocode_addresses(request: GeocodeBatchRequest):
+    """Geocode many addresses at once, streaming NDJSON lines as each resolves"""
+    async def results():
+        async for index, address, coords in geocoding_service.geocode_many(request.addresses):
+            line = {
+                "index": index,
+                "address": address,
+                "found": coords is not None,
+                "latitude": coords[0] if coords else None,
+                "longitude": coords[1] if coords else None
+            }
+            yield json.dumps(line) + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get("/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """Type-ahead suggestions from the offline gazetteer"""
+    return {"query": q, "results": gazetteer.complete(q, limit)}
+
+
 @router.get("/stations")
-async def get_stations():
-    from app.core.constants import LONDON_STATIONS
+async def get_stations(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
+    page = STATION_CATALOGUE[offset:offset + limit]
+    next_offset = offset + len(page)
+    
+    return {
+        "stations": page,
+        "total": len(STATION_CATALOGUE),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if next_offset < len(STATION_CATALOGUE) else None
+    }
+
+
+@router.get("/stations/nearest")
+async def get_nearest_stations(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    limit: int = Query(5, ge=1, le=50),
+    max_distance_km: Optional[float] = Query(None, gt=0)
+):
+    station_index = meeting_calculator.station_index
+    nearest = station_index.nearest(latitude, longitude, limit, max_distance_km)
     
     stations = [
         {
-            "name": name,
-            "latitude": coords[0],
-            "longitude": coords[1]
+            **STATION_CATALOGUE[station_id],
+            "distance_km": round(distance_km, 3)
         }
-        for name, coords in LONDON_STATIONS.items()
+        for station_id, distance_km in nearest
     ]
     
-    return {"stations": stations, "total": len(stations)}
\ No newline at end of file
+    return {"stations": stations, "total": len(stations)}
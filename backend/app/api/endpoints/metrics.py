@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Response
+
+from app.api.endpoints.meeting_points import tfl_service, geocoding_service, meeting_calculator
+from app.core.metrics import REGISTRY, CallbackMetric
+
+router = APIRouter()
+
+# Starlette appends "; charset=utf-8" to text/ media types
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _cache_stats():
+    geocoder = geocoding_service.cache_stats()
+    return {
+        "journey": tfl_service.cache_stats(),
+        "geocode": geocoder["geocode"],
+        "reverse_geocode": geocoder["reverse"],
+        "result": meeting_calculator.cache_stats()
+    }
+
+
+def _per_cache(field: str):
+    return lambda: {(cache,): stats[field] for cache, stats in _cache_stats().items()}
+
+
+def _coalescing(field: str):
+    return lambda: {
+        ("tfl",): tfl_service.coalescing_stats()[field],
+        ("geocoder",): geocoding_service.cache_stats()["coalescing"][field]
+    }
+
+
+def _scheduler(field: str):
+    return lambda: {(): tfl_service.scheduler.stats()[field]}
+
+
+def _hedging(field: str):
+    return lambda: {(): tfl_service.latency.stats()[field]}
+
+
+def _hedge_threshold():
+    threshold = tfl_service.latency.stats()["threshold_seconds"]
+    return {} if threshold is None else {(): threshold}
+
+
+def _latency_quantiles():
+    quantiles = tfl_service.latency.quantiles()
+    return {(f"{q:g}",): value for q, value in quantiles.items() if value is not None}
+
+
+def _estimator_mae():
+    mae = tfl_service.estimator.stats()["recent_mae_minutes"]
+    return {(model,): value for model, value in mae.items() if value is not None}
+
+
+for metric in (
+    CallbackMetric(
+        "where2meet_cache_hits_total", "Cache hits",
+        "counter", _per_cache("hits"), ["cache"]
+    ),
+    CallbackMetric(
+        "where2meet_cache_misses_total", "Cache misses",
+        "counter", _per_cache("misses"), ["cache"]
+    ),
+    CallbackMetric(
+        "where2meet_cache_evictions_total", "Entries evicted for capacity",
+        "counter", _per_cache("evictions"), ["cache"]
+    ),
+    CallbackMetric(
+        "where2meet_cache_entries", "Entries currently cached",
+        "gauge", _per_cache("entries"), ["cache"]
+    ),
+    CallbackMetric(
+        "where2meet_coalesced_calls_total",
+        "Upstream calls saved by joining an identical in-flight call",
+        "counter", _coalescing("coalesced"), ["upstream"]
+    ),
+    CallbackMetric(
+        "where2meet_tfl_in_flight", "TfL requests currently in flight",
+        "gauge", _scheduler("in_flight")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_waiting", "TfL requests queued for a scheduler slot",
+        "gauge", _scheduler("waiting")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_admitted_total", "TfL requests admitted by the scheduler",
+        "counter", _scheduler("admitted")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_backoffs_total", "Scheduler pauses after 429/503 responses",
+        "counter", _scheduler("backoffs")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_latency_quantile_seconds",
+        "Quantiles of recent successful TfL call latencies, "
+        "the window the hedge threshold is taken from",
+        "gauge", _latency_quantiles, ["quantile"]
+    ),
+    CallbackMetric(
+        "where2meet_tfl_hedge_threshold_seconds",
+        "Seconds after which an unanswered TfL call is duplicated",
+        "gauge", _hedge_threshold
+    ),
+    CallbackMetric(
+        "where2meet_tfl_hedges_total", "TfL calls duplicated after passing the hedge threshold",
+        "counter", _hedging("hedged")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_hedge_wins_total", "Hedged TfL calls answered by the duplicate first",
+        "counter", _hedging("hedge_wins")
+    ),
+    CallbackMetric(
+        "where2meet_tfl_hedges_rationed_total",
+        "TfL calls past the hedge threshold not duplicated for lack of budget",
+        "counter", _hedging("rationed")
+    ),
+    CallbackMetric(
+        "where2meet_estimator_samples", "Live journeys the journey-time estimator is fitted to",
+        "gauge", lambda: {(): tfl_service.estimator.stats()["samples"]}
+    ),
+    CallbackMetric(
+        "where2meet_estimator_recent_mae_minutes",
+        "Mean absolute estimate error over recent live journeys (calibrated model vs fixed curve)",
+        "gauge", _estimator_mae, ["model"]
+    )
+):
+    REGISTRY.register(metric)
+
+
+@router.get("")
+async def metrics():
+    """Prometheus text exposition of latency histograms, counters and cache stats"""
+    return Response(content=REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
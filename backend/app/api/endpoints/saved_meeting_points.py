@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, Request
+import logging
+import time
+
+from app.schemas import SavedMeetingPoint, SaveMeetingPointRequest
+from app.services import SQLiteMeetingPointStore
+from app.api.responses import json_response
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+meeting_point_store = SQLiteMeetingPointStore(
+    settings.saved_meeting_points_path or settings.persistent_store_path or ":memory:"
+)
+if meeting_point_store.path == ":memory:":
+    logger.warning(
+        "No SAVED_MEETING_POINTS_PATH or PERSISTENT_STORE_PATH set; "
+        "saved meeting points last until restart"
+    )
+
+
+@router.post("", response_model=SavedMeetingPoint, status_code=201)
+async def save_meeting_point(request: SaveMeetingPointRequest, http_request: Request):
+    """Save a calculated meeting point; public ones get a share token"""
+    start = time.perf_counter()
+    saved = meeting_point_store.save(
+        request.meeting_data,
+        request.name,
+        request.description,
+        request.user_id,
+        request.is_public
+    )
+    body = saved.model_dump_json().encode()
+    return json_response(body, http_request, time.perf_counter() - start, status_code=201)
+
+
+@router.get("/shared/{share_token}", response_model=SavedMeetingPoint)
+async def get_shared_meeting_point(share_token: str, http_request: Request):
+    body = meeting_point_store.get_shared_json(share_token)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Shared meeting point not found")
+    return json_response(body, http_request)
+
+
+@router.get("/{saved_id}", response_model=SavedMeetingPoint)
+async def get_saved_meeting_point(saved_id: str, http_request: Request):
+    """A saved point by its id, which is unguessable and the saver's key to it, public or not"""
+    body = meeting_point_store.get_json(saved_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Saved meeting point not found")
+    return json_response(body, http_request)
@@ -0,0 +1,88 @@
+from fastapi import Request, Response
+from typing import Optional, Tuple
+import gzip
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_COMPRESS_SECONDS = STAGE_SECONDS.labels("compress")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br (when brotli is installed) or gzip from an Accept-Encoding header"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in ("br", "gzip"):
+        if coding == "br" and not brotli:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a body for the client, or return it as is when small or not accepted"""
+    if len(body) < settings.response_compression_min_bytes:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.response_brotli_quality), encoding
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.response_gzip_level), encoding
+    return body, None
+
+
+def json_response(
+    body: bytes,
+    request: Request,
+    serialize_seconds: float = 0.0,
+    status_code: int = 200
+) -> Response:
+    """Response for pre-serialized JSON, compressed as the client allows.
+
+    Serialization and compression times go out in a Server-Timing header
+    alongside the logged sizes.
+    """
+    start = time.perf_counter()
+    content, encoding = compress(body, request.headers.get("accept-encoding"))
+    compress_seconds = time.perf_counter() - start
+    _COMPRESS_SECONDS.observe(compress_seconds)
+
+    headers = {
+        "Vary": "Accept-Encoding",
+        "Server-Timing": (
+            f"serialize;dur={serialize_seconds * 1000:.2f}, "
+            f"compress;dur={compress_seconds * 1000:.2f}"
+        )
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    logger.info(
+        f"Response {len(body)} bytes serialized in {serialize_seconds * 1000:.2f} ms, "
+        f"sent {len(content)} bytes ({encoding or 'identity'})"
+    )
+    return Response(
+        content=content,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
@@ -18,8 +18,82 @@ class Settings(BaseSettings):
     
     tfl_app_id: Optional[str] = None
     tfl_app_key: Optional[str] = None
+    # Point at a local stand-in (python -m benchmarks.mock_tfl) for load tests
+    tfl_api_base_url: str = "https://api.tfl.gov.uk"
+    tfl_max_concurrency: int = 20
+    tfl_rate_limit_per_minute: int = 500
+    tfl_rate_limit_burst: int = 50
+    tfl_max_retries: int = 2
+    tfl_retry_backoff_seconds: float = 1.0
+    tfl_max_retry_after_seconds: float = 30.0
+    tfl_connect_timeout_seconds: float = 5.0
+    tfl_read_timeout_seconds: float = 15.0
+    tfl_max_connections: int = 20
+    tfl_max_keepalive_connections: int = 20
+    tfl_keepalive_expiry_seconds: float = 30.0
+    # Multiplexes TfL calls over one connection when the optional h2 package is installed
+    tfl_http2: bool = True
+    # Duplicate a TfL call still unanswered at this quantile of recent latencies
+    tfl_hedge_requests: bool = True
+    tfl_hedge_quantile: float = 0.95
+    tfl_hedge_min_samples: int = 50
+    tfl_hedge_min_delay_seconds: float = 0.1
+    tfl_hedge_max_fraction: float = 0.1
     
     geocoder_user_agent: str = "where2meet_api"
+    geocoder_max_workers: int = 2
+    geocoder_requests_per_second: float = 1.0
+    
+    journey_cache_ttl_seconds: int = 900
+    journey_cache_max_entries: int = 5000
+    journey_cache_max_bytes: Optional[int] = 64 * 1024 * 1024
+    journey_cache_grid_metres: float = 50.0
+    journey_cache_time_bucket_minutes: int = 15
+    
+    result_cache_ttl_seconds: int = 300
+    result_cache_max_entries: int = 1000
+    
+    geocode_cache_ttl_seconds: int = 86400
+    geocode_cache_max_entries: int = 10000
+    geocode_negative_cache_ttl_seconds: int = 3600
+    
+    persistent_store_path: Optional[str] = None
+    persistent_store_journey_ttl_seconds: int = 3 * 86400
+    persistent_store_geocode_ttl_seconds: int = 30 * 86400
+    persistent_store_warm_entries: int = 2000
+    
+    # Falls back to persistent_store_path, then to an in-memory database
+    saved_meeting_points_path: Optional[str] = None
+    
+    path_simplify_tolerance_metres: float = 10.0
+    
+    response_compression_min_bytes: int = 1024
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 4
+    
+    travel_matrix_path: Optional[str] = None
+    travel_matrix_access_stations: int = 3
+    
+    # Journey-time estimator calibrated on live TfL journeys (persisted in the persistent store)
+    estimator_min_samples: int = 50
+    estimator_refit_every: int = 100
+    estimator_max_samples: int = 20000
+    estimator_cell_km: float = 2.0
+    
+    # Candidate fan-out: stations whose estimated max time is within
+    # candidate_gap_z standard deviations (of the difference of two estimates)
+    # of the leader's are evaluated, between the min and max station counts,
+    # within a per-request TfL call budget
+    candidate_min_stations: int = 4
+    candidate_max_stations: int = 15
+    candidate_gap_z: float = 0.25
+    candidate_call_budget: int = 70
+    
+    prune_dominated_candidates: bool = True
+    batch_max_concurrency: int = 50
+    
+    greedy_max_iterations: int = 10
+    greedy_neighbors_per_step: int = 3
     
     class Config:
         env_file = ".env"
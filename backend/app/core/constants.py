@@ -1,27 +1,17 @@
+import json
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+STATIONS_FILE = DATA_DIR / "stations.json"
+GAZETTEER_FILE = DATA_DIR / "gazetteer.json"
+LINES_FILE = DATA_DIR / "lines.json"
+TRAVEL_MATRIX_FILE = DATA_DIR / "travel_matrix.npy"
+
+# Tube, DLR, Overground and Elizabeth line stations, loaded once at import
+with open(STATIONS_FILE, encoding="utf-8") as f:
+    STATION_CATALOGUE = json.load(f)["stations"]
+
 LONDON_STATIONS = {
-    "King's Cross St. Pancras": (51.5308, -0.1238),
-    "Oxford Circus": (51.5152, -0.1415),
-    "Victoria": (51.4952, -0.1439),
-    "Liverpool Street": (51.5178, -0.0823),
-    "Waterloo": (51.5031, -0.1132),
-    "London Bridge": (51.5055, -0.0877),
-    "Paddington": (51.5154, -0.1755),
-    "Leicester Square": (51.5113, -0.1281),
-    "Bank": (51.5133, -0.0886),
-    "Canary Wharf": (51.5035, -0.0184),
-    "Stratford": (51.5414, -0.0034),
-    "Holborn": (51.5174, -0.1201),
-    "Tottenham Court Road": (51.5165, -0.1309),
-    "Bond Street": (51.5142, -0.1494),
-    "Green Park": (51.5067, -0.1428),
-    "Westminster": (51.5013, -0.1251),
-    "Piccadilly Circus": (51.5100, -0.1344),
-    "Covent Garden": (51.5129, -0.1243),
-    "Euston": (51.5282, -0.1337),
-    "Moorgate": (51.5186, -0.0886),
-    "Camden Town": (51.5392, -0.1426),
-    "Shoreditch High Street": (51.5235, -0.0754),
-    "Clapham Junction": (51.4641, -0.1703),
-    "Hammersmith": (51.4929, -0.2229),
-    "Angel": (51.5322, -0.1058)
-}
\ No newline at end of file
+    station["name"]: (station["latitude"], station["longitude"])
+    for station in STATION_CATALOGUE
+}
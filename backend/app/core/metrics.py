@@ -0,0 +1,239 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import time
+
+# Seconds; spans a gazetteer hit (~us) to a slow TfL fan-out (~10 s)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, *values: str):
+        """The child series for these label values; bind it once for hot paths"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh series for one set of label values"""
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Sequence[Tuple[str, str]], float]]:
+        """(suffix, label values, extra labels, value) for every series"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra_labels, value in self.samples():
+            names = self.labelnames + tuple(name for name, _ in extra_labels)
+            labels = _label_text(names, values + tuple(label for _, label in extra_labels))
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in self._children.items():
+            yield "", values, (), child.value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per upper bound, plus +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def samples(self):
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", values, (("le", _format_value(bound)),), cumulative
+            yield "_count", values, (), cumulative
+            yield "_sum", values, (), child.sum
+
+
+class CallbackMetric(_Metric):
+    """Counter or gauge whose values are read from ``fn`` at scrape time.
+
+    For figures already kept elsewhere (cache and scheduler stats), so the
+    hot path pays nothing for them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        fn: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._fn = fn
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is read from a callback and has no series to update")
+
+    def samples(self):
+        for values, value in self._fn().items():
+            yield "", values, (), value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "where2meet_stage_seconds",
+    "Time spent per stage of answering a meeting-point request",
+    ["stage"]
+))
+UPSTREAM_SECONDS = REGISTRY.register(Histogram(
+    "where2meet_tfl_request_seconds",
+    "TfL API call latency, per attempt, by HTTP status "
+    "(error for transport failures, cancelled for abandoned calls)",
+    ["status"]
+))
+ESTIMATE_FALLBACKS = REGISTRY.register(Counter(
+    "where2meet_estimate_fallbacks_total",
+    "Journeys answered by the distance estimate because TfL gave no usable journey",
+    ["reason"]
+))
+CANDIDATE_COUNT = REGISTRY.register(Histogram(
+    "where2meet_candidate_stations",
+    "Candidate stations chosen for TfL evaluation per request",
+    buckets=(1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 20)
+))
+ESTIMATE_REGRET = REGISTRY.register(Histogram(
+    "where2meet_estimate_regret_minutes",
+    "Max journey time the evaluated winner saved over the estimate's leader",
+    buckets=(0, 1, 2, 3, 5, 8, 12, 20)
+))
+ESTIMATOR_ERROR = REGISTRY.register(Histogram(
+    "where2meet_estimator_abs_error_minutes",
+    "Journey-time estimate error against each live TfL journey, measured before learning from it",
+    ["model"],
+    buckets=(1, 2, 3, 5, 8, 12, 20, 30, 45)
+))
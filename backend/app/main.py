@@ -4,7 +4,12 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.api.endpoints import meeting_points_router, health_router
+from app.api.endpoints import (
+    meeting_points_router,
+    saved_meeting_points_router,
+    metrics_router,
+    health_router
+)
 from app.services import TfLService
 
 logging.basicConfig(level=logging.INFO)
@@ -14,10 +19,24 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    from app.api.endpoints.meeting_points import tfl_service, geocoding_service, persistent_store
+    if persistent_store:
+        persistent_store.purge_expired()
+        journeys = tfl_service.warm_cache(settings.persistent_store_warm_entries)
+        geocodes = geocoding_service.warm_cache(settings.persistent_store_warm_entries)
+        observations = tfl_service.estimator.load()
+        logger.info(
+            f"Warmed caches from {persistent_store.path}: {journeys} journeys, "
+            f"{geocodes} geocodes, {observations} estimator journeys"
+        )
     yield
     logger.info("Shutting down...")
-    from app.api.endpoints.meeting_points import tfl_service
     await tfl_service.close()
+    geocoding_service.close()
+    if persistent_store:
+        persistent_store.close()
+    from app.api.endpoints.saved_meeting_points import meeting_point_store
+    meeting_point_store.close()
 
 
 app = FastAPI(
@@ -49,6 +68,18 @@ app.include_router(
     tags=["meeting-points"]
 )
 
+app.include_router(
+    saved_meeting_points_router,
+    prefix="/api/saved-meeting-points",
+    tags=["saved-meeting-points"]
+)
+
+app.include_router(
+    metrics_router,
+    prefix="/api/metrics",
+    tags=["metrics"]
+)
+
 
 @app.get("/")
 async def root():
@@ -4,9 +4,15 @@ from .location import (
     JourneyLeg,
     JourneyTime,
     MeetingStation,
+    SearchStats,
     MeetingPointRequest,
     MeetingPointResponse,
-    SavedMeetingPoint
+    MeetingPointBatchRequest,
+    MeetingPointBatchItem,
+    BatchSummary,
+    GeocodeBatchRequest,
+    SavedMeetingPoint,
+    SaveMeetingPointRequest
 )
 
 __all__ = [
@@ -15,7 +21,13 @@ __all__ = [
     "JourneyLeg",
     "JourneyTime",
     "MeetingStation",
+    "SearchStats",
     "MeetingPointRequest",
     "MeetingPointResponse",
-    "SavedMeetingPoint"
+    "MeetingPointBatchRequest",
+    "MeetingPointBatchItem",
+    "BatchSummary",
+    "GeocodeBatchRequest",
+    "SavedMeetingPoint",
+    "SaveMeetingPointRequest"
 ]
\ No newline at end of file
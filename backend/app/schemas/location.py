@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Dict, Literal, Optional, Tuple
 from datetime import datetime
 
 
@@ -38,6 +38,18 @@ class JourneyLeg(BaseModel):
     stops: Optional[int] = None  # number of stops
     instruction: str  # e.g., "Take Victoria line towards Brixton"
     intermediate_stops: List[Tuple[float, float]] = []  # coordinates of intermediate stops
+    # intermediate_stops as an encoded polyline (path_format="polyline")
+    encoded_path: Optional[str] = None
+    # Raw TfL lineString awaiting decoding into intermediate_stops
+    _line_string: Optional[str] = PrivateAttr(default=None)
+
+
+# Fields of JourneyLeg that can be selected with MeetingPointRequest.leg_fields
+LegField = Literal[
+    "mode", "from_name", "to_name", "from_coords", "to_coords", "duration", "distance",
+    "line_name", "direction", "stops", "instruction", "intermediate_stops", "encoded_path"
+]
+
 
 class JourneyTime(BaseModel):
     from_location: str
@@ -62,9 +74,56 @@ class MeetingStation(BaseModel):
     journey_times: List[JourneyTime]
 
 
+class SearchStats(BaseModel):
+    strategy: str
+    iterations: int
+    stations_evaluated: int
+    api_calls: int  # TfL journey requests made (before caching), excluding pruned ones
+    pruned_calls: int = 0  # requests cancelled because their station could not rank
+    # Candidate strategy: position of the winner in the estimate ranking (0 = the
+    # estimate's leader) and how many minutes of max journey time evaluating saved over it
+    winner_estimate_rank: Optional[int] = None
+    estimate_regret_minutes: Optional[int] = None
+
+
 class MeetingPointRequest(BaseModel):
     locations: List[LocationInput] = Field(..., min_length=2, max_length=10)
     use_tfl_api: bool = Field(True, description="Use TfL API for accurate journey times")
+    use_travel_matrix: bool = Field(
+        False,
+        description="Answer from the precomputed station travel-time matrix; makes no TfL calls"
+    )
+    strategy: Literal["candidates", "greedy"] = Field(
+        "candidates",
+        description=(
+            "candidates: best stations by estimated journey time; "
+            "greedy: hill-climb the station network"
+        )
+    )
+    max_api_calls: Optional[int] = Field(
+        None,
+        ge=2,
+        le=500,
+        description=(
+            "TfL call budget for the candidates strategy, at least one call per "
+            "participant (default: the server's CANDIDATE_CALL_BUDGET)"
+        )
+    )
+    path_format: Literal["coordinates", "polyline"] = Field(
+        "coordinates",
+        description=(
+            "coordinates: leg paths as [lat, lon] lists; "
+            "polyline: as encoded polylines in encoded_path"
+        )
+    )
+    detail: Literal["summary", "full"] = Field(
+        "full",
+        description="summary: journeys carry only names and times, without legs; full: everything"
+    )
+    leg_fields: Optional[List[LegField]] = Field(
+        None,
+        description="With detail=full, the JourneyLeg fields to return (default: all)"
+    )
     preferences: Optional[Dict] = Field(default_factory=dict)
     
     class Config:
@@ -87,6 +146,7 @@ class MeetingPointResponse(BaseModel):
     alternative_stations: List[MeetingStation]
     processed_locations: List[ProcessedLocation]
     map_center: Tuple[float, float]
+    search_stats: Optional[SearchStats] = None
     
     class Config:
         json_schema_extra = {
@@ -110,6 +170,35 @@ class MeetingPointResponse(BaseModel):
         }
 
 
+class MeetingPointBatchRequest(BaseModel):
+    requests: List[MeetingPointRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class MeetingPointBatchItem(BaseModel):
+    index: int
+    result: Optional[MeetingPointResponse] = None
+    error: Optional[str] = None
+
+
+class BatchSummary(BaseModel):
+    requests: int
+    succeeded: int
+    failed: int
+    journeys_requested: int  # (origin, station) journeys across all requests
+    unique_journeys: int  # journeys actually fetched after deduplication
+
+
+class GeocodeBatchRequest(BaseModel):
+    addresses: List[str] = Field(..., min_length=1, max_length=50)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "addresses": ["Victoria Station, London", "Notting Hill Gate, London"]
+            }
+        }
+
+
 class SavedMeetingPoint(BaseModel):
     id: str
     user_id: Optional[str]
@@ -119,4 +208,14 @@ class SavedMeetingPoint(BaseModel):
     created_at: datetime
     updated_at: datetime
     is_public: bool = False
-    share_token: Optional[str]
\ No newline at end of file
+    share_token: Optional[str]
+
+
+class SaveMeetingPointRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=2000)
+    meeting_data: MeetingPointResponse
+    user_id: Optional[str] = None
+    is_public: bool = Field(
+        False, description="Issue a share token so the point can be opened by link"
+    )
@@ -1,9 +1,18 @@
+from .gazetteer import Gazetteer
+from .persistent_store import PersistentStore
+from .meeting_point_store import MeetingPointStore, SQLiteMeetingPointStore
 from .tfl_service import TfLService
+from .travel_matrix import TravelMatrix
 from .geocoding_service import GeocodingService
 from .meeting_calculator import MeetingCalculator
 
 __all__ = [
+    "Gazetteer",
+    "PersistentStore",
+    "MeetingPointStore",
+    "SQLiteMeetingPointStore",
     "TfLService",
+    "TravelMatrix",
     "GeocodingService",
     "MeetingCalculator"
 ]
\ No newline at end of file
@@ -0,0 +1,142 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# WGS84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+# (points, station coords) -> (points, stations) estimated minutes
+MinutesFn = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def ellipsoidal_distance_km(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """Distance in km between broadcastable arrays of coordinates (degrees).
+
+    Projects each pair onto the WGS84 ellipsoid's local meridional and
+    prime-vertical radii at the mean latitude. Within a city-sized area this
+    stays within a few metres of geopy's geodesic at a fraction of the cost.
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(lon2) - np.radians(lon1)
+    phi_m = (phi1 + phi2) / 2
+
+    sin_m = np.sin(phi_m)
+    w2 = 1 - WGS84_E2 * sin_m * sin_m
+    w = np.sqrt(w2)
+    prime_vertical = WGS84_A_KM / w
+    meridional = WGS84_A_KM * (1 - WGS84_E2) / (w2 * w)
+
+    dy = meridional * d_phi
+    dx = prime_vertical * np.cos(phi_m) * d_lambda
+    return np.hypot(dx, dy)
+
+
+class CandidateScorer:
+    """Batched distance pre-scoring of candidate stations.
+
+    Station coordinates are held in a preallocated array so a request only
+    pays for one participants x stations distance matrix and two reductions.
+    """
+
+    def __init__(self, stations: Dict[str, Tuple[float, float]]):
+        self.names: List[str] = list(stations.keys())
+        self.coords = np.empty((len(self.names), 2), dtype=np.float64)
+        for i, (lat, lon) in enumerate(stations.values()):
+            self.coords[i, 0] = lat
+            self.coords[i, 1] = lon
+        self._station_lats = self.coords[:, 0]
+        self._station_lons = self.coords[:, 1]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def distance_matrix(
+        self,
+        points: Sequence[Tuple[float, float]],
+        station_ids: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Return a (participants, stations) matrix of distances in km.
+
+        When ``station_ids`` is given only those columns are computed.
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        lats, lons = self._station_lats, self._station_lons
+        if station_ids is not None:
+            lats, lons = lats[station_ids], lons[station_ids]
+        return ellipsoidal_distance_km(
+            pts[:, 0:1], pts[:, 1:2],
+            lats[np.newaxis, :], lons[np.newaxis, :]
+        )
+
+    def score(
+        self,
+        points: Sequence[Tuple[float, float]],
+        station_ids: Optional[np.ndarray] = None,
+        minutes: Optional[MinutesFn] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return per-station (max, average) arrays of distance, or of
+        estimated minutes when a ``minutes`` function is given."""
+        if minutes is not None:
+            coords = self.coords if station_ids is None else self.coords[station_ids]
+            costs = minutes(np.asarray(points, dtype=np.float64).reshape(-1, 2), coords)
+        else:
+            costs = self.distance_matrix(points, station_ids)
+        return costs.max(axis=0), costs.mean(axis=0)
+
+    @staticmethod
+    def _best(max_cost: np.ndarray, avg_cost: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k lowest (max, average) pairs, best first"""
+        n = len(max_cost)
+        if k < n:
+            idx = np.argpartition(max_cost, k - 1)[:k]
+        else:
+            idx = np.arange(n)
+        return idx[np.lexsort((avg_cost[idx], max_cost[idx]))]
+
+    def nearest_ids(self, points: Sequence[Tuple[float, float]], k: int) -> np.ndarray:
+        """Ids of the k stations with the lowest max, then average, distance"""
+        max_distance, avg_distance = self.score(points)
+        return self._best(max_distance, avg_distance, min(k, len(self.names)))
+
+    def top_candidates(
+        self,
+        points: Sequence[Tuple[float, float]],
+        k: int,
+        station_ids: Optional[np.ndarray] = None,
+        minutes: Optional[MinutesFn] = None
+    ) -> List[Dict]:
+        """Best k stations ordered by max distance, then average distance
+        (or by estimated minutes, with ``minutes``)."""
+        if station_ids is None:
+            station_ids = np.arange(len(self.names))
+        else:
+            station_ids = np.asarray(station_ids, dtype=np.int64)
+        max_distance, avg_distance = self.score(points, station_ids, minutes)
+        unit = 'distance' if minutes is None else 'minutes'
+        n = len(station_ids)
+        k = min(k, n)
+        if k <= 0:
+            return []
+
+        order = self._best(max_distance, avg_distance, k)
+
+        return [
+            {
+                'name': self.names[station_ids[i]],
+                'coords': (
+                    float(self.coords[station_ids[i], 0]),
+                    float(self.coords[station_ids[i], 1])
+                ),
+                f'avg_{unit}': float(avg_distance[i]),
+                f'max_{unit}': float(max_distance[i])
+            }
+            for i in order
+        ]
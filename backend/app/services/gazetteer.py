@@ -0,0 +1,163 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import re
+import numpy as np
+
+from app.core.constants import GAZETTEER_FILE, STATION_CATALOGUE
+
+# Ranking of place kinds when several share a prefix
+KIND_RANK = {"station": 0, "landmark": 1, "area": 2, "postcode": 3}
+
+# Completions cached per trie node; requests are capped at this many results
+MAX_SUGGESTIONS = 20
+
+_APOSTROPHES = re.compile(r"['’`.]")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Trailing qualifiers that do not change which place is meant
+_LOCATION_SUFFIX = re.compile(r"(\s+(london|greater london|uk|united kingdom|england))+$")
+_STATION_SUFFIX = re.compile(
+    r"\s+((tube|underground|overground|dlr|rail|railway|train|elizabeth line)\s+)?station$"
+)
+
+
+def normalize_place(text: str) -> str:
+    """Fold a place name to the form it is indexed under.
+
+    Lowercases, drops apostrophes and full stops ("King's" -> "kings",
+    "St." -> "st"), spells out "&" and collapses punctuation to single spaces.
+    """
+    folded = _APOSTROPHES.sub("", text.lower().replace("&", " and "))
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+class Gazetteer:
+    """Offline index of London place names for autocomplete and geocoding.
+
+    Names are held in a prefix trie whose nodes are dicts of child indices,
+    each node carrying its best completions precomputed, so a lookup costs one
+    step per typed character. Coordinates live in parallel arrays.
+    """
+
+    def __init__(self, places: Iterable[Dict]):
+        self.names: List[str] = []
+        self.kinds: List[str] = []
+        self.descriptions: List[Optional[str]] = []
+        coords: List[Tuple[float, float]] = []
+        self._exact: Dict[str, int] = {}
+
+        for place in places:
+            place_id = len(self.names)
+            self.names.append(place["name"])
+            self.kinds.append(place["kind"])
+            self.descriptions.append(place.get("description"))
+            coords.append((place["latitude"], place["longitude"]))
+            for key in [place["name"], *place.get("aliases", [])]:
+                # First place registered under a key wins, so stations take precedence
+                self._exact.setdefault(normalize_place(key), place_id)
+
+        self.coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        self._children: List[Dict[str, int]] = [{}]
+        self._completions: List[Tuple[int, ...]] = []
+        self._build_trie()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_bundled_data(cls) -> "Gazetteer":
+        """Stations from the catalogue plus the bundled postcode districts and landmarks"""
+        stations = (
+            {
+                "name": station["name"],
+                "kind": "station",
+                "latitude": station["latitude"],
+                "longitude": station["longitude"],
+                "description": ", ".join(station["lines"])
+            }
+            for station in STATION_CATALOGUE
+        )
+        with open(GAZETTEER_FILE, encoding="utf-8") as f:
+            places = json.load(f)["places"]
+        return cls([*stations, *places])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _rank(self, place_id: int, word_offset: int) -> Tuple:
+        # Matches on the start of the name beat matches on a later word
+        return (
+            word_offset > 0,
+            KIND_RANK.get(self.kinds[place_id], len(KIND_RANK)),
+            len(self.names[place_id]),
+            self.names[place_id]
+        )
+
+    def _build_trie(self):
+        candidates: List[Dict[int, Tuple]] = [{}]
+
+        for key, place_id in self._exact.items():
+            words = key.split(" ")
+            offset = 0
+            for position, word in enumerate(words):
+                rank = self._rank(place_id, position)
+                node = 0
+                for char in key[offset:]:
+                    child = self._children[node].get(char)
+                    if child is None:
+                        child = len(self._children)
+                        self._children[node][char] = child
+                        self._children.append({})
+                        candidates.append({})
+                    node = child
+                    best = candidates[node].get(place_id)
+                    if best is None or rank < best:
+                        candidates[node][place_id] = rank
+                offset += len(word) + 1
+
+        self._completions = [
+            tuple(sorted(ranked, key=ranked.get)[:MAX_SUGGESTIONS])
+            for ranked in candidates
+        ]
+
+    def _place(self, place_id: int) -> Dict:
+        return {
+            "name": self.names[place_id],
+            "kind": self.kinds[place_id],
+            "latitude": float(self.coords[place_id, 0]),
+            "longitude": float(self.coords[place_id, 1]),
+            "description": self.descriptions[place_id]
+        }
+
+    def complete(self, prefix: str, limit: int = 8) -> List[Dict]:
+        """Places whose name, alias or any word of them starts with ``prefix``"""
+        node = 0
+        for char in normalize_place(prefix):
+            node = self._children[node].get(char)
+            if node is None:
+                return []
+        if node == 0:
+            return []
+        return [self._place(place_id) for place_id in self._completions[node][:limit]]
+
+    def lookup(self, query: str) -> Optional[Tuple[float, float]]:
+        """Coordinates for a query naming a known place exactly, else None.
+
+        Trailing ", London"/", UK" and "station" qualifiers are ignored, so
+        "Victoria Station, London" resolves to Victoria.
+        """
+        key = _LOCATION_SUFFIX.sub("", normalize_place(query))
+        place_id = self._exact.get(key)
+        if place_id is None:
+            place_id = self._exact.get(_STATION_SUFFIX.sub("", key))
+        if place_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return float(self.coords[place_id, 0]), float(self.coords[place_id, 1])
+
+    def stats(self) -> dict:
+        return {
+            "places": len(self.names),
+            "trie_nodes": len(self._children),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -1,30 +1,192 @@
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-from typing import Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Dict, List, Tuple, Optional
+import asyncio
 import logging
+import re
+import time
 from app.core.config import settings
+from app.services.cache import TTLCache
+from app.services.gazetteer import Gazetteer
+from app.services.persistent_store import PersistentStore
+from app.services.rate_limiter import TokenBucket
+from app.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Cached marker for addresses the geocoder could not resolve
+NOT_FOUND = ()
+
+_WHITESPACE = re.compile(r"\s+")
+_SEPARATOR_SPACING = re.compile(r"\s*,\s*")
+
+
+def normalize_address(address: str) -> str:
+    """Canonical cache key for an address: case, spacing and commas folded"""
+    normalized = _WHITESPACE.sub(" ", address.strip().lower())
+    normalized = _SEPARATOR_SPACING.sub(", ", normalized)
+    return normalized.strip(" ,.")
+
 
 class GeocodingService:
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[PersistentStore] = None,
+        gazetteer: Optional[Gazetteer] = None
+    ):
         self.geolocator = Nominatim(user_agent=settings.geocoder_user_agent)
-    
+        # geopy is synchronous: run it on a small dedicated pool, never on the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.geocoder_max_workers,
+            thread_name_prefix="geocoder"
+        )
+        # Nominatim usage policy: at most one request per second, shared by all lookups
+        self._limiter = TokenBucket(rate=settings.geocoder_requests_per_second, capacity=1)
+        self._in_flight = SingleFlight()
+        self._cache = TTLCache(
+            ttl_seconds=settings.geocode_cache_ttl_seconds,
+            max_entries=settings.geocode_cache_max_entries
+        )
+        self._reverse_cache = TTLCache(
+            ttl_seconds=settings.geocode_cache_ttl_seconds,
+            max_entries=settings.geocode_cache_max_entries
+        )
+        self.negative_ttl_seconds = settings.geocode_negative_cache_ttl_seconds
+        self.store = store
+        self.store_ttl_seconds = settings.persistent_store_geocode_ttl_seconds
+        # Known stations, postcode districts and landmarks resolve without a network call
+        self.gazetteer = gazetteer
+
+    def _cached_coords(self, key: str):
+        """Look up a geocode in memory, then in the persistent store.
+
+        Returns coordinates, NOT_FOUND for a cached failure, or None on a miss.
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            if self.store:
+                self.store.record_hit("geocodes", key)
+            return cached
+
+        if self.store:
+            stored = self.store.get_geocode(key)
+            if stored is not None:
+                coords, expires_at = stored
+                value = coords if coords is not None else NOT_FOUND
+                self._cache.set(key, value, min(self._cache.ttl_seconds, expires_at - time.time()))
+                return value
+        return None
+
+    def _remember(self, key: str, coords: Optional[Tuple[float, float]]):
+        ttl = self._cache.ttl_seconds if coords else self.negative_ttl_seconds
+        self._cache.set(key, coords or NOT_FOUND, ttl)
+        if self.store:
+            self.store.put_geocode(key, coords, self.store_ttl_seconds if coords else ttl)
+
+    def warm_cache(self, limit: int) -> int:
+        """Bulk-load the most frequently used persisted geocodes into memory"""
+        if not self.store:
+            return 0
+        loaded = 0
+        now = time.time()
+        for key, coords, expires_at in self.store.hottest_geocodes(limit):
+            value = coords if coords is not None else NOT_FOUND
+            self._cache.set(key, value, min(self._cache.ttl_seconds, expires_at - now))
+            loaded += 1
+        return loaded
+
+    def cache_stats(self) -> dict:
+        return {
+            "geocode": self._cache.stats(),
+            "reverse": self._reverse_cache.stats(),
+            "coalescing": self._in_flight.stats(),
+            "gazetteer": self.gazetteer.stats() if self.gazetteer else None
+        }
+
+    async def _call_geocoder(self, fn, *args, **kwargs):
+        """Run a blocking geopy call on the worker pool, behind the shared rate limit"""
+        await self._limiter.acquire()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    @staticmethod
+    def _query_for(location: str) -> Tuple[str, str]:
+        """Return the (query, cache key) to geocode an address with"""
+        if "london" not in location.lower() and "uk" not in location.lower():
+            location = f"{location}, London, UK"
+        return location, normalize_address(location)
+
     async def geocode_location(self, location: str) -> Optional[Tuple[float, float]]:
+        if self.gazetteer:
+            coords = self.gazetteer.lookup(location)
+            if coords:
+                return coords
+
+        location, key = self._query_for(location)
+
+        cached = self._cached_coords(key)
+        if cached is not None:
+            return cached or None
+
+        return await self._in_flight.do(key, lambda: self._geocode_remote(key, location))
+
+    async def geocode_many(
+        self,
+        addresses: List[str]
+    ) -> AsyncIterator[Tuple[int, str, Optional[Tuple[float, float]]]]:
+        """Geocode addresses concurrently, yielding (index, address, coords) as each resolves.
+
+        Identical addresses (after normalization) are looked up once; the
+        shared rate limiter keeps the provider's request rate in bounds.
+        """
+        indices_by_key: Dict[str, List[int]] = {}
+        tasks = []
+        for index, address in enumerate(addresses):
+            _, key = self._query_for(address)
+            if key not in indices_by_key:
+                indices_by_key[key] = []
+                tasks.append(asyncio.ensure_future(self._keyed_lookup(key, address)))
+            indices_by_key[key].append(index)
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                key, coords = await next_result
+                for index in indices_by_key[key]:
+                    yield index, addresses[index], coords
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def geocode_all(self, addresses: List[str]) -> List[Optional[Tuple[float, float]]]:
+        """Geocode addresses concurrently, returning results in input order"""
+        results: List[Optional[Tuple[float, float]]] = [None] * len(addresses)
+        async for index, _, coords in self.geocode_many(addresses):
+            results[index] = coords
+        return results
+
+    async def _keyed_lookup(
+        self,
+        key: str,
+        address: str
+    ) -> Tuple[str, Optional[Tuple[float, float]]]:
+        return key, await self.geocode_location(address)
+
+    async def _geocode_remote(self, key: str, location: str) -> Optional[Tuple[float, float]]:
         try:
-            if "london" not in location.lower() and "uk" not in location.lower():
-                location = f"{location}, London, UK"
-            
-            result = self.geolocator.geocode(location, timeout=10)
-            
+            result = await self._call_geocoder(self.geolocator.geocode, location, timeout=10)
+
             if result:
                 logger.info(f"Successfully geocoded: {location}")
-                return (result.latitude, result.longitude)
+                coords = (result.latitude, result.longitude)
+                self._remember(key, coords)
+                return coords
             else:
                 logger.warning(f"Could not geocode location: {location}")
+                self._remember(key, None)
                 return None
-                
+
         except GeocoderTimedOut:
             logger.error(f"Geocoding timeout for location: {location}")
             return None
@@ -34,15 +196,36 @@ class GeocodingService:
         except Exception as e:
             logger.error(f"Unexpected geocoding error: {str(e)}")
             return None
-    
+
     async def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
+        # ~10m grid: nearby points resolve to the same address
+        key = (round(lat, 4), round(lon, 4))
+        cached = self._reverse_cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        return await self._in_flight.do(
+            ("reverse", key), lambda: self._reverse_remote(key, lat, lon)
+        )
+
+    async def _reverse_remote(
+        self,
+        key: Tuple[float, float],
+        lat: float,
+        lon: float
+    ) -> Optional[str]:
         try:
-            result = self.geolocator.reverse((lat, lon), timeout=10)
-            
+            result = await self._call_geocoder(self.geolocator.reverse, (lat, lon), timeout=10)
+
             if result:
+                self._reverse_cache.set(key, result.address)
                 return result.address
+            self._reverse_cache.set(key, "", self.negative_ttl_seconds)
             return None
-            
+
         except Exception as e:
             logger.error(f"Reverse geocoding error: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
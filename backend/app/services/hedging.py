@@ -0,0 +1,93 @@
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+import math
+
+
+def _quantile(ordered, q: float) -> float:
+    """Nearest-rank quantile of a sorted, non-empty sequence"""
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class LatencyTracker:
+    """Recent upstream latencies and the hedge threshold derived from them.
+
+    Keeps the last ``window`` successful call latencies; once ``min_samples``
+    have been seen, a call still unanswered after their ``quantile`` (at
+    least ``min_delay`` seconds) is worth hedging. The quantile is re-sorted
+    every ``recompute_every`` observations rather than per call.
+
+    Hedges are rationed so a slow upstream is not hit with twice the traffic:
+    every call earns ``max_fraction`` of a hedge, up to ``burst`` banked.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        window: int = 1000,
+        min_samples: int = 50,
+        min_delay: float = 0.1,
+        max_fraction: float = 0.1,
+        burst: float = 5.0,
+        recompute_every: int = 20
+    ):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_fraction = max_fraction
+        self.burst = burst
+        self.recompute_every = recompute_every
+        self._samples = deque(maxlen=window)
+        self._threshold: Optional[float] = None
+        self._since_recompute = 0
+        self._credit = 0.0
+
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.rationed = 0
+
+    def observe(self, seconds: float):
+        """Record a successful call's latency"""
+        self._samples.append(seconds)
+        self._since_recompute += 1
+        if len(self._samples) >= self.min_samples and (
+            self._threshold is None or self._since_recompute >= self.recompute_every
+        ):
+            self._recompute()
+
+    def _recompute(self):
+        self._threshold = max(self.min_delay, _quantile(sorted(self._samples), self.quantile))
+        self._since_recompute = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging a call now starting, or None if too few samples"""
+        self.calls += 1
+        self._credit = min(self.burst, self._credit + self.max_fraction)
+        return self._threshold
+
+    def try_hedge(self) -> bool:
+        """Spend a hedge from the ration; False if the ration is used up"""
+        if self._credit < 1.0:
+            self.rationed += 1
+            return False
+        self._credit -= 1.0
+        self.hedged += 1
+        return True
+
+    def quantiles(
+        self,
+        quantiles: Tuple[float, ...] = (0.5, 0.9, 0.95, 0.99)
+    ) -> Dict[float, Optional[float]]:
+        """Latency quantiles over the window (None before any sample)"""
+        ordered = sorted(self._samples)
+        return {q: _quantile(ordered, q) if ordered else None for q in quantiles}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "threshold_seconds": self._threshold,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "rationed": self.rationed
+        }
@@ -0,0 +1,400 @@
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import math
+import numpy as np
+
+from app.core.constants import LONDON_STATIONS
+from app.core.metrics import ESTIMATOR_ERROR
+from app.services.candidate_scorer import ellipsoidal_distance_km
+from app.services.persistent_store import PersistentStore
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEGREE_LAT = 111.32
+# Charing Cross, the conventional centre of London; distance from it stands in for fare zone
+CENTRE = (51.5074, -0.1278)
+# The Thames through London as (lon, lat) vertices, west to east, simplified
+# so that latitude is a function of longitude
+THAMES = np.array([
+    (-0.337, 51.403), (-0.320, 51.428), (-0.307, 51.458), (-0.288, 51.484),
+    (-0.260, 51.480), (-0.230, 51.488), (-0.213, 51.466), (-0.190, 51.463),
+    (-0.170, 51.480), (-0.150, 51.484), (-0.127, 51.487), (-0.122, 51.501),
+    (-0.117, 51.509), (-0.104, 51.509), (-0.088, 51.507), (-0.075, 51.505),
+    (-0.055, 51.503), (-0.035, 51.507), (-0.010, 51.485), (0.005, 51.507),
+    (0.065, 51.495), (0.110, 51.510), (0.180, 51.482)
+])
+FEATURES = ("intercept", "distance", "sqrt_distance", "origin_access", "destination_access",
+            "origin_radius", "destination_radius", "crosses_thames")
+_ACCESS_CHUNK = 2048
+# Live journeys queued before they are scored and retained together
+OBSERVE_BATCH = 25
+
+# Per-journey error assumed for the fixed curve until enough journeys are scored
+DEFAULT_UNCERTAINTY_MINUTES = 6.0
+# Scored journeys needed before their error replaces the fit's own
+MIN_SCORED_JOURNEYS = 30
+
+_CALIBRATED_ERROR = ESTIMATOR_ERROR.labels("calibrated")
+_BASELINE_ERROR = ESTIMATOR_ERROR.labels("baseline")
+
+
+def baseline_minutes(distance_km: np.ndarray) -> np.ndarray:
+    """The fixed piecewise-linear curve used before any journeys are observed"""
+    d = np.asarray(distance_km, dtype=np.float64)
+    return np.floor(np.select(
+        [d < 1, d < 3, d < 10],
+        [np.full_like(d, 5.0), d * 4 + 5, d * 3.5 + 8],
+        d * 3 + 10
+    ))
+
+
+class JourneyEstimator:
+    """Journey-time model calibrated on the TfL journeys we receive.
+
+    Minutes are a ridge regression on distance, the walk to the nearest
+    station at each end, each end's distance from the centre (a zone proxy)
+    and whether the Thames lies between them, plus shrunken per-cell residual
+    corrections for the origin and destination cells. Until ``min_samples``
+    journeys have been observed the fixed distance curve answers.
+
+    Observed journeys are queued and absorbed in batches by ``learn``, each
+    first scored against the current model and the fixed curve, so the
+    reported error is always out of sample. The model is refit every
+    ``refit_every`` new journeys, when they are also written to the
+    persistent store; both run on a worker thread while the previous fit
+    keeps answering.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PersistentStore] = None,
+        min_samples: int = 50,
+        refit_every: int = 100,
+        max_samples: int = 20000,
+        cell_km: float = 2.0,
+        ridge: float = 1.0,
+        cell_prior: float = 10.0,
+        error_window: int = 1000
+    ):
+        self.store = store
+        self.min_samples = min_samples
+        self.refit_every = refit_every
+        self.max_samples = max_samples
+        self.ridge = ridge
+        self.cell_prior = cell_prior
+        self._cell_lat = cell_km / KM_PER_DEGREE_LAT
+        self._cell_lon = self._cell_lat / math.cos(math.radians(CENTRE[0]))
+        self._stations = np.array(list(LONDON_STATIONS.values()), dtype=np.float64)
+        self._station_xy = self._project(self._stations[:, 0], self._stations[:, 1])
+        # Destinations are almost always stations, so their terms are computed once
+        self._station_ids = {coords: i for i, coords in enumerate(LONDON_STATIONS.values())}
+        self._station_ends = self._ends(self._stations[:, 0], self._stations[:, 1])
+
+        # (from_lat, from_lon, to_lat, to_lon, minutes, origin access km, destination access km)
+        self._samples: Deque[Tuple[float, ...]] = deque(maxlen=max_samples)
+        self._incoming: List[Tuple[float, float, float, float, int]] = []
+        self._pending: List[Tuple[float, float, float, float, int]] = []
+        self._since_fit = 0
+        self._coef: Optional[np.ndarray] = None
+        self._origin_cells: Dict[int, float] = {}
+        self._destination_cells: Dict[int, float] = {}
+        self._residual_rms: Optional[float] = None
+        # (calibrated error or None, fixed-curve error), signed minutes
+        self._errors: Deque[Tuple[Optional[float], float]] = deque(maxlen=error_window)
+        self.observations = 0
+        self.fits = 0
+
+    @property
+    def calibrated(self) -> bool:
+        return self._coef is not None
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full batch of observed journeys is waiting for ``learn``"""
+        return len(self._incoming) >= OBSERVE_BATCH
+
+    @staticmethod
+    def _project(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Local planar (x, y) km around the centre; ample for nearest-station walks"""
+        return np.stack((
+            (np.ravel(lons) - CENTRE[1]) * KM_PER_DEGREE_LAT * math.cos(math.radians(CENTRE[0])),
+            (np.ravel(lats) - CENTRE[0]) * KM_PER_DEGREE_LAT
+        ), axis=1)
+
+    def _access_km(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Distance from each point to its nearest station"""
+        xy = self._project(lats, lons)
+        access = np.empty(len(xy))
+        for start in range(0, len(xy), _ACCESS_CHUNK):
+            chunk = slice(start, start + _ACCESS_CHUNK)
+            delta = xy[chunk, np.newaxis, :] - self._station_xy[np.newaxis, :, :]
+            access[chunk] = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta).min(axis=1))
+        return access
+
+    @staticmethod
+    def _radius_km(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return ellipsoidal_distance_km(lats, lons, CENTRE[0], CENTRE[1])
+
+    @staticmethod
+    def _south_of_thames(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return lats < np.interp(lons, THAMES[:, 0], THAMES[:, 1])
+
+    def _cells(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        rows = np.floor(lats / self._cell_lat).astype(np.int64)
+        cols = np.floor(lons / self._cell_lon).astype(np.int64)
+        return rows * 100000 + cols
+
+    def _ends(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        access: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """Per-endpoint terms, computed once per point rather than per pair"""
+        return {
+            "access": self._access_km(lats, lons) if access is None else access,
+            "radius": self._radius_km(lats, lons),
+            "south": self._south_of_thames(lats, lons),
+            "cells": self._cells(lats, lons)
+        }
+
+    @staticmethod
+    def _design(distance: np.ndarray, origin: Dict, destination: Dict) -> List[np.ndarray]:
+        """Feature columns in FEATURES order.
+
+        Origin and destination terms broadcast against distance.
+        """
+        return [
+            np.ones_like(distance),
+            distance,
+            np.sqrt(distance),
+            origin["access"],
+            destination["access"],
+            origin["radius"],
+            destination["radius"],
+            (origin["south"] != destination["south"]).astype(np.float64)
+        ]
+
+    def _destination_ends(self, dest: np.ndarray) -> Dict[str, np.ndarray]:
+        ids = [self._station_ids.get((lat, lon)) for lat, lon in dest.tolist()]
+        if None in ids:
+            return self._ends(dest[:, 0], dest[:, 1])
+        return {key: value[ids] for key, value in self._station_ends.items()}
+
+    @staticmethod
+    def _corrections(cells: np.ndarray, table: Dict[int, float]) -> np.ndarray:
+        values = np.fromiter(
+            (table.get(cell, 0.0) for cell in cells.ravel().tolist()), np.float64, cells.size
+        )
+        return values.reshape(cells.shape)
+
+    def _predict(self, distance: np.ndarray, origin: Dict, destination: Dict) -> np.ndarray:
+        columns = self._design(distance, origin, destination)
+        minutes = sum(c * column for c, column in zip(self._coef, columns))
+        minutes = minutes + self._corrections(origin["cells"], self._origin_cells)
+        minutes = minutes + self._corrections(destination["cells"], self._destination_cells)
+        return np.maximum(minutes, 1.0)
+
+    def predict_matrix(
+        self,
+        points: Sequence[Tuple[float, float]],
+        stations: Sequence[Tuple[float, float]]
+    ) -> np.ndarray:
+        """Estimated minutes as a (points, stations) matrix"""
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        dest = np.asarray(stations, dtype=np.float64).reshape(-1, 2)
+        distance = ellipsoidal_distance_km(
+            pts[:, 0:1], pts[:, 1:2],
+            dest[np.newaxis, :, 0], dest[np.newaxis, :, 1]
+        )
+        if self._coef is None:
+            return baseline_minutes(distance)
+        origin_ends = self._ends(pts[:, 0], pts[:, 1])
+        origin = {key: value[:, np.newaxis] for key, value in origin_ends.items()}
+        destination_ends = self._destination_ends(dest)
+        destination = {key: value[np.newaxis, :] for key, value in destination_ends.items()}
+        return self._predict(distance, origin, destination)
+
+    def minutes(self, from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> int:
+        matrix = self.predict_matrix([(from_lat, from_lon)], [(to_lat, to_lon)])
+        return int(round(float(matrix[0, 0])))
+
+    def observe(self, from_lat: float, from_lon: float, to_lat: float, to_lon: float, minutes: int):
+        """Queue a live TfL journey to learn from; see ``learn``"""
+        self._incoming.append((from_lat, from_lon, to_lat, to_lon, int(minutes)))
+
+    async def learn(self):
+        """Absorb queued journeys and, when a refit is due, persist and refit off the loop"""
+        self._absorb()
+        if not self._refit_due():
+            return
+        loop = asyncio.get_running_loop()
+        pending, self._pending = self._pending, []
+        self._since_fit = 0
+        if self.store and pending:
+            await loop.run_in_executor(None, partial(
+                self.store.add_journey_observations, pending, keep=self.max_samples
+            ))
+        samples = list(self._samples)
+        fit = await loop.run_in_executor(None, self._fit, samples)
+        if fit is not None:
+            self._apply(fit, len(samples))
+
+    def _refit_due(self) -> bool:
+        return self._since_fit >= self.refit_every or (
+            not self.calibrated and len(self._samples) >= self.min_samples
+        )
+
+    def _absorb(self):
+        """Score queued journeys against the current model and the fixed curve, then retain them"""
+        incoming, self._incoming = self._incoming, []
+        if not incoming:
+            return
+        data = np.array(incoming, dtype=np.float64)
+        from_lat, from_lon, to_lat, to_lon, minutes = data.T
+        distance = ellipsoidal_distance_km(from_lat, from_lon, to_lat, to_lon)
+        origin = self._ends(from_lat, from_lon)
+        destination = self._destination_ends(data[:, 2:4])
+
+        baseline_errors = (baseline_minutes(distance) - minutes).tolist()
+        calibrated_errors = [None] * len(data)
+        if self.calibrated:
+            predicted = np.rint(self._predict(distance, origin, destination))
+            calibrated_errors = (predicted - minutes).tolist()
+        for calibrated_error, baseline_error in zip(calibrated_errors, baseline_errors):
+            if calibrated_error is not None:
+                _CALIBRATED_ERROR.observe(abs(calibrated_error))
+            _BASELINE_ERROR.observe(abs(baseline_error))
+            self._errors.append((calibrated_error, baseline_error))
+
+        self.observations += len(data)
+        self._samples.extend(zip(
+            *data.T.tolist(), origin["access"].tolist(), destination["access"].tolist()
+        ))
+        self._pending.extend(incoming)
+        self._since_fit += len(data)
+
+    def _cell_means(self, cells: np.ndarray, residual: np.ndarray) -> Dict[int, float]:
+        """Mean residual per cell, shrunk toward zero for sparsely observed cells"""
+        unique, inverse = np.unique(cells, return_inverse=True)
+        sums = np.bincount(inverse, weights=residual)
+        counts = np.bincount(inverse)
+        return dict(zip(unique.tolist(), (sums / (counts + self.cell_prior)).tolist()))
+
+    def refit(self) -> bool:
+        """Fit the model to the retained journeys and persist new ones"""
+        self.flush()
+        self._since_fit = 0
+        samples = list(self._samples)
+        fit = self._fit(samples)
+        if fit is None:
+            return False
+        self._apply(fit, len(samples))
+        return True
+
+    def _fit(
+        self,
+        samples: Sequence[Tuple[float, ...]]
+    ) -> Optional[Tuple[np.ndarray, Dict[int, float], Dict[int, float], float]]:
+        """(coefficients, origin cells, destination cells, residual RMS), None below min_samples.
+
+        Reads only the samples it is given, so it can run on a worker thread.
+        """
+        if len(samples) < self.min_samples:
+            return None
+
+        data = np.array(samples, dtype=np.float64)
+        from_lat, from_lon, to_lat, to_lon, minutes, origin_access, destination_access = data.T
+        origin = self._ends(from_lat, from_lon, origin_access)
+        destination = self._ends(to_lat, to_lon, destination_access)
+        distance = ellipsoidal_distance_km(from_lat, from_lon, to_lat, to_lon)
+
+        X = np.column_stack(self._design(distance, origin, destination))
+        penalty = self.ridge * np.eye(X.shape[1])
+        penalty[0, 0] = 0.0
+        coef = np.linalg.solve(X.T @ X + penalty, X.T @ minutes)
+
+        # One backfitting pass: origin cells on the regression residual, then destination cells
+        residual = minutes - X @ coef
+        origin_cells = self._cell_means(origin["cells"], residual)
+        residual -= self._corrections(origin["cells"], origin_cells)
+        destination_cells = self._cell_means(destination["cells"], residual)
+        residual -= self._corrections(destination["cells"], destination_cells)
+
+        return coef, origin_cells, destination_cells, float(np.sqrt(np.mean(residual ** 2)))
+
+    def _apply(
+        self,
+        fit: Tuple[np.ndarray, Dict[int, float], Dict[int, float], float],
+        samples: int
+    ):
+        """Swap in a fit from ``_fit``, on the thread that predicts"""
+        self._coef, self._origin_cells, self._destination_cells, self._residual_rms = fit
+        self.fits += 1
+        mae = self.stats()["recent_mae_minutes"]
+        if mae["calibrated"] is not None:
+            logger.info(
+                f"Refit journey estimator on {samples} journeys: "
+                f"recent MAE {mae['calibrated']:.1f} min (fixed curve {mae['baseline']:.1f})"
+            )
+        else:
+            logger.info(f"Fitted journey estimator on {samples} journeys")
+
+    def load(self) -> int:
+        """Fit to the most recent journeys in the persistent store"""
+        if not self.store:
+            return 0
+        rows = self.store.recent_journey_observations(self.max_samples)
+        if rows:
+            data = np.array(rows, dtype=np.float64).reshape(-1, 5)
+            origin_access = self._access_km(data[:, 0], data[:, 1])
+            destination_access = self._access_km(data[:, 2], data[:, 3])
+            self._samples.extend(zip(
+                *data.T.tolist(), origin_access.tolist(), destination_access.tolist()
+            ))
+            self.refit()
+        return len(rows)
+
+    def flush(self):
+        """Absorb queued journeys and write them to the persistent store"""
+        self._absorb()
+        pending, self._pending = self._pending, []
+        if self.store and pending:
+            self.store.add_journey_observations(pending, keep=self.max_samples)
+
+    def uncertainty_minutes(self) -> float:
+        """Typical (RMS) error of one estimate in minutes.
+
+        Measured on recently scored journeys when there are enough, else the
+        calibrated fit's residual, else a default for the fixed curve.
+        """
+        index = 0 if self.calibrated else 1
+        errors = [pair[index] for pair in self._errors if pair[index] is not None]
+        if len(errors) >= MIN_SCORED_JOURNEYS:
+            return float(np.sqrt(np.mean(np.square(errors))))
+        if self._residual_rms is not None:
+            return self._residual_rms
+        return DEFAULT_UNCERTAINTY_MINUTES
+
+    def stats(self) -> Dict:
+        calibrated = [abs(c) for c, _ in self._errors if c is not None]
+        baseline = (
+            [abs(b) for c, b in self._errors if c is not None]
+            or [abs(b) for _, b in self._errors]
+        )
+        return {
+            "calibrated": self.calibrated,
+            "samples": len(self._samples),
+            "observations": self.observations,
+            "fits": self.fits,
+            # Over the same recent journeys, so the two are comparable
+            "recent_mae_minutes": {
+                "calibrated": float(np.mean(calibrated)) if calibrated else None,
+                "baseline": float(np.mean(baseline)) if baseline else None
+            },
+            "uncertainty_minutes": self.uncertainty_minutes(),
+            "coefficients": dict(zip(FEATURES, self._coef.tolist())) if self.calibrated else None
+        }
@@ -0,0 +1,237 @@
+from typing import Any, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+import json
+import logging
+import re
+
+from app.core.config import settings
+from app.schemas import JourneyLeg, JourneyTime
+from app.services.polyline import simplify
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Decoder used for whole documents and path geometry
+JSON_BACKEND = "orjson" if orjson else "json"
+
+# Opening of the journeys array, matched on text or on the raw response bytes
+_JOURNEYS_ARRAY = re.compile(r'"journeys"\s*:\s*\[\s*')
+_JOURNEYS_ARRAY_BYTES = re.compile(rb'"journeys"\s*:\s*\[\s*')
+_decoder = json.JSONDecoder()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when it is installed, else the standard library"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _journeys_start(data: Union[bytes, str]) -> Optional[int]:
+    """Offset of the first journey in a JourneyResults document.
+
+    Only trusted when ``journeys`` is a top-level key (the document's own
+    brace is the only one opened before it), which is how TfL orders it.
+    """
+    if isinstance(data, bytes):
+        match, brace = _JOURNEYS_ARRAY_BYTES.search(data), b"{"
+    else:
+        match, brace = _JOURNEYS_ARRAY.search(data), "{"
+    if not match or data.count(brace, 0, match.start()) != 1:
+        return None
+    return match.end()
+
+
+def _sliced_first_journey(data: bytes, start: int) -> Optional[dict]:
+    """Decode the first journey with orjson by cutting it out at the next journey.
+
+    TfL tags every journey with the same leading ``"$type"``, so the next
+    occurrence of that tag marks where the first journey ends. A cut in the
+    wrong place does not parse and yields None.
+    """
+    if not data.startswith(b'{"$type":', start):
+        return None
+    type_end = data.find(b'",', start)
+    if type_end < 0:
+        return None
+    end = data.find(b"," + data[start:type_end + 2], type_end)
+    if end < 0:
+        return None
+    try:
+        journey = orjson.loads(data[start:end])
+    except orjson.JSONDecodeError:
+        return None
+    return journey if isinstance(journey, dict) else None
+
+
+def first_journey(content: Union[bytes, str]) -> Optional[dict]:
+    """Decode only the best (first) journey of a JourneyResults payload.
+
+    The alternative journeys, line statuses and fare tables after it are never
+    materialized. With orjson the journey is cut out and decoded on its own;
+    otherwise, or when it is the only journey, the standard library decodes
+    it in place. Unexpected layouts fall back to a full decode.
+    """
+    if orjson and isinstance(content, bytes):
+        start = _journeys_start(content)
+        if start is not None:
+            journey = _sliced_first_journey(content, start)
+            if journey is not None:
+                return journey
+    text = content.decode("utf-8") if isinstance(content, bytes) else content
+    start = _journeys_start(text)
+    if start is not None:
+        if text.startswith("]", start):
+            return None
+        try:
+            journey, _ = _decoder.raw_decode(text, start)
+            return journey
+        except ValueError:
+            pass
+
+    data = loads(content)
+    journeys = data.get("journeys") if isinstance(data, dict) else None
+    return journeys[0] if journeys else None
+
+
+def path_points(
+    coords: List[List[float]],
+    tolerance_metres: Optional[float] = None
+) -> List[Tuple[float, float]]:
+    """Intermediate points of a decoded lineString, simplified to a metre tolerance"""
+    if tolerance_metres is None:
+        tolerance_metres = settings.path_simplify_tolerance_metres
+    # The endpoints are the leg's own from/to coordinates
+    return [(float(lat), float(lon)) for lat, lon in simplify(coords, tolerance_metres)[1:-1]]
+
+
+def resolve_paths(journey: JourneyTime) -> JourneyTime:
+    """Decode the deferred path geometry of a journey's legs, in place.
+
+    Legs keep the raw TfL lineString until their ``intermediate_stops`` are
+    actually needed (a journey about to be returned), so the many journeys
+    that are only scored never pay for it.
+    """
+    for leg in journey.legs:
+        line_string = leg._line_string
+        if line_string is None:
+            continue
+        try:
+            points = path_points(loads(line_string))
+            if points:
+                leg.intermediate_stops = points
+        except (ValueError, TypeError, IndexError):
+            logger.debug(f"Unreadable lineString on {leg.mode} leg to {leg.to_name}")
+        leg._line_string = None
+    return journey
+
+
+def _parse_time(value: Optional[str], default: datetime) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return default
+
+
+def parse_journey(
+    journey: dict,
+    from_lat: float,
+    from_lon: float,
+    to_lat: float,
+    to_lon: float,
+    from_name: str = "",
+    to_name: str = ""
+) -> JourneyTime:
+    """Build a JourneyTime from one TfL journey, deferring path geometry"""
+    legs = []
+    total_walking_duration = 0
+    total_transfers = 0
+
+    for leg in journey.get('legs', []):
+        mode = leg.get('mode', {}).get('name', 'unknown')
+        duration = leg.get('duration', 0)
+
+        if mode.lower() == 'walking':
+            total_walking_duration += duration
+        elif mode.lower() in ['tube', 'bus', 'dlr', 'overground']:
+            total_transfers += 1
+
+        # Extract line information if available
+        line_name = None
+        direction = None
+        stops = None
+
+        if leg.get('routeOptions'):
+            route_option = leg['routeOptions'][0]
+            line_name = route_option.get('name')
+            direction = route_option.get('direction')
+
+        # Station stops stand in when the lineString yields no points
+        intermediate_stops = []
+        if leg.get('intermediateStops'):
+            for stop in leg['intermediateStops']:
+                stop_point = stop.get('stopPoint')
+                if stop_point and stop_point.get('lat') and stop_point.get('lon'):
+                    intermediate_stops.append((stop_point['lat'], stop_point['lon']))
+
+        # Count stops for display
+        if leg.get('stopPoints'):
+            stops = len(leg['stopPoints'])
+
+        # Create instruction
+        instruction = leg.get('instruction', {}).get('summary', '')
+        if not instruction:
+            if mode.lower() == 'walking':
+                instruction = f"Walk for {duration} minutes"
+            elif line_name:
+                instruction = f"Take {line_name} line"
+                if direction:
+                    instruction += f" towards {direction}"
+                if stops:
+                    instruction += f" ({stops} stops)"
+
+        journey_leg = JourneyLeg(
+            mode=mode,
+            from_name=leg.get('departurePoint', {}).get('commonName', ''),
+            to_name=leg.get('arrivalPoint', {}).get('commonName', ''),
+            from_coords=(
+                leg.get('departurePoint', {}).get('lat', from_lat),
+                leg.get('departurePoint', {}).get('lon', from_lon)
+            ),
+            to_coords=(
+                leg.get('arrivalPoint', {}).get('lat', to_lat),
+                leg.get('arrivalPoint', {}).get('lon', to_lon)
+            ),
+            duration=duration,
+            distance=leg.get('distance'),
+            line_name=line_name,
+            direction=direction,
+            stops=stops,
+            instruction=instruction,
+            intermediate_stops=intermediate_stops
+        )
+        # The lineString is kept as text and only decoded by resolve_paths
+        journey_leg._line_string = (leg.get('path') or {}).get('lineString') or None
+        legs.append(journey_leg)
+
+    now = datetime.now()
+    return JourneyTime(
+        from_location=from_name,
+        to_station=to_name,
+        duration_minutes=journey.get('duration', 999),
+        route_type="public_transport",
+        departure_time=_parse_time(journey.get('startDateTime'), now),
+        arrival_time=_parse_time(
+            journey.get('arrivalDateTime'),
+            now + timedelta(minutes=journey.get('duration', 30))
+        ),
+        legs=legs,
+        total_walking_duration=total_walking_duration,
+        total_transfers=max(0, total_transfers - 1)  # Transfers = changes between transport
+    )
@@ -1,26 +1,63 @@
-from typing import List, Dict, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Tuple, Union
+import bisect
+import math
 import uuid
 from datetime import datetime
 import logging
+import numpy as np
 
 from app.schemas import (
     LocationInput, 
     ProcessedLocation, 
     MeetingStation, 
     JourneyTime,
-    MeetingPointResponse
+    MeetingPointResponse,
+    MeetingPointRequest,
+    MeetingPointBatchItem,
+    BatchSummary,
+    SearchStats
 )
 from app.services.tfl_service import TfLService
+from app.services.rate_limiter import PRIORITY_BACKGROUND
 from app.services.geocoding_service import GeocodingService
+from app.services.journey_parser import resolve_paths
+from app.services.candidate_scorer import CandidateScorer
+from app.services.result_cache import Participant, ResultCache
+from app.services.station_graph import StationGraph
+from app.services.station_index import StationIndex
+from app.services.travel_matrix import TravelMatrix
+from app.core.config import settings
+from app.core.metrics import CANDIDATE_COUNT, ESTIMATE_REGRET, STAGE_SECONDS
 from app.core.constants import LONDON_STATIONS
 
 logger = logging.getLogger(__name__)
 
+# Stations returned besides the optimal one
+ALTERNATIVE_STATIONS = 3
+# Stations closest by distance that the calibrated estimator re-ranks, per candidate slot
+CANDIDATE_POOL_FACTOR = 3
+
+_GEOCODE_SECONDS = STAGE_SECONDS.labels("geocode")
+_SCORING_SECONDS = STAGE_SECONDS.labels("candidate_scoring")
+_FAN_OUT_SECONDS = STAGE_SECONDS.labels("tfl_fan_out")
+_PATHS_SECONDS = STAGE_SECONDS.labels("resolve_paths")
+
 
 class MeetingCalculator:
-    def __init__(self, tfl_service: TfLService, geocoding_service: GeocodingService):
+    def __init__(
+        self,
+        tfl_service: TfLService,
+        geocoding_service: GeocodingService,
+        travel_matrix: Optional[TravelMatrix] = None,
+        result_cache: Optional[ResultCache] = None
+    ):
         self.tfl_service = tfl_service
         self.geocoding_service = geocoding_service
+        self.travel_matrix = travel_matrix
+        self.result_cache = result_cache or ResultCache()
+        self.station_index = StationIndex(LONDON_STATIONS)
+        self.candidate_scorer = CandidateScorer(LONDON_STATIONS)
+        self.station_graph = StationGraph.from_bundled_data()
     
     async def process_locations(
         self, 
@@ -28,6 +65,14 @@ class MeetingCalculator:
     ) -> List[ProcessedLocation]:
         processed = []
         
+        # Resolve every address up front, concurrently
+        to_geocode = [
+            loc.address for loc in locations
+            if not (loc.latitude and loc.longitude) and loc.address
+        ]
+        with _GEOCODE_SECONDS.time():
+            geocoded = iter(await self.geocoding_service.geocode_all(to_geocode))
+        
         for loc in locations:
             if loc.latitude and loc.longitude:
                 processed_loc = ProcessedLocation(
@@ -37,7 +82,7 @@ class MeetingCalculator:
                     longitude=loc.longitude
                 )
             elif loc.address:
-                coords = await self.geocoding_service.geocode_location(loc.address)
+                coords = next(geocoded)
                 if coords:
                     processed_loc = ProcessedLocation(
                         name=loc.name,
@@ -57,207 +102,459 @@ class MeetingCalculator:
         
         return processed
     
-    async def calculate_optimal_meeting_point(
+    @staticmethod
+    def _uses_tfl_candidates(use_tfl_api: bool, use_travel_matrix: bool, strategy: str) -> bool:
+        """Whether a request runs the TfL candidate fan-out, the search max_api_calls limits"""
+        return use_tfl_api and not use_travel_matrix and strategy == "candidates"
+    
+    def _top_candidates(
+        self,
+        points: List[Tuple[float, float]],
+        max_api_calls: Optional[int] = None
+    ) -> List[Dict]:
+        """Candidate stations around the group, best first, as many as are in contention.
+        
+        Stations are ranked by estimated minutes (max, then average): the
+        nearest by distance across the whole catalogue while the journey
+        estimator runs on its fixed curve, a wider pool once it is calibrated.
+        Every station whose
+        estimated max is within ``candidate_gap_z`` standard deviations of the
+        difference of two estimates of the leader's is kept, at least
+        ``candidate_min_stations`` and at most what the call budget allows.
+        
+        Raises ValueError if the budget cannot cover even one station, one
+        call per participant.
+        """
+        estimator = self.tfl_service.estimator
+        budget = max_api_calls or settings.candidate_call_budget
+        if budget < len(points):
+            raise ValueError(
+                f"max_api_calls must be at least the number of participants ({len(points)}) "
+                f"to evaluate one station, got {budget}"
+            )
+        limit = min(settings.candidate_max_stations, budget // len(points))
+        with _SCORING_SECONDS.time():
+            pool = limit * CANDIDATE_POOL_FACTOR if estimator.calibrated else limit
+            ranked = self.candidate_scorer.top_candidates(
+                points,
+                limit,
+                station_ids=self.candidate_scorer.nearest_ids(points, pool),
+                minutes=estimator.predict_matrix
+            )
+            if not ranked:
+                return ranked
+            margin = settings.candidate_gap_z * math.sqrt(2) * estimator.uncertainty_minutes()
+            leader = ranked[0]['max_minutes']
+            in_contention = sum(
+                1 for candidate in ranked if candidate['max_minutes'] <= leader + margin
+            )
+            k = min(limit, max(settings.candidate_min_stations, in_contention))
+        
+        logger.info(
+            f"Chose K={k} candidate stations for {len(points)} locations: {in_contention} "
+            f"within {margin:.1f} min of the estimated leader, at most {limit} for a budget "
+            f"of {budget} calls"
+        )
+        return ranked[:k]
+    
+    @staticmethod
+    def _record_candidates(
+        top_candidates: List[Dict],
+        results: List[MeetingStation],
+        optimal: Optional[MeetingStation]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Log and count how the evaluated winner compares with the estimate's ranking.
+        
+        Returns the winner's rank in the estimate ranking and its realized
+        regret: the minutes of max journey time by which the estimate's leader
+        was worse (None if the leader was pruned).
+        """
+        if optimal is None or not top_candidates:
+            return None, None
+        names = [candidate['name'] for candidate in top_candidates]
+        winner_rank = names.index(optimal.station_name) if optimal.station_name in names else None
+        leader = next((station for station in results if station.station_name == names[0]), None)
+        regret = int(leader.max_journey_time - optimal.max_journey_time) if leader else None
+        
+        CANDIDATE_COUNT.observe(len(top_candidates))
+        if regret is not None:
+            ESTIMATE_REGRET.observe(regret)
+        logger.info(
+            f"Evaluated K={len(top_candidates)}: {optimal.station_name} won from estimate rank "
+            f"{winner_rank}, regret vs the estimate's leader "
+            f"{'n/a (pruned)' if regret is None else regret} min"
+        )
+        return winner_rank, regret
+    
+    @staticmethod
+    def _meeting_station(
+        station_name: str,
+        station_lat: float,
+        station_lon: float,
+        journey_times: List[JourneyTime],
+        participants: int
+    ) -> MeetingStation:
+        total_time = sum(jt.duration_minutes for jt in journey_times)
+        max_time = max([jt.duration_minutes for jt in journey_times]) if journey_times else 0
+        avg_time = total_time / participants if participants else 0
+        min_time = min([jt.duration_minutes for jt in journey_times]) if journey_times else 0
+        
+        # Calculate fairness score based on maximum journey time and spread
+        # Lower max time and spread = more fair
+        time_spread = max_time - min_time
+        
+        # Convert to a discrete text rating prioritizing max time and spread
+        if max_time <= 20 and time_spread <= 5:
+            fairness_score = "Very Fair"
+        elif max_time <= 30 and time_spread <= 10:
+            fairness_score = "Fair"
+        elif max_time <= 40 and time_spread <= 15:
+            fairness_score = "Moderate"
+        elif max_time <= 50 and time_spread <= 20:
+            fairness_score = "Somewhat Unfair"
+        else:
+            fairness_score = "Unfair"
+        
+        return MeetingStation(
+            station_name=station_name,
+            latitude=station_lat,
+            longitude=station_lon,
+            average_journey_time=avg_time,
+            max_journey_time=max_time,
+            total_journey_time=total_time,
+            fairness_score=fairness_score,
+            journey_times=journey_times
+        )
+    
+    @staticmethod
+    def _rank_results(
+        results: List[MeetingStation]
+    ) -> Tuple[Optional[MeetingStation], List[MeetingStation]]:
+        # Sort by maximum journey time first (fairness priority), then by average time
+        fairness_order = {
+            "Very Fair": 0, "Fair": 1, "Moderate": 2, "Somewhat Unfair": 3, "Unfair": 4
+        }
+        results = sorted(results, key=lambda x: (
+            x.max_journey_time, fairness_order.get(x.fairness_score, 5), x.average_journey_time
+        ))
+        
+        optimal = results[0] if results else None
+        alternatives = results[1:1 + ALTERNATIVE_STATIONS] if len(results) > 1 else []
+        
+        return optimal, alternatives
+    
+    def _travel_matrix_results(
         self,
         locations: List[ProcessedLocation],
-        use_tfl_api: bool = True
-    ) -> Tuple[MeetingStation, List[MeetingStation]]:
+        candidates: int = 7
+    ) -> List[MeetingStation]:
+        """Best stations by matrix journey time, searched across the whole network"""
+        points = [(loc.latitude, loc.longitude) for loc in locations]
+        totals, walking = self.travel_matrix.journey_minutes(points)
+        durations = np.rint(totals).astype(int)
+        
+        # Same ordering as the final ranking: max time, then total time
+        order = np.lexsort((durations.sum(axis=0), durations.max(axis=0)))[:candidates]
+        
+        results = []
+        for station_id in order:
+            station_name = self.travel_matrix.names[station_id]
+            station_lat, station_lon = LONDON_STATIONS[station_name]
+            journey_times = [
+                JourneyTime(
+                    from_location=loc.name,
+                    to_station=station_name,
+                    duration_minutes=int(durations[i, station_id]),
+                    route_type="public_transport",
+                    total_walking_duration=int(round(walking[i, station_id]))
+                )
+                for i, loc in enumerate(locations)
+            ]
+            results.append(self._meeting_station(
+                station_name, station_lat, station_lon, journey_times, len(locations)
+            ))
+        return results
+    
+    async def _fan_out(
+        self,
+        stations: List[Tuple[str, Tuple[float, float]]],
+        locations: List[ProcessedLocation],
+        keep: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Optional[int], Union[JourneyTime, int]]]:
+        """Fetch every station × location journey, yielding each as it completes.
+        
+        Yields (station_index, location_index, journey). With ``keep`` set this
+        is a minimax branch and bound: once ``keep`` stations are fully
+        resolved, a station with any journey already longer than the keep-th
+        best max time can no longer be ranked in the top ``keep``, so its
+        outstanding calls are cancelled and (station_index, None, cancelled)
+        is yielded instead.
+        """
         import asyncio
-        from geopy.distance import geodesic
         
-        # First, quickly estimate distances to find best candidates
-        candidates = []
-        for station_name, (station_lat, station_lon) in LONDON_STATIONS.items():
-            total_distance = 0
-            max_distance = 0
-            
-            for loc in locations:
-                distance = geodesic(
-                    (loc.latitude, loc.longitude),
-                    (station_lat, station_lon)
-                ).km
-                total_distance += distance
-                max_distance = max(max_distance, distance)
-            
-            avg_distance = total_distance / len(locations)
-            candidates.append({
-                'name': station_name,
-                'coords': (station_lat, station_lon),
-                'avg_distance': avg_distance,
-                'max_distance': max_distance
-            })
-        
-        # Sort by maximum distance first (fairness priority), then by average distance
-        candidates.sort(key=lambda x: (x['max_distance'], x['avg_distance']))
-        top_candidates = candidates[:7]
-        
-        if use_tfl_api:
-            # Prepare ALL API calls at once (all stations × all locations)
-            all_tasks = []
-            task_mapping = []  # Keep track of which task belongs to which station/location
-            
-            for candidate in top_candidates:
-                station_name = candidate['name']
-                station_lat, station_lon = candidate['coords']
-                
-                for loc in locations:
-                    task = self.tfl_service.get_journey_details(
-                        loc.latitude, loc.longitude,
-                        station_lat, station_lon,
-                        loc.name,
-                        station_name
+        # Station-major order, so the scheduler admits the most promising
+        # candidates first and a bound is established early
+        tasks = {}
+        station_tasks = [[] for _ in stations]
+        for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations):
+            for location_index, loc in enumerate(locations):
+                task = asyncio.ensure_future(self.tfl_service.get_journey_details(
+                    loc.latitude, loc.longitude,
+                    station_lat, station_lon,
+                    loc.name,
+                    station_name
+                ))
+                tasks[task] = (station_index, location_index)
+                station_tasks[station_index].append(task)
+        
+        logger.info(f"Making {len(tasks)} TfL API calls in parallel...")
+        known_max = [0] * len(stations)
+        resolved = [0] * len(stations)
+        complete_maxes: List[int] = []
+        pruned = set()
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    station_index, location_index = tasks[task]
+                    journey = task.result()
+                    known_max[station_index] = max(
+                        known_max[station_index], journey.duration_minutes
                     )
-                    all_tasks.append(task)
-                    task_mapping.append({
-                        'station_name': station_name,
-                        'station_coords': (station_lat, station_lon),
-                        'location_name': loc.name,
-                        'location': loc
-                    })
-            
-            # Execute ALL API calls in parallel at once
-            logger.info(f"Making {len(all_tasks)} TfL API calls in parallel...")
-            all_results = await asyncio.gather(*all_tasks)
-            
-            # Now organize results by station
-            station_data = {}
-            for mapping, journey_detail in zip(task_mapping, all_results):
-                station_name = mapping['station_name']
-                if station_name not in station_data:
-                    station_data[station_name] = {
-                        'coords': mapping['station_coords'],
-                        'journeys': []
-                    }
-                station_data[station_name]['journeys'].append(journey_detail)
-            
-            # Build station results from organized data
-            results = []
-            for station_name, data in station_data.items():
-                station_lat, station_lon = data['coords']
-                journey_times = data['journeys']  # These are already JourneyTime objects with details
-                total_time = 0
-                max_time = 0
-                
-                for journey in journey_times:
-                    duration = journey.duration_minutes
-                    total_time += duration
-                    max_time = max(max_time, duration)
+                    resolved[station_index] += 1
+                    if resolved[station_index] == len(locations):
+                        bisect.insort(complete_maxes, known_max[station_index])
+                    yield station_index, location_index, journey
                 
-                avg_time = total_time / len(locations) if locations else 0
-                min_time = min([jt.duration_minutes for jt in journey_times]) if journey_times else 0
-                
-                # Calculate fairness score based on maximum journey time and spread
-                # Lower max time and spread = more fair
-                time_spread = max_time - min_time
-                
-                # Convert to a discrete text rating prioritizing max time and spread
-                if max_time <= 20 and time_spread <= 5:
-                    fairness_score = "Very Fair"
-                elif max_time <= 30 and time_spread <= 10:
-                    fairness_score = "Fair"
-                elif max_time <= 40 and time_spread <= 15:
-                    fairness_score = "Moderate"
-                elif max_time <= 50 and time_spread <= 20:
-                    fairness_score = "Somewhat Unfair"
-                else:
-                    fairness_score = "Unfair"
-                
-                station = MeetingStation(
-                    station_name=station_name,
-                    latitude=station_lat,
-                    longitude=station_lon,
-                    average_journey_time=avg_time,
-                    max_journey_time=max_time,
-                    total_journey_time=total_time,
-                    fairness_score=fairness_score,
-                    journey_times=journey_times
-                )
-                results.append(station)
-        else:
-            # Use distance estimates for all candidates
+                if not keep or len(complete_maxes) < keep:
+                    continue
+                bound = complete_maxes[keep - 1]
+                for station_index in range(len(stations)):
+                    if (
+                        station_index in pruned
+                        or resolved[station_index] == len(locations)
+                        or known_max[station_index] <= bound
+                    ):
+                        continue
+                    outstanding = [task for task in station_tasks[station_index] if not task.done()]
+                    for task in outstanding:
+                        task.cancel()
+                    pending.difference_update(outstanding)
+                    pruned.add(station_index)
+                    yield station_index, None, len(outstanding)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _evaluate_stations(
+        self,
+        stations: List[Tuple[str, Tuple[float, float]]],
+        locations: List[ProcessedLocation],
+        use_tfl_api: bool = True,
+        keep: Optional[int] = None
+    ) -> Tuple[List[MeetingStation], int]:
+        """Journey times from every location to each (name, coords) station.
+        
+        Returns the stations in input order and the number of TfL calls
+        cancelled; stations pruned by the ``keep`` bound are left out.
+        """
+        if not use_tfl_api:
+            # Use journey-time estimates for all stations, in one batch
+            estimates = np.rint(self.tfl_service.estimator.predict_matrix(
+                [(loc.latitude, loc.longitude) for loc in locations],
+                [coords for _, coords in stations]
+            )).astype(int)
             results = []
-            for candidate in top_candidates:
-                station_name = candidate['name']
-                station_lat, station_lon = candidate['coords']
-                
-                journey_times = []
-                total_time = 0
-                max_time = 0
-                
-                for loc in locations:
-                    duration = self.tfl_service._estimate_journey_time(
-                        loc.latitude, loc.longitude,
-                        station_lat, station_lon
-                    )
-                    total_time += duration
-                    max_time = max(max_time, duration)
-                    journey_times.append(JourneyTime(
+            for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations):
+                journey_times = [
+                    JourneyTime(
                         from_location=loc.name,
                         to_station=station_name,
-                        duration_minutes=duration,
+                        duration_minutes=int(estimates[location_index, station_index]),
                         route_type="public_transport"
-                    ))
-                
-                avg_time = total_time / len(locations) if locations else 0
-                min_time = min([jt.duration_minutes for jt in journey_times]) if journey_times else 0
-                
-                # Calculate fairness score based on maximum journey time and spread
-                # Lower max time and spread = more fair
-                time_spread = max_time - min_time
-                
-                # Convert to a discrete text rating prioritizing max time and spread
-                if max_time <= 20 and time_spread <= 5:
-                    fairness_score = "Very Fair"
-                elif max_time <= 30 and time_spread <= 10:
-                    fairness_score = "Fair"
-                elif max_time <= 40 and time_spread <= 15:
-                    fairness_score = "Moderate"
-                elif max_time <= 50 and time_spread <= 20:
-                    fairness_score = "Somewhat Unfair"
-                else:
-                    fairness_score = "Unfair"
+                    )
+                    for location_index, loc in enumerate(locations)
+                ]
                 
-                station = MeetingStation(
-                    station_name=station_name,
-                    latitude=station_lat,
-                    longitude=station_lon,
-                    average_journey_time=avg_time,
-                    max_journey_time=max_time,
-                    total_journey_time=total_time,
-                    fairness_score=fairness_score,
-                    journey_times=journey_times
-                )
-                results.append(station)
+                results.append(self._meeting_station(
+                    station_name, station_lat, station_lon, journey_times, len(locations)
+                ))
+            return results, 0
         
-        # Sort by maximum journey time first (fairness priority), then by average time
-        fairness_order = {"Very Fair": 0, "Fair": 1, "Moderate": 2, "Somewhat Unfair": 3, "Unfair": 4}
-        results.sort(key=lambda x: (x.max_journey_time, fairness_order.get(x.fairness_score, 5), x.average_journey_time))
+        journeys = [[None] * len(locations) for _ in stations]
+        pruned = set()
+        pruned_calls = 0
+        with _FAN_OUT_SECONDS.time():
+            fan_out = self._fan_out(stations, locations, keep)
+            async for station_index, location_index, outcome in fan_out:
+                if location_index is None:
+                    pruned.add(station_index)
+                    pruned_calls += outcome
+                else:
+                    journeys[station_index][location_index] = outcome
         
-        optimal = results[0] if results else None
-        alternatives = results[1:4] if len(results) > 1 else []  # Only return top 3 alternatives
+        if pruned_calls:
+            logger.info(f"Pruned {pruned_calls} TfL calls for {len(pruned)} dominated stations")
         
-        return optimal, alternatives
+        results = [
+            self._meeting_station(
+                station_name, station_lat, station_lon,
+                journeys[station_index], len(locations)
+            )
+            for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations)
+            if station_index not in pruned
+        ]
+        return results, pruned_calls
     
-    async def find_meeting_point(
+    async def _greedy_search(
         self,
-        locations: List[LocationInput],
+        locations: List[ProcessedLocation],
         use_tfl_api: bool = True
-    ) -> MeetingPointResponse:
-        processed_locations = await self.process_locations(locations)
+    ) -> Tuple[List[MeetingStation], SearchStats]:
+        """Fast Greedy hill climbing over the station adjacency graph.
         
-        if len(processed_locations) < 2:
-            raise ValueError("Need at least 2 valid locations to find a meeting point")
+        Starts at the station nearest the participants' centroid and, each
+        iteration, evaluates only its most promising neighbours, moving to the
+        best one while it improves (max time, then total time).
+        """
+        graph = self.station_graph
+        points = [(loc.latitude, loc.longitude) for loc in locations]
         
-        optimal, alternatives = await self.calculate_optimal_meeting_point(
-            processed_locations, 
-            use_tfl_api
+        # Cheap prior for ranking neighbours: matrix times if built, else estimates
+        if self.travel_matrix:
+            prior_times, _ = self.travel_matrix.journey_minutes(points)
+            prior_max, prior_total = prior_times.max(axis=0), prior_times.sum(axis=0)
+        elif self.tfl_service.estimator.calibrated:
+            prior_max, prior_total = self.candidate_scorer.score(
+                points, minutes=self.tfl_service.estimator.predict_matrix
+            )
+        else:
+            prior_max, prior_total = self.candidate_scorer.score(points)
+        
+        evaluated: Dict[int, MeetingStation] = {}
+        
+        async def evaluate(station_ids: List[int]):
+            pending = [i for i in station_ids if i not in evaluated]
+            stations = [
+                (graph.names[i], (float(graph.coords[i, 0]), float(graph.coords[i, 1])))
+                for i in pending
+            ]
+            results, _ = await self._evaluate_stations(stations, locations, use_tfl_api)
+            for station_id, result in zip(pending, results):
+                evaluated[station_id] = result
+        
+        def objective(station_id: int):
+            result = evaluated[station_id]
+            return (result.max_journey_time, result.total_journey_time)
+        
+        center_lat = sum(lat for lat, _ in points) / len(points)
+        center_lon = sum(lon for _, lon in points) / len(points)
+        current = self.station_index.nearest(center_lat, center_lon, 1)[0][0]
+        await evaluate([current])
+        
+        iterations = 0
+        while iterations < settings.greedy_max_iterations:
+            iterations += 1
+            neighbours = sorted(
+                graph.neighbors[current],
+                key=lambda i: (prior_max[i], prior_total[i])
+            )[:settings.greedy_neighbors_per_step]
+            await evaluate(neighbours)
+            
+            best = min(neighbours, key=objective, default=current)
+            if objective(best) >= objective(current):
+                break
+            logger.info(f"Greedy step {iterations}: {graph.names[current]} -> {graph.names[best]}")
+            current = best
+        
+        stats = SearchStats(
+            strategy="greedy",
+            iterations=iterations,
+            stations_evaluated=len(evaluated),
+            api_calls=len(evaluated) * len(locations) if use_tfl_api else 0
         )
+        return list(evaluated.values()), stats
+    
+    async def calculate_optimal_meeting_point(
+        self,
+        locations: List[ProcessedLocation],
+        use_tfl_api: bool = True,
+        use_travel_matrix: bool = False,
+        strategy: str = "candidates",
+        max_api_calls: Optional[int] = None
+    ) -> Tuple[MeetingStation, List[MeetingStation], SearchStats]:
+        if use_travel_matrix:
+            if not self.travel_matrix:
+                raise ValueError("Travel matrix mode is not available on this server")
+            # Every station is scored from the precomputed matrix; no upstream calls
+            results = self._travel_matrix_results(locations)
+            stats = SearchStats(
+                strategy="matrix",
+                iterations=1,
+                stations_evaluated=len(self.travel_matrix),
+                api_calls=0
+            )
+        elif strategy == "greedy":
+            results, stats = await self._greedy_search(locations, use_tfl_api)
+        else:
+            # First, quickly estimate journey times to find the candidates still in
+            # contention among the stations around the group, sorted by maximum
+            # time first (fairness priority), then by average time
+            points = [(loc.latitude, loc.longitude) for loc in locations]
+            # Estimates alone make no TfL calls, so there is no budget to enforce
+            top_candidates = self._top_candidates(
+                points, max_api_calls if use_tfl_api else None
+            )
+            results, pruned_calls = await self._evaluate_stations(
+                [(candidate['name'], candidate['coords']) for candidate in top_candidates],
+                locations,
+                use_tfl_api,
+                keep=1 + ALTERNATIVE_STATIONS if settings.prune_dominated_candidates else None
+            )
+            stats = SearchStats(
+                strategy="candidates",
+                iterations=1,
+                stations_evaluated=len(top_candidates),
+                api_calls=len(top_candidates) * len(locations) - pruned_calls if use_tfl_api else 0,
+                pruned_calls=pruned_calls
+            )
         
-        if not optimal:
-            raise ValueError("Could not calculate optimal meeting point")
+        optimal, alternatives = self._rank_results(results)
+        if stats.strategy == "candidates" and use_tfl_api:
+            stats.winner_estimate_rank, stats.estimate_regret_minutes = self._record_candidates(
+                top_candidates, results, optimal
+            )
+        return optimal, alternatives, stats
+    
+    async def _processed_or_raise(self, locations: List[LocationInput]) -> List[ProcessedLocation]:
+        processed_locations = await self.process_locations(locations)
         
+        if len(processed_locations) < 2:
+            raise ValueError("Need at least 2 valid locations to find a meeting point")
+        return processed_locations
+    
+    @staticmethod
+    def _map_center(processed_locations: List[ProcessedLocation]) -> Tuple[float, float]:
         center_lat = sum(loc.latitude for loc in processed_locations) / len(processed_locations)
         center_lon = sum(loc.longitude for loc in processed_locations) / len(processed_locations)
+        return (center_lat, center_lon)
+    
+    def _response(
+        self,
+        processed_locations: List[ProcessedLocation],
+        optimal: Optional[MeetingStation],
+        alternatives: List[MeetingStation],
+        search_stats: SearchStats
+    ) -> MeetingPointResponse:
+        if not optimal:
+            raise ValueError("Could not calculate optimal meeting point")
+        
+        # Only returned journeys have their path geometry decoded
+        with _PATHS_SECONDS.time():
+            for station in [optimal, *alternatives]:
+                for journey in station.journey_times:
+                    resolve_paths(journey)
         
         return MeetingPointResponse(
             request_id=str(uuid.uuid4()),
@@ -265,5 +562,419 @@ class MeetingCalculator:
             optimal_station=optimal,
             alternative_stations=alternatives,
             processed_locations=processed_locations,
-            map_center=(center_lat, center_lon)
-        )
\ No newline at end of file
+            map_center=self._map_center(processed_locations),
+            search_stats=search_stats
+        )
+    
+    async def find_meeting_point(
+        self,
+        locations: List[LocationInput],
+        use_tfl_api: bool = True,
+        use_travel_matrix: bool = False,
+        strategy: str = "candidates",
+        max_api_calls: Optional[int] = None
+    ) -> MeetingPointResponse:
+        participants = self.result_cache.participants(locations)
+        cache_key = self.result_cache.key(
+            participants, use_tfl_api, use_travel_matrix, strategy, max_api_calls
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return self._reissue(cached[1], cached[0], locations, participants)
+        
+        processed_locations = await self._processed_or_raise(locations)
+        
+        optimal, alternatives, search_stats = await self.calculate_optimal_meeting_point(
+            processed_locations, 
+            use_tfl_api,
+            use_travel_matrix,
+            strategy,
+            max_api_calls
+        )
+        
+        response = self._response(processed_locations, optimal, alternatives, search_stats)
+        # Answers missing a location that failed to geocode, or standing in
+        # estimates for TfL journeys that failed, are not worth pinning
+        if len(processed_locations) == len(locations) and not (
+            use_tfl_api and self._has_estimates(response)
+        ):
+            self.result_cache.put(cache_key, participants, response)
+        return response
+    
+    @staticmethod
+    def _has_estimates(response: MeetingPointResponse) -> bool:
+        return any(
+            journey.route_type == "estimated"
+            for station in [response.optimal_station, *response.alternative_stations]
+            for journey in station.journey_times
+        )
+    
+    def _reissue(
+        self,
+        response: MeetingPointResponse,
+        cached_participants: List[Participant],
+        locations: List[LocationInput],
+        participants: List[Participant]
+    ) -> MeetingPointResponse:
+        """A cached response answered afresh for an equivalent request.
+        
+        Gets a new request_id, and lists the participants (and every
+        station's journeys) in this request's order with its own coordinates.
+        """
+        slots: Dict[Participant, List[int]] = {}
+        for index, participant in enumerate(cached_participants):
+            slots.setdefault(participant, []).append(index)
+        order = [slots[participant].pop(0) for participant in participants]
+        
+        processed_locations = []
+        for loc, index in zip(locations, order):
+            cached_loc = response.processed_locations[index]
+            has_coords = bool(loc.latitude and loc.longitude)
+            processed_locations.append(ProcessedLocation(
+                name=loc.name,
+                address=loc.address,
+                latitude=loc.latitude if has_coords else cached_loc.latitude,
+                longitude=loc.longitude if has_coords else cached_loc.longitude
+            ))
+        
+        update = {
+            "request_id": str(uuid.uuid4()),
+            "created_at": datetime.utcnow(),
+            "processed_locations": processed_locations,
+            "map_center": self._map_center(processed_locations)
+        }
+        if order != sorted(order):
+            def reordered(station: MeetingStation) -> MeetingStation:
+                return station.model_copy(update={
+                    "journey_times": [station.journey_times[index] for index in order]
+                })
+            update["optimal_station"] = reordered(response.optimal_station)
+            update["alternative_stations"] = [
+                reordered(station) for station in response.alternative_stations
+            ]
+        return response.model_copy(update=update)
+    
+    def cache_stats(self) -> Dict:
+        return self.result_cache.stats()
+    
+    async def stream_meeting_point(
+        self,
+        locations: List[LocationInput],
+        use_tfl_api: bool = True,
+        use_travel_matrix: bool = False,
+        strategy: str = "candidates",
+        max_api_calls: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Union[Dict, MeetingPointResponse]]]:
+        """Progressive calculation, yielding (event, payload) pairs.
+        
+        ``estimate`` comes first, ranked from the journey estimator; with the TfL
+        candidate fan-out a ``station`` event follows every resolved journey
+        with that station's updated score (estimates stand in for journeys
+        still pending), and ``pruned`` when a dominated station's remaining
+        calls are cancelled; ``result`` carries the final MeetingPointResponse.
+        """
+        processed_locations = await self._processed_or_raise(locations)
+        points = [(loc.latitude, loc.longitude) for loc in processed_locations]
+        fan_out = self._uses_tfl_candidates(use_tfl_api, use_travel_matrix, strategy)
+        # The call budget only limits the TfL candidate fan-out
+        top_candidates = self._top_candidates(points, max_api_calls if fan_out else None)
+        stations = [(candidate['name'], candidate['coords']) for candidate in top_candidates]
+        
+        estimated, _ = await self._evaluate_stations(
+            stations, processed_locations, use_tfl_api=False
+        )
+        yield "estimate", {
+            "processed_locations": [loc.model_dump() for loc in processed_locations],
+            "map_center": self._map_center(processed_locations),
+            "stations": [
+                station.model_dump(exclude={"journey_times"})
+                for station in sorted(
+                    estimated, key=lambda x: (x.max_journey_time, x.average_journey_time)
+                )
+            ]
+        }
+        
+        if not fan_out:
+            optimal, alternatives, search_stats = await self.calculate_optimal_meeting_point(
+                processed_locations,
+                use_tfl_api,
+                use_travel_matrix,
+                strategy,
+                max_api_calls
+            )
+            yield "result", self._response(processed_locations, optimal, alternatives, search_stats)
+            return
+        
+        # Start from the estimates; each resolved journey replaces its estimate
+        journeys = [list(station.journey_times) for station in estimated]
+        resolved = [0] * len(stations)
+        pruned = set()
+        pruned_calls = 0
+        completed = 0
+        total = len(stations) * len(processed_locations)
+        keep = 1 + ALTERNATIVE_STATIONS if settings.prune_dominated_candidates else None
+        
+        fan_out = self._fan_out(stations, processed_locations, keep)
+        async for station_index, location_index, outcome in fan_out:
+            station_name, (station_lat, station_lon) = stations[station_index]
+            if location_index is None:
+                pruned.add(station_index)
+                pruned_calls += outcome
+                completed += outcome
+                yield "pruned", {
+                    "station_name": station_name,
+                    "cancelled_calls": outcome,
+                    "completed": completed,
+                    "total": total
+                }
+                continue
+            
+            journeys[station_index][location_index] = outcome
+            resolved[station_index] += 1
+            completed += 1
+            station = self._meeting_station(
+                station_name, station_lat, station_lon,
+                journeys[station_index], len(processed_locations)
+            )
+            yield "station", {
+                **station.model_dump(exclude={"journey_times"}),
+                "resolved_journeys": resolved[station_index],
+                "completed": completed,
+                "total": total
+            }
+        
+        results = [
+            self._meeting_station(
+                station_name, station_lat, station_lon,
+                journeys[station_index], len(processed_locations)
+            )
+            for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations)
+            if station_index not in pruned
+        ]
+        optimal, alternatives = self._rank_results(results)
+        winner_rank, regret = self._record_candidates(top_candidates, results, optimal)
+        search_stats = SearchStats(
+            strategy="candidates",
+            iterations=1,
+            stations_evaluated=len(stations),
+            api_calls=total - pruned_calls,
+            pruned_calls=pruned_calls,
+            winner_estimate_rank=winner_rank,
+            estimate_regret_minutes=regret
+        )
+        yield "result", self._response(processed_locations, optimal, alternatives, search_stats)
+    
+    async def _batch_item(self, index: int, request: MeetingPointRequest) -> MeetingPointBatchItem:
+        try:
+            result = await self.find_meeting_point(
+                request.locations,
+                request.use_tfl_api,
+                request.use_travel_matrix,
+                request.strategy,
+                request.max_api_calls
+            )
+            return MeetingPointBatchItem(index=index, result=result)
+        except ValueError as e:
+            return MeetingPointBatchItem(index=index, error=str(e))
+        except Exception as e:
+            logger.exception(f"Batch request {index} failed")
+            return MeetingPointBatchItem(index=index, error=f"Internal server error: {str(e)}")
+    
+    def _pooled_result(
+        self,
+        processed: List[ProcessedLocation],
+        top_candidates: List[Dict],
+        stations: List[Tuple[str, Tuple[float, float]]],
+        journeys: List[List[JourneyTime]]
+    ) -> MeetingPointResponse:
+        """Response for a batch request once all its pooled journeys have arrived"""
+        results = [
+            self._meeting_station(
+                station_name, station_lat, station_lon,
+                journeys[station_index], len(processed)
+            )
+            for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations)
+        ]
+        optimal, alternatives = self._rank_results(results)
+        winner_rank, regret = self._record_candidates(top_candidates, results, optimal)
+        search_stats = SearchStats(
+            strategy="candidates",
+            iterations=1,
+            stations_evaluated=len(stations),
+            api_calls=len(stations) * len(processed),
+            winner_estimate_rank=winner_rank,
+            estimate_regret_minutes=regret
+        )
+        return self._response(processed, optimal, alternatives, search_stats)
+    
+    async def find_meeting_points_batch(
+        self,
+        requests: List[MeetingPointRequest]
+    ) -> AsyncIterator[Union[MeetingPointBatchItem, BatchSummary]]:
+        """Answer many requests, yielding each MeetingPointBatchItem as it completes.
+        
+        The (origin, station) journeys of every TfL candidate-strategy request
+        are pooled, and each unique journey is fetched once at background
+        priority, at most ``batch_max_concurrency`` at a time. Other modes run
+        as ordinary requests alongside. Every request ends as exactly one item,
+        with either a result or an error, and a BatchSummary is yielded last.
+        """
+        import asyncio
+        
+        processed_batch = await asyncio.gather(
+            *(self.process_locations(request.locations) for request in requests),
+            return_exceptions=True
+        )
+        
+        plans = {}
+        journeys = {}
+        remaining = {}
+        waiters: Dict[Tuple, List[Tuple[int, int, int]]] = {}
+        pair_args: Dict[Tuple, Tuple] = {}
+        standalone = {}
+        succeeded = failed = 0
+        
+        for index, (request, processed) in enumerate(zip(requests, processed_batch)):
+            if isinstance(processed, Exception):
+                logger.error(f"Batch request {index} could not be geocoded: {processed}")
+                failed += 1
+                yield MeetingPointBatchItem(index=index, error=f"Geocoding error: {str(processed)}")
+                continue
+            if len(processed) < 2:
+                failed += 1
+                yield MeetingPointBatchItem(
+                    index=index,
+                    error="Need at least 2 valid locations to find a meeting point"
+                )
+                continue
+            if not self._uses_tfl_candidates(
+                request.use_tfl_api, request.use_travel_matrix, request.strategy
+            ):
+                standalone[index] = request
+                continue
+            
+            points = [(loc.latitude, loc.longitude) for loc in processed]
+            try:
+                top_candidates = self._top_candidates(points, request.max_api_calls)
+            except ValueError as e:
+                failed += 1
+                yield MeetingPointBatchItem(index=index, error=str(e))
+                continue
+            if not top_candidates:
+                failed += 1
+                yield MeetingPointBatchItem(
+                    index=index, error="Could not calculate optimal meeting point"
+                )
+                continue
+            stations = [(candidate['name'], candidate['coords']) for candidate in top_candidates]
+            plans[index] = (processed, top_candidates, stations)
+            journeys[index] = [[None] * len(processed) for _ in stations]
+            remaining[index] = len(stations) * len(processed)
+            
+            for station_index, (station_name, (station_lat, station_lon)) in enumerate(stations):
+                for location_index, loc in enumerate(processed):
+                    key = (round(loc.latitude, 6), round(loc.longitude, 6), station_name)
+                    if key not in waiters:
+                        waiters[key] = []
+                        pair_args[key] = (
+                            loc.latitude, loc.longitude, station_lat, station_lon, station_name
+                        )
+                    waiters[key].append((index, station_index, location_index))
+        
+        journeys_requested = sum(remaining.values())
+        logger.info(
+            f"Batch of {len(requests)} requests needs {journeys_requested} journeys, "
+            f"{len(waiters)} unique"
+        )
+        
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+        
+        async def fetch(key: Tuple) -> JourneyTime:
+            from_lat, from_lon, to_lat, to_lon, station_name = pair_args[key]
+            async with semaphore:
+                return await self.tfl_service.get_journey_details(
+                    from_lat, from_lon,
+                    to_lat, to_lon,
+                    to_name=station_name,
+                    priority=PRIORITY_BACKGROUND
+                )
+        
+        # Created in request order, so earlier requests tend to finish first
+        fetches = {asyncio.ensure_future(fetch(key)): key for key in waiters}
+        others = {
+            asyncio.ensure_future(self._batch_item(index, request)): index
+            for index, request in standalone.items()
+        }
+        pending = set(fetches) | set(others)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task in others:
+                        if task.cancelled():
+                            item = MeetingPointBatchItem(
+                                index=others[task], error="Request was cancelled"
+                            )
+                        else:
+                            item = task.result()
+                        if item.error:
+                            failed += 1
+                        else:
+                            succeeded += 1
+                        yield item
+                        continue
+                    
+                    if task.cancelled():
+                        error = asyncio.CancelledError("journey fetch was cancelled")
+                    else:
+                        error = task.exception()
+                    for index, station_index, location_index in waiters[fetches[task]]:
+                        if not remaining[index]:
+                            # Already answered with an error by another of its journeys
+                            continue
+                        if error is not None:
+                            logger.error(
+                                f"Batch request {index} failed fetching a journey: {error}"
+                            )
+                            remaining[index] = 0
+                            failed += 1
+                            yield MeetingPointBatchItem(
+                                index=index, error=f"Internal server error: {str(error)}"
+                            )
+                            continue
+                        
+                        journey = task.result()
+                        processed, top_candidates, stations = plans[index]
+                        journeys[index][station_index][location_index] = journey.model_copy(
+                            update={'from_location': processed[location_index].name}
+                        )
+                        remaining[index] -= 1
+                        if remaining[index]:
+                            continue
+                        
+                        try:
+                            item = MeetingPointBatchItem(
+                                index=index,
+                                result=self._pooled_result(
+                                    processed, top_candidates, stations, journeys[index]
+                                )
+                            )
+                            succeeded += 1
+                        except Exception as e:
+                            logger.exception(f"Batch request {index} failed")
+                            item = MeetingPointBatchItem(
+                                index=index, error=f"Internal server error: {str(e)}"
+                            )
+                            failed += 1
+                        yield item
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        yield BatchSummary(
+            requests=len(requests),
+            succeeded=succeeded,
+            failed=failed,
+            journeys_requested=journeys_requested,
+            unique_journeys=len(waiters)
+        )
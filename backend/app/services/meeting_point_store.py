@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+import logging
+import secrets
+import sqlite3
+import threading
+
+from app.schemas import MeetingPointResponse, SavedMeetingPoint
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_meeting_points (
+    id TEXT PRIMARY KEY,
+    share_token TEXT UNIQUE,
+    user_id TEXT,
+    name TEXT NOT NULL,
+    is_public INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    payload BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS saved_meeting_points_user ON saved_meeting_points (user_id);
+"""
+
+
+class MeetingPointStore(ABC):
+    """Storage for saved and shared meeting points.
+
+    A saved point is serialized once, on save; reads hand back that JSON
+    untouched, so serving a shared plan never revalidates or recomputes it.
+
+    There are no accounts, so a point's id is a bearer secret: it is random
+    (128 bits) and opens the point whether or not it is public, so only the
+    saver gets it for a private point. Share tokens open public points only.
+    """
+
+    def save(
+        self,
+        meeting_data: MeetingPointResponse,
+        name: str,
+        description: Optional[str] = None,
+        user_id: Optional[str] = None,
+        is_public: bool = False
+    ) -> SavedMeetingPoint:
+        now = datetime.utcnow()
+        saved = SavedMeetingPoint(
+            id=secrets.token_urlsafe(16),
+            user_id=user_id,
+            name=name,
+            description=description,
+            meeting_data=meeting_data,
+            created_at=now,
+            updated_at=now,
+            is_public=is_public,
+            # Only public points can be opened by link
+            share_token=secrets.token_urlsafe(16) if is_public else None
+        )
+        self._insert(saved, saved.model_dump_json().encode())
+        logger.info(f"Saved meeting point {saved.id} ({'shared' if is_public else 'private'})")
+        return saved
+
+    @abstractmethod
+    def get_json(self, saved_id: str) -> Optional[bytes]:
+        """SavedMeetingPoint JSON by id"""
+
+    @abstractmethod
+    def get_shared_json(self, share_token: str) -> Optional[bytes]:
+        """SavedMeetingPoint JSON by share token, for public points only"""
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def _insert(self, saved: SavedMeetingPoint, payload: bytes):
+        """Store a new point with its serialized JSON"""
+
+
+class SQLiteMeetingPointStore(MeetingPointStore):
+    """Local SQLite (WAL) implementation; works offline.
+
+    Both reads are one lookup on an indexed column (the primary key, or the
+    unique share_token index) returning the stored payload.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_json(self, saved_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM saved_meeting_points WHERE id = ?",
+                (saved_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_shared_json(self, share_token: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM saved_meeting_points WHERE share_token = ? AND is_public = 1",
+                (share_token,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM saved_meeting_points").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _insert(self, saved: SavedMeetingPoint, payload: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO saved_meeting_points "
+                "(id, share_token, user_id, name, is_public, created_at, updated_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    saved.id, saved.share_token, saved.user_id, saved.name, int(saved.is_public),
+                    saved.created_at.isoformat(), saved.updated_at.isoformat(), payload
+                )
+            )
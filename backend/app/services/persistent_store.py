@@ -0,0 +1,253 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+from app.schemas import JourneyTime
+from app.services.journey_parser import loads
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journeys (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS journeys_hits ON journeys (hits DESC);
+
+CREATE TABLE IF NOT EXISTS geocodes (
+    query TEXT PRIMARY KEY,
+    latitude REAL,
+    longitude REAL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS geocodes_hits ON geocodes (hits DESC);
+
+CREATE TABLE IF NOT EXISTS journey_observations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_lat REAL NOT NULL,
+    from_lon REAL NOT NULL,
+    to_lat REAL NOT NULL,
+    to_lon REAL NOT NULL,
+    minutes INTEGER NOT NULL,
+    observed_at REAL NOT NULL
+);
+"""
+
+
+def encode_journey(
+    journey: JourneyTime,
+    line_strings: Optional[Sequence[Optional[str]]] = None
+) -> bytes:
+    """Compact blob: default-free JSON, zlib-compressed.
+
+    A leg whose path is still TfL's raw lineString (``line_strings``, by
+    default the legs' own) is stored with that instead of decoded stops, so
+    persisting a journey never decodes its geometry.
+    """
+    if line_strings is None:
+        line_strings = [leg._line_string for leg in journey.legs]
+    data = journey.model_dump(mode="json", exclude_defaults=True)
+    for leg, line_string in zip(data.get("legs", ()), line_strings):
+        if line_string is not None:
+            leg.pop("intermediate_stops", None)
+            leg["line_string"] = line_string
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 6)
+
+
+def decode_journey(payload: bytes) -> JourneyTime:
+    data = loads(zlib.decompress(payload))
+    journey = JourneyTime.model_validate(data)
+    for leg, raw in zip(journey.legs, data.get("legs", ())):
+        leg._line_string = raw.get("line_string")
+    return journey
+
+
+class PersistentStore:
+    """SQLite (WAL) store for journey and geocode results that survives restarts.
+
+    Lookups are single primary-key reads on a local file, so they are cheap
+    enough to run inline. Hit counts used to pick the hottest entries for
+    warm-loading are buffered in memory and flushed in batches.
+    """
+
+    def __init__(self, path: str, hit_flush_threshold: int = 500):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._hit_flush_threshold = hit_flush_threshold
+        self._pending_hits: Dict[Tuple[str, str], int] = {}
+
+    # Journeys
+
+    def get_journey(self, key: str) -> Optional[Tuple[JourneyTime, float]]:
+        """Return (journey, expires_at) for a live entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM journeys WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        self.record_hit("journeys", key)
+        return decode_journey(row[0]), row[1]
+
+    def put_journey(self, key: str, journey: JourneyTime, ttl_seconds: float):
+        self.put_journeys([(key, journey, None)], ttl_seconds)
+
+    def put_journeys(
+        self,
+        rows: Sequence[Tuple[str, JourneyTime, Optional[Sequence[Optional[str]]]]],
+        ttl_seconds: float
+    ):
+        """Write (key, journey, line_strings) rows in one transaction; see encode_journey"""
+        expires_at = time.time() + ttl_seconds
+        payloads = [
+            (key, encode_journey(journey, line_strings), expires_at)
+            for key, journey, line_strings in rows
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO journeys (key, payload, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET payload = excluded.payload, "
+                "expires_at = excluded.expires_at",
+                payloads
+            )
+            self._conn.execute("COMMIT")
+
+    def hottest_journeys(self, limit: int) -> List[Tuple[str, JourneyTime, float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload, expires_at FROM journeys WHERE expires_at > ? "
+                "ORDER BY hits DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [(key, decode_journey(payload), expires_at) for key, payload, expires_at in rows]
+
+    # Geocodes (latitude/longitude of NULL records a failed lookup)
+
+    def get_geocode(self, query: str) -> Optional[Tuple[Optional[Tuple[float, float]], float]]:
+        """Return (coords or None, expires_at) for a live entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latitude, longitude, expires_at FROM geocodes "
+                "WHERE query = ? AND expires_at > ?",
+                (query, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        self.record_hit("geocodes", query)
+        coords = (row[0], row[1]) if row[0] is not None else None
+        return coords, row[2]
+
+    def put_geocode(self, query: str, coords: Optional[Tuple[float, float]], ttl_seconds: float):
+        lat, lon = coords if coords else (None, None)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO geocodes (query, latitude, longitude, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(query) DO UPDATE SET latitude = excluded.latitude, "
+                "longitude = excluded.longitude, expires_at = excluded.expires_at",
+                (query, lat, lon, time.time() + ttl_seconds)
+            )
+
+    def hottest_geocodes(
+        self,
+        limit: int
+    ) -> List[Tuple[str, Optional[Tuple[float, float]], float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, latitude, longitude, expires_at FROM geocodes "
+                "WHERE expires_at > ? ORDER BY hits DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [
+            (query, (lat, lon) if lat is not None else None, expires_at)
+            for query, lat, lon, expires_at in rows
+        ]
+
+    # Journey observations (live TfL durations the journey estimator learns from)
+
+    def add_journey_observations(
+        self,
+        rows: Sequence[Tuple[float, float, float, float, int]],
+        keep: Optional[int] = None
+    ):
+        """Append (from_lat, from_lon, to_lat, to_lon, minutes) rows, keeping the newest ``keep``"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO journey_observations "
+                "(from_lat, from_lon, to_lat, to_lon, minutes, observed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*row, now) for row in rows]
+            )
+            if keep is not None:
+                self._conn.execute(
+                    "DELETE FROM journey_observations "
+                    "WHERE id <= (SELECT MAX(id) FROM journey_observations) - ?",
+                    (keep,)
+                )
+            self._conn.execute("COMMIT")
+
+    def recent_journey_observations(
+        self,
+        limit: int
+    ) -> List[Tuple[float, float, float, float, int]]:
+        """The newest observations, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT from_lat, from_lon, to_lat, to_lon, minutes FROM journey_observations "
+                "ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return rows[::-1]
+
+    # Maintenance
+
+    def record_hit(self, table: str, key: str):
+        """Buffer a hit against an entry; flushed to disk in batches"""
+        pending_key = (table, key)
+        self._pending_hits[pending_key] = self._pending_hits.get(pending_key, 0) + 1
+        if len(self._pending_hits) >= self._hit_flush_threshold:
+            self.flush_hits()
+
+    def flush_hits(self):
+        pending, self._pending_hits = self._pending_hits, {}
+        if not pending:
+            return
+        key_columns = {"journeys": "key", "geocodes": "query"}
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for (table, key), hits in pending.items():
+                self._conn.execute(
+                    f"UPDATE {table} SET hits = hits + ? WHERE {key_columns[table]} = ?",
+                    (hits, key)
+                )
+            self._conn.execute("COMMIT")
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM journeys WHERE expires_at <= ?", (now,)
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM geocodes WHERE expires_at <= ?", (now,)
+            ).rowcount
+        return removed
+
+    def close(self):
+        self.flush_hits()
+        with self._lock:
+            self._conn.close()
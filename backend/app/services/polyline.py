@@ -0,0 +1,150 @@
+from typing import List, Sequence, Tuple
+from itertools import chain
+import math
+import numpy as np
+
+from app.schemas import JourneyLeg, MeetingPointResponse, MeetingStation
+
+METRES_PER_DEGREE = 111320.0
+
+# Coordinates are encoded to 1e-5 degrees (about a metre), as Google's format
+POLYLINE_PRECISION = 5
+# Enough 5-bit chunks for any delta within the encodable range
+_CHUNKS = 7
+# Paths shorter than this are encoded point by point: numpy's per-call
+# overhead outweighs its speed until a path has a few dozen points
+VECTORIZE_MIN_POINTS = 64
+
+
+def _as_array(points: Sequence[Sequence[float]]) -> np.ndarray:
+    if not isinstance(points, np.ndarray):
+        try:
+            # Much quicker than np.asarray for a decoded list of [lat, lon] pairs
+            flat = np.fromiter(chain.from_iterable(points), dtype=np.float64, count=2 * len(points))
+            return flat.reshape(-1, 2)
+        except (ValueError, TypeError):
+            pass
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def simplify(points: Sequence[Sequence[float]], tolerance_metres: float) -> np.ndarray:
+    """Douglas-Peucker simplification of a [lat, lon] path.
+
+    Keeps the endpoints and every vertex needed to stay within
+    ``tolerance_metres`` of the original path, so corners survive while
+    straight runs collapse to their ends. Each split measures all vertices
+    of a span in one vectorized pass.
+    """
+    coords = _as_array(points)
+    n = len(coords)
+    if n < 3:
+        return coords
+
+    # Local equirectangular projection to metres (adequate at city scale), as
+    # complex x + iy so projections onto a chord are one complex product
+    cos_lat = math.cos(math.radians(float(coords[:, 0].mean())))
+    xy = (coords[:, 1] * cos_lat + 1j * coords[:, 0]) * METRES_PER_DEGREE
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    spans = [(0, n - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        offsets = xy[first + 1:last] - xy[first]
+        chord = xy[last] - xy[first]
+        length_sq = chord.real * chord.real + chord.imag * chord.imag
+        if length_sq > 0:
+            # Distance to the chord segment: project onto the chord, clamped to
+            # its ends, so runs doubling back past an end are measured from it
+            along = np.clip((offsets * chord.conjugate()).real / length_sq, 0.0, 1.0)
+            distances = np.abs(offsets - along * chord)
+        else:
+            distances = np.abs(offsets)
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance_metres:
+            split = first + 1 + farthest
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    return coords[keep]
+
+
+def encode(points: Sequence[Tuple[float, float]], precision: int = POLYLINE_PRECISION) -> str:
+    """Encode (lat, lon) points in the Encoded Polyline Algorithm Format"""
+    if len(points) == 0:
+        return ""
+    if len(points) < VECTORIZE_MIN_POINTS:
+        return _encode_short(points, precision)
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    scaled = np.rint(coords * 10 ** precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=0).ravel()
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    # Split each value into 5-bit chunks, least significant first; every
+    # chunk but a value's last carries the 0x20 continuation bit
+    shifted = values[:, np.newaxis] >> (5 * np.arange(_CHUNKS))
+    lengths = np.maximum((shifted > 0).sum(axis=1), 1)
+    position = np.arange(_CHUNKS)
+    chunks = (shifted & 0x1F) | np.where(position < lengths[:, np.newaxis] - 1, 0x20, 0)
+    encoded = chunks[position < lengths[:, np.newaxis]] + 63
+    return encoded.astype(np.uint8).tobytes().decode("ascii")
+
+
+def _encode_short(points: Sequence[Tuple[float, float]], precision: int) -> str:
+    scale = 10 ** precision
+    chars = []
+    previous_lat = previous_lon = 0
+    for lat, lon in points:
+        scaled_lat, scaled_lon = round(lat * scale), round(lon * scale)
+        for delta in (scaled_lat - previous_lat, scaled_lon - previous_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chars.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chars.append(chr(value + 63))
+        previous_lat, previous_lon = scaled_lat, scaled_lon
+    return "".join(chars)
+
+
+def decode(encoded: str, precision: int = POLYLINE_PRECISION) -> List[Tuple[float, float]]:
+    """Inverse of encode"""
+    values = []
+    value = shift = 0
+    for char in encoded.encode("ascii"):
+        chunk = char - 63
+        value |= (chunk & 0x1F) << shift
+        shift += 5
+        if not chunk & 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+
+    scale = 10 ** precision
+    coords = np.cumsum(np.array(values, dtype=np.int64).reshape(-1, 2), axis=0) / scale
+    return [(float(lat), float(lon)) for lat, lon in coords]
+
+
+def _encoded_leg(leg: JourneyLeg) -> JourneyLeg:
+    return leg.model_copy(update={
+        "intermediate_stops": [],
+        "encoded_path": encode(leg.intermediate_stops)
+    })
+
+
+def _encoded_station(station: MeetingStation) -> MeetingStation:
+    journeys = [
+        journey.model_copy(update={"legs": [_encoded_leg(leg) for leg in journey.legs]})
+        for journey in station.journey_times
+    ]
+    return station.model_copy(update={"journey_times": journeys})
+
+
+def encode_paths(response: MeetingPointResponse) -> MeetingPointResponse:
+    """Copy of a response with leg paths as encoded polylines instead of coordinates"""
+    return response.model_copy(update={
+        "optimal_station": _encoded_station(response.optimal_station),
+        "alternative_stations": [
+            _encoded_station(station) for station in response.alternative_stations
+        ]
+    })
@@ -0,0 +1,41 @@
+from typing import Dict, Optional, Sequence
+
+from app.schemas import JourneyLeg, MeetingPointResponse
+
+# Journey fields dropped by detail="summary": each journey keeps who, where and how long
+SUMMARY_EXCLUDED_JOURNEY_FIELDS = {"legs", "departure_time", "arrival_time"}
+
+
+def response_exclusions(
+    detail: str = "full",
+    leg_fields: Optional[Sequence[str]] = None
+) -> Optional[Dict]:
+    """Pydantic ``exclude`` spec for a MeetingPointResponse, or None for everything.
+
+    ``detail="summary"`` drops each journey's legs and timestamps;
+    ``leg_fields`` otherwise keeps only the named JourneyLeg fields.
+    """
+    if detail == "summary":
+        journey_exclude = set(SUMMARY_EXCLUDED_JOURNEY_FIELDS)
+    elif leg_fields is not None:
+        dropped = set(JourneyLeg.model_fields) - set(leg_fields)
+        if not dropped:
+            return None
+        journey_exclude = {"legs": {"__all__": dropped}}
+    else:
+        return None
+
+    station_exclude = {"journey_times": {"__all__": journey_exclude}}
+    return {
+        "optimal_station": station_exclude,
+        "alternative_stations": {"__all__": station_exclude}
+    }
+
+
+def serialize_response(
+    response: MeetingPointResponse,
+    detail: str = "full",
+    leg_fields: Optional[Sequence[str]] = None
+) -> bytes:
+    """Shaped JSON for a response, serialized straight from the model by pydantic-core"""
+    return response.model_dump_json(exclude=response_exclusions(detail, leg_fields)).encode()
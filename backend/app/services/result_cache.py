@@ -0,0 +1,83 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import math
+import time
+
+from app.schemas import LocationInput, MeetingPointResponse
+from app.core.config import settings
+from app.services.cache import TTLCache
+from app.services.geocoding_service import normalize_address
+
+METRES_PER_DEGREE_LAT = 111320.0
+
+# (name, place): place is ("@", lat cell, lon cell) for coordinates, else ("a", normalized address)
+Participant = Tuple[str, tuple]
+
+
+class ResultCache:
+    """Whole meeting-point responses, keyed by a canonical form of the request.
+
+    Participants are compared as a multiset of (name, place) pairs, with
+    coordinates snapped to the journey cache grid and addresses normalized,
+    so a reordered request or a pin nudged within the grid still hits. The
+    key also carries the calculation options and the departure time bucket.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        grid_metres: Optional[float] = None,
+        time_bucket_minutes: Optional[int] = None,
+        clock=time.time
+    ):
+        self._cache = TTLCache(
+            ttl_seconds=settings.result_cache_ttl_seconds if ttl_seconds is None else ttl_seconds,
+            max_entries=settings.result_cache_max_entries if max_entries is None else max_entries
+        )
+        if grid_metres is None:
+            grid_metres = settings.journey_cache_grid_metres
+        if time_bucket_minutes is None:
+            time_bucket_minutes = settings.journey_cache_time_bucket_minutes
+        self.grid_metres = grid_metres
+        bucket_minutes = time_bucket_minutes
+        self.time_bucket_seconds = bucket_minutes * 60
+        self._clock = clock
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.max_entries > 0 and self._cache.ttl_seconds > 0
+
+    def participant(self, location: LocationInput) -> Participant:
+        # Same precedence as MeetingCalculator.process_locations: coordinates, then address
+        if location.latitude and location.longitude:
+            lat_step = self.grid_metres / METRES_PER_DEGREE_LAT
+            lat_cell = round(location.latitude / lat_step)
+            lon_step = lat_step / math.cos(math.radians(lat_cell * lat_step))
+            return (location.name, ("@", lat_cell, round(location.longitude / lon_step)))
+        return (location.name, ("a", normalize_address(location.address or "")))
+
+    def participants(self, locations: List[LocationInput]) -> List[Participant]:
+        return [self.participant(location) for location in locations]
+
+    def key(self, participants: List[Participant], *options: Hashable) -> Hashable:
+        return (
+            tuple(sorted(participants)),
+            options,
+            int(self._clock() // self.time_bucket_seconds)
+        )
+
+    def get(self, key: Hashable) -> Optional[Tuple[List[Participant], MeetingPointResponse]]:
+        """The cached response and the participants, in the order it was calculated for"""
+        if not self.enabled:
+            return None
+        return self._cache.get(key)
+
+    def put(self, key: Hashable, participants: List[Participant], response: MeetingPointResponse):
+        if self.enabled:
+            self._cache.set(key, (participants, response))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
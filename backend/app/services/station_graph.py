@@ -0,0 +1,114 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import heapq
+import json
+import numpy as np
+
+from app.core.constants import LINES_FILE, STATION_CATALOGUE
+from app.services.candidate_scorer import ellipsoidal_distance_km
+
+# Modelled running speed between stops and time lost per stop, by mode
+MODE_SPEED_KMH = {"tube": 45.0, "dlr": 40.0, "overground": 50.0, "elizabeth-line": 80.0}
+MODE_STOP_MINUTES = {"tube": 0.6, "dlr": 0.6, "overground": 0.8, "elizabeth-line": 1.0}
+
+# Average wait plus platform access, paid on every boarding (so also per interchange)
+BOARDING_MINUTES = 4.0
+
+WALKING_SPEED_KMH = 4.8
+# Street routes are longer than the straight line between two points
+WALKING_DETOUR_FACTOR = 1.25
+# Stations this close are linked by an out-of-station walking transfer
+WALK_TRANSFER_MAX_KM = 0.4
+
+
+def walking_minutes(distance_km):
+    """Walking time for a straight-line distance (scalar or array)"""
+    return distance_km * WALKING_DETOUR_FACTOR / WALKING_SPEED_KMH * 60
+
+
+class StationGraph:
+    """Station network built from the bundled line sequences.
+
+    Journeys are routed over one node per station ("hub") plus one node per
+    (station, line) platform. Riding moves between platforms of the same
+    line, boarding costs BOARDING_MINUTES from hub to platform, alighting is
+    free, and nearby hubs are joined by walking links.
+    """
+
+    def __init__(self, stations: Sequence[Dict], lines: Sequence[Dict]):
+        self.names: List[str] = [station["name"] for station in stations]
+        self.coords = np.array(
+            [(station["latitude"], station["longitude"]) for station in stations],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+
+        # Station-level adjacency: neighbour id -> fastest ride minutes
+        self.neighbors: List[Dict[int, float]] = [{} for _ in range(n)]
+        self.station_lines: List[List[str]] = [[] for _ in range(n)]
+        self._edges: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        platforms: Dict[Tuple[int, str], int] = {}
+
+        def platform(station_id: int, line: str) -> int:
+            node = platforms.get((station_id, line))
+            if node is None:
+                node = len(self._edges)
+                platforms[(station_id, line)] = node
+                self._edges.append([(station_id, 0.0)])
+                self._edges[station_id].append((node, BOARDING_MINUTES))
+                self.station_lines[station_id].append(line)
+            return node
+
+        for line in lines:
+            speed = MODE_SPEED_KMH[line["mode"]]
+            stop_minutes = MODE_STOP_MINUTES[line["mode"]]
+            for sequence in line["sequences"]:
+                ids = [self._ids[name] for name in sequence]
+                for a, b in zip(ids, ids[1:]):
+                    km = float(ellipsoidal_distance_km(*self.coords[a], *self.coords[b]))
+                    minutes = km / speed * 60 + stop_minutes
+                    pa, pb = platform(a, line["name"]), platform(b, line["name"])
+                    self._edges[pa].append((pb, minutes))
+                    self._edges[pb].append((pa, minutes))
+                    for x, y in ((a, b), (b, a)):
+                        if minutes < self.neighbors[x].get(y, float("inf")):
+                            self.neighbors[x][y] = minutes
+
+        distances = ellipsoidal_distance_km(
+            self.coords[:, 0:1], self.coords[:, 1:2],
+            self.coords[np.newaxis, :, 0], self.coords[np.newaxis, :, 1]
+        )
+        for a, b in zip(*np.nonzero((distances <= WALK_TRANSFER_MAX_KM) & (distances > 0))):
+            self._edges[a].append((int(b), float(walking_minutes(distances[a, b]))))
+
+    @classmethod
+    def from_bundled_data(cls) -> "StationGraph":
+        with open(LINES_FILE, encoding="utf-8") as f:
+            lines = json.load(f)["lines"]
+        return cls(STATION_CATALOGUE, lines)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def station_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def travel_minutes_from(self, source: int) -> np.ndarray:
+        """Modelled minutes from one station to every station (Dijkstra)"""
+        best = np.full(len(self._edges), np.inf)
+        best[source] = 0.0
+        queue = [(0.0, source)]
+        while queue:
+            minutes, node = heapq.heappop(queue)
+            if minutes > best[node]:
+                continue
+            for target, cost in self._edges[node]:
+                candidate = minutes + cost
+                if candidate < best[target]:
+                    best[target] = candidate
+                    heapq.heappush(queue, (candidate, target))
+        return best[:len(self.names)]
+
+    def all_pairs_minutes(self) -> np.ndarray:
+        """(stations, stations) matrix of modelled travel minutes"""
+        return np.vstack([self.travel_minutes_from(i) for i in range(len(self.names))])
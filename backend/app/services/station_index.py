@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional, Tuple
+import math
+import numpy as np
+
+from app.services.candidate_scorer import ellipsoidal_distance_km
+
+KM_PER_DEGREE_LAT = 111.32
+
+
+class StationIndex:
+    """Uniform grid index over station coordinates.
+
+    Stations are bucketed into square cells of roughly ``cell_size_km`` and
+    stored sorted by cell key, so a rectangular cell range is a handful of
+    binary searches rather than a scan of the whole catalogue.
+    """
+
+    def __init__(self, stations: Dict[str, Tuple[float, float]], cell_size_km: float = 1.0):
+        self.names: List[str] = list(stations.keys())
+        self.coords = np.array(list(stations.values()), dtype=np.float64).reshape(-1, 2)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+
+        self.cell_size_km = cell_size_km
+        self._lat0 = float(self.coords[:, 0].min())
+        self._lon0 = float(self.coords[:, 1].min())
+        mean_lat = float(self.coords[:, 0].mean())
+        self._cell_lat = cell_size_km / KM_PER_DEGREE_LAT
+        self._cell_lon = cell_size_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(mean_lat)))
+
+        rows = np.floor((self.coords[:, 0] - self._lat0) / self._cell_lat).astype(np.int64)
+        cols = np.floor((self.coords[:, 1] - self._lon0) / self._cell_lon).astype(np.int64)
+        self._n_rows = int(rows.max()) + 1
+        self._n_cols = int(cols.max()) + 1
+        keys = rows * self._n_cols + cols
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def station_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (
+            math.floor((lat - self._lat0) / self._cell_lat),
+            math.floor((lon - self._lon0) / self._cell_lon)
+        )
+
+    def _cell_range(self, row_lo: int, col_lo: int, row_hi: int, col_hi: int) -> np.ndarray:
+        """Ids of all stations in the inclusive rectangle of cells."""
+        row_lo, col_lo = max(row_lo, 0), max(col_lo, 0)
+        row_hi, col_hi = min(row_hi, self._n_rows - 1), min(col_hi, self._n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+
+        row_keys = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self._n_cols
+        starts = np.searchsorted(self._sorted_keys, row_keys + col_lo, side="left")
+        ends = np.searchsorted(self._sorted_keys, row_keys + col_hi, side="right")
+        spans = [self._order[s:e] for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(spans)
+
+    def _around(self, lat: float, lon: float, radius_cells: int) -> np.ndarray:
+        row, col = self._cell_of(lat, lon)
+        return self._cell_range(
+            row - radius_cells, col - radius_cells,
+            row + radius_cells, col + radius_cells
+        )
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 1,
+        max_distance_km: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """Return up to k (station_id, distance_km) pairs ordered by distance."""
+        k = min(k, len(self.names))
+        if k <= 0:
+            return []
+
+        # Anything outside a square of r cells around the query is at least
+        # r cells away, so grow the square until the k-th hit is inside it
+        row, col = self._cell_of(lat, lon)
+        max_radius = max(
+            abs(row), abs(self._n_rows - 1 - row), abs(col), abs(self._n_cols - 1 - col), 1
+        )
+        radius = 1
+        while True:
+            ids = self._around(lat, lon, radius)
+            reach_km = radius * self.cell_size_km
+            if len(ids) >= k:
+                distances = self._distances(lat, lon, ids)
+                if np.partition(distances, k - 1)[k - 1] <= reach_km:
+                    break
+            beyond_limit = max_distance_km is not None and reach_km >= max_distance_km
+            if radius >= max_radius or beyond_limit:
+                distances = self._distances(lat, lon, ids)
+                break
+            radius *= 2
+
+        if max_distance_km is not None:
+            mask = distances <= max_distance_km
+            ids, distances = ids[mask], distances[mask]
+        order = np.argsort(distances, kind="stable")[:k]
+        return [(int(ids[i]), float(distances[i])) for i in order]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Return ids of stations within radius_km of the given point."""
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        d_lon = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+        row_lo, col_lo = self._cell_of(lat - d_lat, lon - d_lon)
+        row_hi, col_hi = self._cell_of(lat + d_lat, lon + d_lon)
+        ids = self._cell_range(row_lo, col_lo, row_hi, col_hi)
+        return np.sort(ids[self._distances(lat, lon, ids) <= radius_km])
+
+    def _distances(self, lat: float, lon: float, ids: np.ndarray) -> np.ndarray:
+        return ellipsoidal_distance_km(lat, lon, self.coords[ids, 0], self.coords[ids, 1])
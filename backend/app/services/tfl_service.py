@@ -1,19 +1,341 @@
 import httpx
 from typing import Tuple, Optional, Dict, List, Any
+from datetime import datetime, timedelta
 from geopy.distance import geodesic
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import math
+import time
 from app.schemas import JourneyLeg, JourneyTime
+from app.core.config import settings
+from app.core.metrics import ESTIMATE_FALLBACKS, STAGE_SECONDS, UPSTREAM_SECONDS
+from app.services.cache import TTLCache
+from app.services.hedging import LatencyTracker
+from app.services.journey_parser import first_journey, parse_journey
+from app.services.journey_estimator import JourneyEstimator
+from app.services.persistent_store import PersistentStore
+from app.services.single_flight import SingleFlight
+from app.services.rate_limiter import (
+    UpstreamScheduler,
+    PRIORITY_INTERACTIVE,
+    parse_retry_after
+)
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:
+    h2 = None
 
 logger = logging.getLogger(__name__)
 
+JOURNEY_MODES = 'tube,bus,dlr,overground,elizabeth-line,tram,walking'
+METRES_PER_DEGREE_LAT = 111320.0
+
+_PARSE_SECONDS = STAGE_SECONDS.labels("parse")
+_CANCELLED_SECONDS = UPSTREAM_SECONDS.labels("cancelled")
+_ERROR_SECONDS = UPSTREAM_SECONDS.labels("error")
+
+
+def _usable(response: httpx.Response) -> bool:
+    return response.status_code < 500 and response.status_code != 429
+
+
+def on_current_day(journey: JourneyTime) -> JourneyTime:
+    """A cached journey with its times moved by whole days to the occurrence nearest now.
+    
+    Cache keys only carry the weekday/weekend and time of day, so a journey
+    fetched on an earlier date answers today's request at today's times.
+    """
+    departure = journey.departure_time
+    if departure is None:
+        return journey
+    days = round((datetime.now(departure.tzinfo) - departure).total_seconds() / 86400)
+    if not days:
+        return journey
+    shift = timedelta(days=days)
+    return journey.model_copy(update={
+        'departure_time': departure + shift,
+        'arrival_time': journey.arrival_time + shift if journey.arrival_time else None
+    })
+
+
+def journey_size(journey: JourneyTime) -> int:
+    """Approximate cached size in bytes, counting still-encoded path geometry"""
+    pending = sum(len(leg._line_string or "") for leg in journey.legs)
+    return len(journey.model_dump_json()) + pending
+
 
 class TfLService:
-    def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None):
+    def __init__(
+        self,
+        app_id: Optional[str] = None,
+        app_key: Optional[str] = None,
+        cache: Optional[TTLCache] = None,
+        store: Optional[PersistentStore] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+        estimator: Optional[JourneyEstimator] = None
+    ):
         self.app_id = app_id
         self.app_key = app_key
-        self.client = httpx.AsyncClient(timeout=30.0)
-        self._cache = {}  # Simple in-memory cache
+        self.http2 = settings.tfl_http2 and h2 is not None
+        if settings.tfl_http2 and h2 is None:
+            logger.info("h2 is not installed, TfL requests use HTTP/1.1")
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            timeout=httpx.Timeout(
+                settings.tfl_read_timeout_seconds,
+                connect=settings.tfl_connect_timeout_seconds
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.tfl_max_connections,
+                max_keepalive_connections=settings.tfl_max_keepalive_connections,
+                keepalive_expiry=settings.tfl_keepalive_expiry_seconds
+            )
+        )
+        self.base_url = settings.tfl_api_base_url.rstrip('/')
+        self._cache = cache or TTLCache(
+            ttl_seconds=settings.journey_cache_ttl_seconds,
+            max_entries=settings.journey_cache_max_entries,
+            max_bytes=settings.journey_cache_max_bytes,
+            sizeof=journey_size
+        )
+        self.cache_grid_metres = settings.journey_cache_grid_metres
+        self.cache_time_bucket_seconds = settings.journey_cache_time_bucket_minutes * 60
+        self.store = store
+        self.store_ttl_seconds = settings.persistent_store_journey_ttl_seconds
+        # Journeys waiting to be persisted, written in batches on a worker thread
+        self._unsaved: List[Tuple[str, JourneyTime, List[Optional[str]]]] = []
+        self._saving: Optional[asyncio.Future] = None
+        self._in_flight = SingleFlight()
+        self.scheduler = scheduler or UpstreamScheduler(
+            max_concurrency=settings.tfl_max_concurrency,
+            rate_per_second=settings.tfl_rate_limit_per_minute / 60,
+            burst=settings.tfl_rate_limit_burst
+        )
+        self.max_retries = settings.tfl_max_retries
+        self.retry_backoff_seconds = settings.tfl_retry_backoff_seconds
+        self.max_retry_after_seconds = settings.tfl_max_retry_after_seconds
+        # Recent latencies set when a slow call is duplicated
+        self.hedge_requests = settings.tfl_hedge_requests
+        self.latency = LatencyTracker(
+            quantile=settings.tfl_hedge_quantile,
+            min_samples=settings.tfl_hedge_min_samples,
+            min_delay=settings.tfl_hedge_min_delay_seconds,
+            max_fraction=settings.tfl_hedge_max_fraction
+        )
+        # Learns from every live journey; answers fallbacks and candidate pre-scoring
+        self.estimator = estimator or JourneyEstimator(
+            store=store,
+            min_samples=settings.estimator_min_samples,
+            refit_every=settings.estimator_refit_every,
+            max_samples=settings.estimator_max_samples,
+            cell_km=settings.estimator_cell_km
+        )
+        self._learning: Optional[asyncio.Future] = None
+    
+    def _cache_key(
+        self,
+        from_lat: float,
+        from_lon: float,
+        to_lat: float,
+        to_lon: float,
+        modes: str = JOURNEY_MODES,
+        departure: Optional[float] = None
+    ) -> str:
+        """Quantize a journey request onto the cache grid and time bucket.
+        
+        The time bucket is a slot of the (UTC) day, split by weekday/weekend,
+        so persisted journeys remain addressable after a restart.
+        """
+        lat_step = self.cache_grid_metres / METRES_PER_DEGREE_LAT
+        lon_step = lat_step / math.cos(math.radians((from_lat + to_lat) / 2))
+        departure_time = time.gmtime(time.time() if departure is None else departure)
+        day_kind = "we" if departure_time.tm_wday >= 5 else "wd"
+        seconds_of_day = (
+            departure_time.tm_hour * 3600 + departure_time.tm_min * 60 + departure_time.tm_sec
+        )
+        return "|".join((
+            f"{round(from_lat / lat_step)},{round(from_lon / lon_step)}",
+            f"{round(to_lat / lat_step)},{round(to_lon / lon_step)}",
+            ",".join(sorted(modes.split(','))),
+            f"{day_kind}{seconds_of_day // self.cache_time_bucket_seconds}"
+        ))
+    
+    def _cached_journey(self, cache_key: str) -> Optional[JourneyTime]:
+        """Look up a journey in memory, then in the persistent store"""
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            if self.store:
+                self.store.record_hit("journeys", cache_key)
+            return on_current_day(cached)
+        
+        if self.store:
+            stored = self.store.get_journey(cache_key)
+            if stored is not None:
+                journey, expires_at = stored
+                self._cache.set(
+                    cache_key,
+                    journey,
+                    min(self._cache.ttl_seconds, expires_at - time.time())
+                )
+                return on_current_day(journey)
+        return None
+    
+    def _store_journey(self, cache_key: str, journey: JourneyTime):
+        self._cache.set(cache_key, journey)
+        if self.store:
+            # Taken now: resolving the paths later clears them on the shared journey
+            line_strings = [leg._line_string for leg in journey.legs]
+            self._unsaved.append((cache_key, journey, line_strings))
+            if self._saving is None or self._saving.done():
+                self._saving = asyncio.ensure_future(self._save_journeys())
+    
+    async def _save_journeys(self):
+        """Persist queued journeys off the event loop, a batch per SQLite transaction"""
+        loop = asyncio.get_running_loop()
+        while self._unsaved:
+            batch, self._unsaved = self._unsaved, []
+            try:
+                await loop.run_in_executor(
+                    None, self.store.put_journeys, batch, self.store_ttl_seconds
+                )
+            except Exception as e:
+                logger.error(f"Error persisting {len(batch)} TfL journeys: {str(e)}")
+    
+    def _observe(
+        self,
+        from_lat: float,
+        from_lon: float,
+        to_lat: float,
+        to_lon: float,
+        minutes: int
+    ):
+        """Record a live journey; the estimator learns from full batches in the background"""
+        self.estimator.observe(from_lat, from_lon, to_lat, to_lon, minutes)
+        if self.estimator.ready and (self._learning is None or self._learning.done()):
+            self._learning = asyncio.ensure_future(self._learn())
+    
+    async def _learn(self):
+        while self.estimator.ready:
+            try:
+                await self.estimator.learn()
+            except Exception as e:
+                logger.error(f"Error updating the journey estimator: {str(e)}")
+                return
+    
+    def warm_cache(self, limit: int) -> int:
+        """Bulk-load the most frequently used persisted journeys into memory"""
+        if not self.store:
+            return 0
+        loaded = 0
+        now = time.time()
+        for cache_key, journey, expires_at in self.store.hottest_journeys(limit):
+            self._cache.set(cache_key, journey, min(self._cache.ttl_seconds, expires_at - now))
+            loaded += 1
+        return loaded
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+    
+    def coalescing_stats(self) -> Dict[str, Any]:
+        return self._in_flight.stats()
+    
+    async def _get(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> httpx.Response:
+        """GET through the shared scheduler, backing off and retrying on 429/503"""
+        attempt = 0
+        while True:
+            response = await self._hedged_send(url, params, priority)
+            
+            if response.status_code not in (429, 503) or attempt >= self.max_retries:
+                return response
+            
+            delay = min(
+                parse_retry_after(
+                    response.headers.get('Retry-After'),
+                    self.retry_backoff_seconds * 2 ** attempt
+                ),
+                self.max_retry_after_seconds
+            )
+            logger.warning(f"TfL API returned {response.status_code}, backing off {delay:.1f}s")
+            self.scheduler.backoff(delay)
+            attempt += 1
+    
+    async def _send(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        priority: int,
+        started: Optional[asyncio.Event] = None
+    ) -> httpx.Response:
+        """One GET in a scheduler slot, timed by outcome from when the slot is granted.
+        
+        ``started`` is set once the slot is granted and the request goes out.
+        """
+        async with self.scheduler.slot(priority):
+            if started is not None:
+                started.set()
+            start = time.perf_counter()
+            try:
+                response = await self.client.get(url, params=params)
+            except asyncio.CancelledError:
+                _CANCELLED_SECONDS.observe(time.perf_counter() - start)
+                raise
+            except Exception:
+                _ERROR_SECONDS.observe(time.perf_counter() - start)
+                raise
+            elapsed = time.perf_counter() - start
+        UPSTREAM_SECONDS.labels(str(response.status_code)).observe(elapsed)
+        if response.status_code == 200:
+            self.latency.observe(elapsed)
+        return response
+    
+    async def _hedged_send(self, url: str, params: Dict[str, Any], priority: int) -> httpx.Response:
+        """Send, and duplicate the call if it is still unanswered at the hedge threshold.
+        
+        The first usable response wins and the other call is cancelled; a
+        429, 5xx or transport error only wins if both calls fail. The hedge
+        waits behind first attempts of the same priority for a scheduler slot.
+        
+        The threshold is a TfL latency, so it is counted from when the call
+        gets its slot: a call still queued behind our own traffic is not slow
+        upstream, and hedging it would only queue a second copy.
+        """
+        delay = self.latency.hedge_delay() if self.hedge_requests else None
+        if delay is None:
+            return await self._send(url, params, priority)
+        
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(self._send(url, params, priority, started))
+        waiting = asyncio.ensure_future(started.wait())
+        tasks = [primary]
+        try:
+            await asyncio.wait([primary, waiting], return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.latency.try_hedge():
+                return await primary
+            tasks.append(asyncio.ensure_future(self._send(url, params, priority + 1)))
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None and _usable(task.result()):
+                        if task is not primary:
+                            self.latency.hedge_wins += 1
+                        return task.result()
+            for task in tasks:
+                if task.exception() is None:
+                    return task.result()
+            return primary.result()
+        finally:
+            waiting.cancel()
+            for task in tasks:
+                task.cancel()
     
     async def get_journey_details(
         self, 
@@ -22,178 +344,92 @@ class TfLService:
         to_lat: float, 
         to_lon: float,
         from_name: str = "",
-        to_name: str = ""
+        to_name: str = "",
+        priority: int = PRIORITY_INTERACTIVE
     ) -> JourneyTime:
         """Get detailed journey information from TfL API with legs"""
         # Check cache first
-        cache_key = f"{from_lat:.4f},{from_lon:.4f}-{to_lat:.4f},{to_lon:.4f}"
+        cache_key = self._cache_key(from_lat, from_lon, to_lat, to_lon)
+        journey = self._cached_journey(cache_key)
+        if journey is None:
+            # Identical concurrent requests share a single upstream call
+            journey = await self._in_flight.do(
+                cache_key,
+                lambda: self._fetch_journey_details(
+                    cache_key, from_lat, from_lon, to_lat, to_lon, from_name, to_name, priority
+                )
+            )
+        return journey.model_copy(update={'from_location': from_name, 'to_station': to_name})
+    
+    def _journey_request(
+        self,
+        from_lat: float,
+        from_lon: float,
+        to_lat: float,
+        to_lon: float
+    ) -> Tuple[str, Dict[str, Any]]:
+        # TfL API expects coordinates in the URL path, not as query params
+        url = f"{self.base_url}/Journey/JourneyResults/{from_lat},{from_lon}/to/{to_lat},{to_lon}"
+        
+        params = {
+            'mode': JOURNEY_MODES,
+            'journeyPreference': 'LeastTime',
+            'accessibilityPreference': 'NoRequirements',
+            'walkingSpeed': 'Average',
+            'cyclePreference': 'None',
+            'bikeProficiency': 'Easy'
+        }
         
+        if self.app_id and self.app_key:
+            params['app_id'] = self.app_id
+            params['app_key'] = self.app_key
+        return url, params
+    
+    async def _fetch_journey_details(
+        self,
+        cache_key: str,
+        from_lat: float,
+        from_lon: float,
+        to_lat: float,
+        to_lon: float,
+        from_name: str,
+        to_name: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> JourneyTime:
         try:
-            # TfL API expects coordinates in the URL path, not as query params
-            url = f"https://api.tfl.gov.uk/Journey/JourneyResults/{from_lat},{from_lon}/to/{to_lat},{to_lon}"
-            
-            params = {
-                'mode': 'tube,bus,dlr,overground,elizabeth-line,tram,walking',
-                'journeyPreference': 'LeastTime',
-                'accessibilityPreference': 'NoRequirements',
-                'walkingSpeed': 'Average',
-                'cyclePreference': 'None',
-                'bikeProficiency': 'Easy'
-            }
-            
-            if self.app_id and self.app_key:
-                params['app_id'] = self.app_id
-                params['app_key'] = self.app_key
-            
-            response = await self.client.get(url, params=params)
+            url, params = self._journey_request(from_lat, from_lon, to_lat, to_lon)
+            response = await self._get(url, params, priority)
             
             if response.status_code == 200:
-                data = response.json()
-                if data.get('journeys') and len(data['journeys']) > 0:
-                    journey = data['journeys'][0]  # Get the best journey
-                    
-                    # Parse journey legs
-                    legs = []
-                    total_walking_duration = 0
-                    total_transfers = 0
-                    
-                    for leg in journey.get('legs', []):
-                        mode = leg.get('mode', {}).get('name', 'unknown')
-                        duration = leg.get('duration', 0)
-                        
-                        if mode.lower() == 'walking':
-                            total_walking_duration += duration
-                        elif mode.lower() in ['tube', 'bus', 'dlr', 'overground']:
-                            total_transfers += 1
-                        
-                        # Extract line information if available
-                        line_name = None
-                        direction = None
-                        stops = None
-                        
-                        if leg.get('routeOptions'):
-                            route_option = leg['routeOptions'][0]
-                            line_name = route_option.get('name')
-                            direction = route_option.get('direction')
-                        
-                        # Extract intermediate stops or path coordinates
-                        intermediate_stops = []
-                        
-                        # For tube/bus legs, use the lineString coordinates (smoothed path)
-                        if leg.get('path') and leg.get('path', {}).get('lineString'):
-                            line_string = leg['path']['lineString']
-                            # Parse lineString which is in format "[[lat,lon],[lat,lon],...]"
-                            import json
-                            try:
-                                coords = json.loads(line_string)
-                                
-                                # For tube lines, heavily sample to avoid zigzag patterns
-                                # For other modes, moderate sampling
-                                if mode.lower() in ['tube', 'underground']:
-                                    # For tube, take fewer points to avoid platform zigzags
-                                    # Sample every 10th point for tube lines
-                                    step = max(10, len(coords) // 10)
-                                else:
-                                    # For walking/bus, more detailed path
-                                    step = max(3, len(coords) // 20)
-                                
-                                # Sample points, skip first and last
-                                for i in range(step, len(coords) - 1, step):
-                                    if len(coords[i]) >= 2:
-                                        # lineString format is [[lat,lon],[lat,lon],...] 
-                                        intermediate_stops.append((coords[i][0], coords[i][1]))
-                                
-                                # Limit to reasonable number of points
-                                if len(intermediate_stops) > 10:
-                                    # Keep every Nth point to get down to 10
-                                    n = len(intermediate_stops) // 10 + 1
-                                    intermediate_stops = intermediate_stops[::n]
-                            except:
-                                pass
-                        
-                        # Check for intermediate station stops (for specific station data)
-                        if not intermediate_stops and leg.get('intermediateStops'):
-                            for stop in leg['intermediateStops']:
-                                if stop.get('stopPoint'):
-                                    stop_point = stop['stopPoint']
-                                    if stop_point.get('lat') and stop_point.get('lon'):
-                                        intermediate_stops.append((stop_point['lat'], stop_point['lon']))
-                        
-                        # Count stops for display
-                        if leg.get('stopPoints'):
-                            stops = len(leg['stopPoints'])
-                        
-                        # Create instruction
-                        instruction = leg.get('instruction', {}).get('summary', '')
-                        if not instruction:
-                            if mode.lower() == 'walking':
-                                instruction = f"Walk for {duration} minutes"
-                            elif line_name:
-                                instruction = f"Take {line_name} line"
-                                if direction:
-                                    instruction += f" towards {direction}"
-                                if stops:
-                                    instruction += f" ({stops} stops)"
-                        
-                        journey_leg = JourneyLeg(
-                            mode=mode,
-                            from_name=leg.get('departurePoint', {}).get('commonName', ''),
-                            to_name=leg.get('arrivalPoint', {}).get('commonName', ''),
-                            from_coords=(
-                                leg.get('departurePoint', {}).get('lat', from_lat),
-                                leg.get('departurePoint', {}).get('lon', from_lon)
-                            ),
-                            to_coords=(
-                                leg.get('arrivalPoint', {}).get('lat', to_lat),
-                                leg.get('arrivalPoint', {}).get('lon', to_lon)
-                            ),
-                            duration=duration,
-                            distance=leg.get('distance'),
-                            line_name=line_name,
-                            direction=direction,
-                            stops=stops,
-                            instruction=instruction,
-                            intermediate_stops=intermediate_stops
-                        )
-                        legs.append(journey_leg)
-                    
-                    # Parse times
-                    departure_time = None
-                    arrival_time = None
-                    if journey.get('startDateTime'):
-                        try:
-                            departure_time = datetime.fromisoformat(journey['startDateTime'].replace('Z', '+00:00'))
-                        except:
-                            departure_time = datetime.now()
-                    
-                    if journey.get('arrivalDateTime'):
-                        try:
-                            arrival_time = datetime.fromisoformat(journey['arrivalDateTime'].replace('Z', '+00:00'))
-                        except:
-                            arrival_time = datetime.now() + timedelta(minutes=journey.get('duration', 30))
-                    
-                    result = JourneyTime(
-                        from_location=from_name,
-                        to_station=to_name,
-                        duration_minutes=journey.get('duration', 999),
-                        route_type="public_transport",
-                        departure_time=departure_time,
-                        arrival_time=arrival_time,
-                        legs=legs,
-                        total_walking_duration=total_walking_duration,
-                        total_transfers=max(0, total_transfers - 1)  # Transfers = changes between transport
+                # Only the best journey is decoded; its path geometry waits for resolve_paths
+                with _PARSE_SECONDS.time():
+                    journey = first_journey(response.content)
+                    result = parse_journey(
+                        journey, from_lat, from_lon, to_lat, to_lon, from_name, to_name
+                    ) if journey else None
+                if result is not None:
+                    logger.info(
+                        f"Created journey with {len(result.legs)} legs, "
+                        f"{result.total_walking_duration} min walking"
                     )
-                    logger.info(f"Created journey with {len(legs)} legs, {total_walking_duration} min walking")
+                    self._store_journey(cache_key, result)
+                    self._observe(from_lat, from_lon, to_lat, to_lon, result.duration_minutes)
                     return result
             
             # Fallback to simple estimation
-            logger.warning(f"TfL API did not return journey data, using estimation")
+            logger.warning("TfL API did not return journey data, using estimation")
+            ESTIMATE_FALLBACKS.labels(self._fallback_reason(response)).inc()
             return self._get_estimated_journey(from_lat, from_lon, to_lat, to_lon, from_name, to_name)
             
         except Exception as e:
             logger.error(f"Error getting TfL journey details: {str(e)}")
+            ESTIMATE_FALLBACKS.labels("error").inc()
             return self._get_estimated_journey(from_lat, from_lon, to_lat, to_lon, from_name, to_name)
     
+    @staticmethod
+    def _fallback_reason(response: httpx.Response) -> str:
+        return "no_journey" if response.status_code == 200 else "http_status"
+    
     async def get_journey_time(
         self, 
         from_lat: float, 
@@ -216,15 +452,7 @@ class TfLService:
     ) -> JourneyTime:
         """Create an estimated journey when API fails"""
         distance_km = geodesic((from_lat, from_lon), (to_lat, to_lon)).km
-        
-        if distance_km < 1:
-            duration = 5
-        elif distance_km < 3:
-            duration = int(distance_km * 4 + 5)
-        elif distance_km < 10:
-            duration = int(distance_km * 3.5 + 8)
-        else:
-            duration = int(distance_km * 3 + 10)
+        duration = self.estimator.minutes(from_lat, from_lon, to_lat, to_lon)
         
         # Create a simple estimated journey with one leg
         leg = JourneyLeg(
@@ -255,16 +483,12 @@ class TfLService:
         to_lat: float, 
         to_lon: float
     ) -> int:
-        distance_km = geodesic((from_lat, from_lon), (to_lat, to_lon)).km
-        
-        if distance_km < 1:
-            return 5
-        elif distance_km < 3:
-            return int(distance_km * 4 + 5)
-        elif distance_km < 10:
-            return int(distance_km * 3.5 + 8)
-        else:
-            return int(distance_km * 3 + 10)
+        return self.estimator.minutes(from_lat, from_lon, to_lat, to_lon)
     
     async def close(self):
+        if self._saving is not None:
+            await self._saving
+        if self._learning is not None:
+            await self._learning
+        self.estimator.flush()
         await self.client.aclose()
\ No newline at end of file
@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+from datetime import datetime, timezone
+import json
+import logging
+import numpy as np
+
+from app.core.constants import LONDON_STATIONS, TRAVEL_MATRIX_FILE
+from app.services.candidate_scorer import CandidateScorer
+from app.services.station_graph import StationGraph, walking_minutes
+from app.services.station_index import StationIndex
+
+logger = logging.getLogger(__name__)
+
+# Largest value a uint16 cell can hold (just over 18 hours)
+MAX_SECONDS = np.iinfo(np.uint16).max
+
+
+def _metadata_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def build_travel_matrix(graph: StationGraph) -> np.ndarray:
+    """All-pairs modelled station-to-station travel times in whole seconds"""
+    seconds = np.rint(graph.all_pairs_minutes() * 60)
+    return np.minimum(seconds, MAX_SECONDS).astype(np.uint16)
+
+
+def save_travel_matrix(seconds: np.ndarray, names: List[str], path: Path):
+    """Write the matrix as a raw .npy (memory-mappable) plus a JSON sidecar"""
+    np.save(path, seconds)
+    with open(_metadata_path(path), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "unit": "seconds",
+                "stations": names
+            },
+            f,
+            ensure_ascii=False,
+            indent=1
+        )
+
+
+class TravelMatrix:
+    """Station-to-station travel times answered from a precomputed matrix.
+
+    A participant's time to a station is the walk to one of their nearest
+    ``access_stations`` plus the matrix entry from there, or the direct walk
+    if that is quicker.
+    """
+
+    def __init__(
+        self,
+        seconds: np.ndarray,
+        names: Sequence[str],
+        access_stations: int = 3
+    ):
+        if seconds.shape != (len(names), len(names)):
+            raise ValueError(
+                f"Travel matrix shape {seconds.shape} does not match {len(names)} stations"
+            )
+        self.seconds = seconds
+        self.names = list(names)
+        self.access_stations = access_stations
+        stations = {name: LONDON_STATIONS[name] for name in self.names}
+        self.station_index = StationIndex(stations)
+        self.scorer = CandidateScorer(stations)
+
+    @classmethod
+    def load(
+        cls,
+        path: Optional[Union[str, Path]] = None,
+        access_stations: int = 3
+    ) -> Optional["TravelMatrix"]:
+        """Memory-map a built matrix; None if it is missing or out of date"""
+        path = Path(path) if path else TRAVEL_MATRIX_FILE
+        try:
+            with open(_metadata_path(path), encoding="utf-8") as f:
+                metadata = json.load(f)
+            seconds = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            logger.warning(f"Travel matrix not found at {path}; matrix mode disabled")
+            return None
+
+        if metadata["stations"] != list(LONDON_STATIONS):
+            logger.warning(
+                f"Travel matrix at {path} was built for a different station catalogue; "
+                "matrix mode disabled"
+            )
+            return None
+        logger.info(
+            f"Loaded {len(metadata['stations'])}-station travel matrix "
+            f"built {metadata['built_at']}"
+        )
+        return cls(seconds, metadata["stations"], access_stations)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def minutes(self, from_id: int, to_id: int) -> float:
+        return self.seconds[from_id, to_id] / 60
+
+    def journey_minutes(
+        self,
+        points: Sequence[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (total, walking) minutes arrays of shape (participants, stations)"""
+        direct_walk = walking_minutes(self.scorer.distance_matrix(points))
+        totals = np.empty_like(direct_walk)
+        walking = np.empty_like(direct_walk)
+
+        for i, (lat, lon) in enumerate(points):
+            access = self.station_index.nearest(lat, lon, self.access_stations)
+            ids = np.array([station_id for station_id, _ in access], dtype=np.int64)
+            access_walk = walking_minutes(np.array([km for _, km in access]))
+            via = access_walk[:, np.newaxis] + self.seconds[ids] / 60
+            best = via.argmin(axis=0)
+            columns = np.arange(via.shape[1])
+            totals[i] = via[best, columns]
+            walking[i] = access_walk[best]
+
+        walk_instead = direct_walk < totals
+        totals[walk_instead] = direct_walk[walk_instead]
+        walking[walk_instead] = direct_walk[walk_instead]
+        return totals, walking
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for candidate pre-scoring.
+
+Compares the vectorized CandidateScorer over the whole catalogue, and
+restricted to the StationIndex search region (slower at this catalogue size,
+which is why requests score every station), against the original per-pair
+geopy geodesic loop, checks distance accuracy and ranking agreement, and reports the speedup.
+
+Run from the backend directory:
+    python -m benchmarks.bench_candidate_scoring
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+from geopy.distance import geodesic
+
+from app.core.constants import LONDON_STATIONS
+from app.services.candidate_scorer import CandidateScorer, ellipsoidal_distance_km
+from app.services.station_index import StationIndex
+
+# Maximum tolerated absolute error against geodesic, in metres
+MAX_ERROR_METRES = 5.0
+
+
+def random_london_points(n, rng):
+    return [
+        (rng.uniform(51.38, 51.65), rng.uniform(-0.45, 0.20))
+        for _ in range(n)
+    ]
+
+
+def index_search_region(index, points, k, seed_size=30):
+    """Stations that can rank in the top k by max distance for a group.
+
+    Seeds a bound from the stations nearest the centroid: if the k-th best
+    max distance among them is D and every participant is within R of the
+    centroid, no station further than D + R from the centroid can beat it.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    centroid_lat, centroid_lon = (float(v) for v in pts.mean(axis=0))
+    nearest = index.nearest(centroid_lat, centroid_lon, max(k, seed_size))
+    seed = np.array([station_id for station_id, _ in nearest], dtype=np.int64)
+    if len(seed) <= k:
+        return np.arange(len(index.names))
+
+    seed_max = ellipsoidal_distance_km(
+        pts[:, 0:1], pts[:, 1:2],
+        index.coords[seed, 0][np.newaxis, :], index.coords[seed, 1][np.newaxis, :]
+    ).max(axis=0)
+    bound_km = float(np.partition(seed_max, k - 1)[k - 1])
+    reach_km = float(
+        ellipsoidal_distance_km(centroid_lat, centroid_lon, pts[:, 0], pts[:, 1]).max()
+    )
+    # Small slack absorbs the distance approximation's deviation from a true metric
+    return index.within_radius(centroid_lat, centroid_lon, (bound_km + reach_km) * 1.01)
+
+
+def geodesic_top_candidates(stations, points, k):
+    """The original nested-loop ranking, kept as the reference implementation."""
+    candidates = []
+    for station_name, (station_lat, station_lon) in stations.items():
+        total_distance = 0
+        max_distance = 0
+        for point in points:
+            distance = geodesic(point, (station_lat, station_lon)).km
+            total_distance += distance
+            max_distance = max(max_distance, distance)
+        candidates.append({
+            'name': station_name,
+            'avg_distance': total_distance / len(points),
+            'max_distance': max_distance
+        })
+    candidates.sort(key=lambda x: (x['max_distance'], x['avg_distance']))
+    return candidates[:k]
+
+
+def check_accuracy(scorer, rng):
+    points = random_london_points(50, rng)
+    matrix = scorer.distance_matrix(points)
+    errors = []
+    for i, point in enumerate(points):
+        for j, name in enumerate(scorer.names):
+            expected = geodesic(point, LONDON_STATIONS[name]).km
+            errors.append(abs(matrix[i, j] - expected) * 1000)
+    return max(errors), float(np.mean(errors))
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rng = random.Random(42)
+    scorer = CandidateScorer(LONDON_STATIONS)
+    index = StationIndex(LONDON_STATIONS)
+
+    max_error, mean_error = check_accuracy(scorer, rng)
+    print(f"Stations: {len(scorer)}")
+    print(f"Distance error vs geodesic: max {max_error:.3f} m, mean {mean_error:.3f} m")
+
+    ok = max_error <= MAX_ERROR_METRES
+    print()
+    print(
+        f"{'participants':>12} {'geodesic ms':>12} {'vector ms':>10} {'indexed ms':>10} "
+        f"{'speedup':>8} {'same top-7':>10}"
+    )
+    for n in (2, 10, 50):
+        points = random_london_points(n, rng)
+        reference = geodesic_top_candidates(LONDON_STATIONS, points, 7)
+        fast = scorer.top_candidates(points, 7)
+        indexed = scorer.top_candidates(points, 7, index_search_region(index, points, 7))
+        expected = [c['name'] for c in reference]
+        same = expected == [c['name'] for c in fast] == [c['name'] for c in indexed]
+        ok = ok and same
+
+        slow_t = time_call(lambda: geodesic_top_candidates(LONDON_STATIONS, points, 7), 1)
+        fast_t = time_call(lambda: scorer.top_candidates(points, 7), 200)
+        indexed_t = time_call(
+            lambda: scorer.top_candidates(points, 7, index_search_region(index, points, 7)), 200
+        )
+        print(
+            f"{n:>12} {slow_t * 1000:>12.3f} {fast_t * 1000:>10.4f} {indexed_t * 1000:>10.4f}"
+            f" {slow_t / fast_t:>7.0f}x {str(same):>10}"
+        )
+
+    if not ok:
+        print("\nFAILED: vectorized scoring disagrees with geodesic reference")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for TfL JourneyResults parsing.
+
+Replays the recorded fixtures in benchmarks/fixtures/tfl through the original
+eager parse (stdlib json over the whole document, every leg's lineString
+decoded up front) and through the lazy parser: first journey only, geometry
+deferred until the journey is returned. Reports time and peak allocation per
+response and checks that both paths agree.
+
+Run from the backend directory:
+    python -m benchmarks.bench_journey_parsing
+"""
+
+import json
+import sys
+import tracemalloc
+
+from app.services.journey_parser import (
+    JSON_BACKEND,
+    first_journey,
+    parse_journey,
+    path_points,
+    resolve_paths
+)
+from benchmarks.bench_candidate_scoring import time_call
+from benchmarks.tfl_fixtures import fixture_names, load_fixture
+
+ENDPOINTS = (51.5, -0.1, 51.52, -0.12, "Origin", "Station")
+
+
+def eager_parse(body):
+    """The original parse, kept as the reference implementation."""
+    journey = parse_journey(json.loads(body)["journeys"][0], *ENDPOINTS)
+    for leg in journey.legs:
+        if leg._line_string:
+            points = path_points(json.loads(leg._line_string))
+            leg.intermediate_stops = points or leg.intermediate_stops
+            leg._line_string = None
+    return journey
+
+
+def lazy_parse(body):
+    return parse_journey(first_journey(body), *ENDPOINTS)
+
+
+def lazy_parse_resolved(body):
+    return resolve_paths(lazy_parse(body))
+
+
+def peak_kib(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    print(f"JSON backend: {JSON_BACKEND}")
+    print()
+    print(f"{'fixture':<30} {'KiB':>5} {'mode':<16} {'us':>9} {'speedup':>8} {'peak KiB':>9}")
+
+    ok = True
+    for name in fixture_names():
+        body = load_fixture(name)
+        reference = eager_parse(body)
+        ok = ok and lazy_parse_resolved(body).model_dump() == reference.model_dump()
+
+        modes = [
+            ("eager", eager_parse),
+            ("lazy", lazy_parse),
+            ("lazy + paths", lazy_parse_resolved)
+        ]
+        eager_t = None
+        for mode, fn in modes:
+            elapsed = time_call(lambda: fn(body), 200)
+            eager_t = eager_t or elapsed
+            print(
+                f"{name:<30} {len(body) / 1024:>5.0f} {mode:<16} {elapsed * 1e6:>9.1f}"
+                f" {eager_t / elapsed:>7.1f}x {peak_kib(lambda: fn(body)):>9.0f}"
+            )
+
+    if not ok:
+        print("\nFAILED: lazy parsing disagrees with the eager reference")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
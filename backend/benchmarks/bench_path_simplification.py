@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for journey path simplification and encoded polylines.
+
+Compares the original stride sampling of TfL lineStrings with Douglas-Peucker
+simplification at several tolerances: vertices kept, worst deviation from the
+original path, and time per leg. Then builds a 10-participant response (four
+stations, 40 journeys) from the recorded fixtures and reports its JSON size
+with coordinate paths and with encoded polylines (path_format="polyline").
+
+Run from the backend directory:
+    python -m benchmarks.bench_path_simplification
+"""
+
+import math
+import sys
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+from app.schemas import MeetingPointResponse, MeetingStation, ProcessedLocation
+from app.services.journey_parser import (
+    first_journey, loads, parse_journey, path_points, resolve_paths
+)
+from app.services.polyline import METRES_PER_DEGREE, decode, encode, encode_paths
+from benchmarks.bench_candidate_scoring import time_call
+from benchmarks.tfl_fixtures import fixture_names, load_fixture
+
+TOLERANCES = (2.0, 10.0, 25.0)
+PARTICIPANTS = 10
+STATIONS = 4
+
+
+def stride_sample(coords, mode):
+    """The original sampling, kept as the reference implementation."""
+    if mode.lower() in ['tube', 'underground']:
+        step = max(10, len(coords) // 10)
+    else:
+        step = max(3, len(coords) // 20)
+    points = [(coords[i][0], coords[i][1]) for i in range(step, len(coords) - 1, step)]
+    if len(points) > 10:
+        points = points[::len(points) // 10 + 1]
+    return points
+
+
+def max_deviation_metres(original, simplified):
+    """Largest distance from an original vertex to the simplified path"""
+    original = np.asarray(original, dtype=np.float64)
+    kept = np.asarray(simplified, dtype=np.float64).reshape(-1, 2)
+    path = np.vstack([original[:1], kept, original[-1:]])
+    cos_lat = math.cos(math.radians(float(original[:, 0].mean())))
+    scale = np.array([1.0, cos_lat]) * METRES_PER_DEGREE
+    points, path = original * scale, path * scale
+
+    starts, segments = path[:-1], path[1:] - path[:-1]
+    offsets = points[:, np.newaxis, :] - starts[np.newaxis, :, :]
+    length_sq = np.maximum((segments ** 2).sum(axis=1), 1e-12)
+    t = np.clip((offsets * segments).sum(axis=2) / length_sq, 0.0, 1.0)
+    nearest = offsets - t[:, :, np.newaxis] * segments
+    return float(np.hypot(nearest[..., 0], nearest[..., 1]).min(axis=1).max())
+
+
+def fixture_legs():
+    legs = []
+    for name in fixture_names():
+        for leg in first_journey(load_fixture(name))["legs"]:
+            legs.append((leg["mode"]["name"], loads(leg["path"]["lineString"])))
+    return legs
+
+
+def sample_response(tolerance):
+    journeys = []
+    for name in fixture_names():
+        journey = parse_journey(
+            first_journey(load_fixture(name)), 51.5, -0.1, 51.52, -0.12, "Participant", name
+        )
+        for leg in journey.legs:
+            if leg._line_string:
+                leg.intermediate_stops = path_points(loads(leg._line_string), tolerance)
+                leg._line_string = None
+        journeys.append(resolve_paths(journey))
+
+    def station(i):
+        times = [journeys[(i + p) % len(journeys)] for p in range(PARTICIPANTS)]
+        return MeetingStation(
+            station_name=f"Station {i}", latitude=51.5, longitude=-0.1,
+            average_journey_time=30, max_journey_time=40, total_journey_time=300,
+            fairness_score="Fair", journey_times=times
+        )
+
+    return MeetingPointResponse(
+        request_id=str(uuid.uuid4()),
+        created_at=datetime.utcnow(),
+        optimal_station=station(0),
+        alternative_stations=[station(i) for i in range(1, STATIONS)],
+        processed_locations=[
+            ProcessedLocation(name=f"P{p}", address=None, latitude=51.5, longitude=-0.1)
+            for p in range(PARTICIPANTS)
+        ],
+        map_center=(51.5, -0.1)
+    )
+
+
+def main():
+    ok = True
+    legs = fixture_legs()
+    vertices = sum(len(coords) for _, coords in legs)
+    print(f"Legs: {len(legs)}, lineString vertices: {vertices}")
+    print()
+    print(f"{'method':<16} {'kept':>6} {'max dev m':>10} {'us/leg':>8}")
+
+    kept = sum(len(stride_sample(coords, mode)) for mode, coords in legs)
+    worst = max(max_deviation_metres(coords, stride_sample(coords, mode)) for mode, coords in legs)
+    elapsed = time_call(lambda: [stride_sample(coords, mode) for mode, coords in legs], 200)
+    print(f"{'stride':<16} {kept:>6} {worst:>10.1f} {elapsed / len(legs) * 1e6:>8.1f}")
+
+    for tolerance in TOLERANCES:
+        simplified = [path_points(coords, tolerance) for _, coords in legs]
+        kept = sum(len(points) for points in simplified)
+        worst = max(
+            max_deviation_metres(coords, points) for (_, coords), points in zip(legs, simplified)
+        )
+        ok = ok and worst <= tolerance + 1e-6
+        elapsed = time_call(lambda: [path_points(coords, tolerance) for _, coords in legs], 200)
+        label = f"DP {tolerance:g} m"
+        print(f"{label:<16} {kept:>6} {worst:>10.1f} {elapsed / len(legs) * 1e6:>8.1f}")
+
+    print()
+    print(f"{PARTICIPANTS} participants x {STATIONS} stations = {PARTICIPANTS * STATIONS} journeys")
+    print(
+        f"{'tolerance':<10} {'coords B':>9} {'polyline B':>11} {'ratio':>6} "
+        f"{'path B':>8} {'encoded B':>10} {'ratio':>6}"
+    )
+    for tolerance in TOLERANCES:
+        response = sample_response(tolerance)
+        encoded = encode_paths(response)
+        stations = [response.optimal_station, *response.alternative_stations]
+        path_legs = [leg for s in stations for j in s.journey_times for leg in j.legs]
+        path_bytes = sum(len(str(leg.intermediate_stops).replace(" ", "")) for leg in path_legs)
+        encoded_bytes = sum(len(encode(leg.intermediate_stops)) for leg in path_legs)
+        full, compact = len(response.model_dump_json()), len(encoded.model_dump_json())
+        print(
+            f"{f'{tolerance:g} m':<10} {full:>9} {compact:>11} {full / compact:>5.1f}x"
+            f" {path_bytes:>8} {encoded_bytes:>10} {path_bytes / max(encoded_bytes, 1):>5.1f}x"
+        )
+        for leg in path_legs:
+            restored = decode(encode(leg.intermediate_stops))
+            ok = ok and all(
+                abs(a - b) <= 1e-5
+                for p, q in zip(leg.intermediate_stops, restored)
+                for a, b in zip(p, q)
+            )
+
+    if not ok:
+        print(
+            "\nFAILED: simplification exceeded its tolerance "
+            "or polyline round trip lost precision"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
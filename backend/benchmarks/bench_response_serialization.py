@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for MeetingPointResponse serialization and shaping.
+
+Serializes a 10-participant response (four stations, 40 journeys built from
+the recorded TfL fixtures) the way FastAPI does for a response_model
+(validate, jsonable_encoder, json.dumps) and through the shaped path used by
+/calculate (pydantic-core straight to bytes), for each detail level and leg
+field selection, and reports bytes before and after gzip.
+
+Run from the backend directory:
+    python -m benchmarks.bench_response_serialization
+"""
+
+import gzip
+import json
+import sys
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas import MeetingPointResponse
+from app.services.polyline import encode_paths
+from app.services.response_shaping import serialize_response
+from benchmarks.bench_candidate_scoring import time_call
+from benchmarks.bench_path_simplification import sample_response
+
+SHAPES = [
+    ("full", "coordinates", None),
+    ("full", "polyline", None),
+    ("full", "coordinates", ["mode", "line_name", "duration", "instruction"]),
+    ("summary", "coordinates", None),
+]
+
+
+def fastapi_default(response):
+    """What FastAPI does with a returned model and response_model, for reference."""
+    validated = MeetingPointResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def main():
+    response = sample_response(10.0)
+    reference = fastapi_default(response)
+    ok = json.loads(serialize_response(response)) == json.loads(reference)
+
+    default_t = time_call(lambda: fastapi_default(response), 50)
+    print(f"{'shape':<40} {'ms':>7} {'speedup':>8} {'bytes':>7} {'gzip':>6}")
+    print(
+        f"{'response_model (FastAPI default)':<40} {default_t * 1000:>7.3f} {1:>7.1f}x"
+        f" {len(reference):>7} {len(gzip.compress(reference, 6)):>6}"
+    )
+    for detail, path_format, leg_fields in SHAPES:
+        def render():
+            shaped = encode_paths(response) if path_format == "polyline" else response
+            return serialize_response(shaped, detail, leg_fields)
+
+        body = render()
+        elapsed = time_call(render, 200)
+        label = f"{detail}/{path_format}" + (f" legs={len(leg_fields)}" if leg_fields else "")
+        print(
+            f"{label:<40} {elapsed * 1000:>7.3f} {default_t / elapsed:>7.1f}x"
+            f" {len(body):>7} {len(gzip.compress(body, 6)):>6}"
+        )
+
+    if not ok:
+        print("\nFAILED: shaped full response differs from the FastAPI serialization")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
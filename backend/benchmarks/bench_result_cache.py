@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the whole-result cache in front of find_meeting_point.
+
+Times a full calculation (distance estimates, so no network) against cache
+hits for the same request and for the same participants reordered with
+their pins nudged a few metres, and checks that every hit matches a fresh
+calculation apart from its request_id and timestamp.
+
+Run from the backend directory:
+    python -m benchmarks.bench_result_cache
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from app.schemas import LocationInput
+from app.services import GeocodingService, MeetingCalculator, TfLService
+from app.services.result_cache import ResultCache
+
+GROUP_SIZES = (2, 10)
+REPEATS = 500
+
+
+def group(n, rng):
+    return [
+        LocationInput(
+            name=f"P{i}", latitude=rng.uniform(51.45, 51.58), longitude=rng.uniform(-0.25, 0.0)
+        )
+        for i in range(n)
+    ]
+
+
+def reordered(locations, rng):
+    nudged = [
+        loc.model_copy(update={"latitude": loc.latitude + 1e-5, "longitude": loc.longitude - 1e-5})
+        for loc in locations
+    ]
+    rng.shuffle(nudged)
+    return nudged
+
+
+async def time_async(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def comparable(response):
+    return response.model_dump(exclude={"request_id", "created_at"})
+
+
+async def run():
+    rng = random.Random(7)
+    cached = MeetingCalculator(TfLService(), GeocodingService())
+    uncached = MeetingCalculator(
+        cached.tfl_service, cached.geocoding_service, result_cache=ResultCache(max_entries=0)
+    )
+
+    ok = True
+    print(f"{'participants':<13} {'miss us':>9} {'hit us':>8} {'reordered us':>13} {'speedup':>8}")
+    for n in GROUP_SIZES:
+        locations = group(n, rng)
+        shuffled = reordered(locations, rng)
+        first = await cached.find_meeting_point(locations, use_tfl_api=False)
+
+        for request in (locations, shuffled):
+            hit = await cached.find_meeting_point(request, use_tfl_api=False)
+            fresh = await uncached.find_meeting_point(request, use_tfl_api=False)
+            ok = ok and hit.request_id != first.request_id
+            ok = ok and comparable(hit) == comparable(fresh)
+
+        miss_t = await time_async(
+            lambda: uncached.find_meeting_point(locations, use_tfl_api=False), REPEATS // 10
+        )
+        hit_t = await time_async(
+            lambda: cached.find_meeting_point(locations, use_tfl_api=False), REPEATS
+        )
+        shuffled_t = await time_async(
+            lambda: cached.find_meeting_point(shuffled, use_tfl_api=False), REPEATS
+        )
+        print(
+            f"{n:<13} {miss_t * 1e6:>9.0f} {hit_t * 1e6:>8.1f} {shuffled_t * 1e6:>13.1f} "
+            f"{miss_t / hit_t:>7.0f}x"
+        )
+
+    print()
+    print(f"Cache: {cached.cache_stats()}")
+    return ok
+
+
+def main():
+    if not asyncio.run(run()):
+        print("\nFAILED: a cached response differs from a fresh calculation")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the precomputed travel-time matrix.
+
+Times TravelMatrix.journey_minutes (every participant to every station) and
+reports the cost per participant-station pair, alongside the per-pair
+distance-based estimate it replaces.
+
+Run from the backend directory:
+    python -m benchmarks.bench_travel_matrix
+"""
+
+import random
+import sys
+
+from app.core.constants import LONDON_STATIONS
+from app.services.tfl_service import TfLService
+from app.services.travel_matrix import TravelMatrix
+from benchmarks.bench_candidate_scoring import random_london_points, time_call
+
+
+def main():
+    matrix = TravelMatrix.load()
+    if matrix is None:
+        print("FAILED: no travel matrix; run `make travel-matrix` first")
+        sys.exit(1)
+
+    rng = random.Random(42)
+    tfl = TfLService(None, None)
+    stations = list(LONDON_STATIONS.values())
+    print(f"Stations: {len(matrix)}")
+    print()
+    print(
+        f"{'participants':>12} {'matrix ms':>10} {'us/pair':>8} {'estimate ms':>12} {'us/pair':>8}"
+    )
+    for n in (2, 10, 50):
+        points = random_london_points(n, rng)
+        pairs = n * len(stations)
+        matrix_t = time_call(lambda: matrix.journey_minutes(points), 50)
+        estimate_t = time_call(
+            lambda: [
+                tfl._estimate_journey_time(lat, lon, s_lat, s_lon)
+                for lat, lon in points
+                for s_lat, s_lon in stations
+            ],
+            1
+        )
+        print(
+            f"{n:>12} {matrix_t * 1000:>10.3f} {matrix_t / pairs * 1e6:>8.3f}"
+            f" {estimate_t * 1000:>12.3f} {estimate_t / pairs * 1e6:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Load generator for POST /api/meeting-points/calculate.
+
+Open loop (--rps) sends requests on a fixed schedule whether or not earlier
+ones have answered, and times each from when it was due to be sent, so a
+server that falls behind shows up as latency rather than a slower offered
+load. Closed loop (--concurrency) keeps that many requests outstanding.
+
+Participants are given as coordinates (no Nominatim lookups), drawn from a
+pool of --groups groups: a small pool exercises the result and journey
+caches, a large one the TfL path. Upstream calls per request come from the
+where2meet_tfl_request_seconds_count deltas in /api/metrics.
+
+Run from the backend directory, against the API pointed at benchmarks.mock_tfl:
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --rps 20 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+CALCULATE_PATH = "/api/meeting-points/calculate"
+METRICS_PATH = "/api/metrics"
+_UPSTREAM_COUNT = re.compile(r"^where2meet_tfl_request_seconds_count\{[^}]*\} (\S+)$", re.MULTILINE)
+
+
+def percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def make_groups(count: int, participants: int, seed: int) -> List[List[Dict]]:
+    rng = random.Random(seed)
+    return [
+        [
+            {
+                "name": f"P{i}",
+                "latitude": round(rng.uniform(51.45, 51.58), 6),
+                "longitude": round(rng.uniform(-0.25, 0.0), 6)
+            }
+            for i in range(participants)
+        ]
+        for _ in range(count)
+    ]
+
+
+async def upstream_requests(client: httpx.AsyncClient) -> Optional[float]:
+    """TfL requests made so far by the API, or None if /api/metrics is unavailable"""
+    try:
+        response = await client.get(METRICS_PATH)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return sum(float(value) for value in _UPSTREAM_COUNT.findall(response.text))
+
+
+class LoadTest:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        groups: List[List[Dict]],
+        use_tfl: bool,
+        seed: int
+    ):
+        self.client = client
+        self.groups = groups
+        self.use_tfl = use_tfl
+        self.rng = random.Random(seed)
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+
+    async def request(self, due: float):
+        body = {"locations": self.rng.choice(self.groups), "use_tfl_api": self.use_tfl}
+        try:
+            response = await self.client.post(CALCULATE_PATH, json=body)
+            outcome = str(response.status_code)
+        except httpx.TimeoutException:
+            outcome = "timeout"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        self.statuses[outcome] += 1
+        if outcome == "200":
+            self.latencies.append(time.perf_counter() - due)
+
+    async def open_loop(self, rps: float, duration: float):
+        start = time.perf_counter()
+        tasks = []
+        for i in range(int(rps * duration)):
+            due = start + i / rps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.request(due)))
+        await asyncio.gather(*tasks)
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.request(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    def report(self, elapsed: float, upstream: Optional[float]) -> Dict:
+        ordered = sorted(self.latencies)
+        sent = sum(self.statuses.values())
+        return {
+            "requests": sent,
+            "elapsed_seconds": elapsed,
+            "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+            "errors": {status: count for status, count in self.statuses.items() if status != "200"},
+            "latency_seconds": {
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1] if ordered else None
+            },
+            "upstream_calls_per_request": upstream / sent if upstream is not None and sent else None
+        }
+
+
+async def run(args) -> Dict:
+    groups = make_groups(args.groups, args.participants, args.seed)
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        try:
+            await client.get("/api/health/")
+        except httpx.HTTPError as e:
+            raise SystemExit(f"Cannot reach the API at {args.url}: {e}")
+        before = await upstream_requests(client)
+        load_test = LoadTest(client, groups, not args.no_tfl, args.seed)
+        start = time.perf_counter()
+        if args.rps:
+            await load_test.open_loop(args.rps, args.duration)
+        else:
+            await load_test.closed_loop(args.concurrency, args.duration)
+        elapsed = time.perf_counter() - start
+        after = await upstream_requests(client)
+
+    upstream = after - before if before is not None and after is not None else None
+    report = load_test.report(elapsed, upstream)
+    report["config"] = {
+        "url": args.url,
+        "mode": "open" if args.rps else "closed",
+        "rps": args.rps,
+        "concurrency": None if args.rps else args.concurrency,
+        "duration_seconds": args.duration,
+        "participants": args.participants,
+        "groups": args.groups,
+        "use_tfl_api": not args.no_tfl
+    }
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load generator for /api/meeting-points/calculate")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--rps", type=float, help="open loop at this arrival rate (default: closed loop)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=10, help="closed loop: requests kept outstanding"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--participants", type=int, default=4)
+    parser.add_argument(
+        "--groups", type=int, default=50, help="distinct participant groups to draw from"
+    )
+    parser.add_argument("--no-tfl", action="store_true", help="send use_tfl_api=false")
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="client timeout per request, seconds"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the report JSON here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+
+    latency = report["latency_seconds"]
+    print(f"{report['requests']} requests in {report['elapsed_seconds']:.1f}s, "
+          f"{report['throughput_rps']:.1f} ok/s")
+    if latency["p50"] is not None:
+        print("latency ms: " + "  ".join(
+            f"{name} {latency[name] * 1000:.1f}" for name in ("p50", "p95", "p99", "max")
+        ))
+    print(f"errors: {report['errors'] or 'none'}")
+    if report["upstream_calls_per_request"] is not None:
+        print(f"upstream TfL calls per request: {report['upstream_calls_per_request']:.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Wrote report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the TfL Journey Planner, for load tests.
+
+Serves ``GET /Journey/JourneyResults/{from}/to/{to}`` from the recorded
+JourneyResults fixtures (or small synthetic journeys with --synthetic), with
+injected latency and failures:
+
+- latency: lognormal around --latency-ms (--latency-sigma 0 makes it fixed)
+- --rate-429: 429 Too Many Requests with a Retry-After of --retry-after
+- --rate-5xx: a 500, 502 or 503
+- --rate-timeout: holds the request for --hang-seconds, past the client's
+  timeout, then answers 504
+
+``GET /__stats`` reports requests served by outcome; ``POST /__config``
+changes any of the settings above while running (e.g. to start a 429 storm
+mid-test). Point the API at it with TFL_API_BASE_URL.
+
+Run from the backend directory:
+    python -m benchmarks.mock_tfl --port 8100 --latency-ms 300 --rate-429 0.02
+    TFL_API_BASE_URL=http://127.0.0.1:8100 python run.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.offline import TfLFixtures, fixture_duration
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 250.0
+    latency_sigma: float = 0.5
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    rate_timeout: float = 0.0
+    retry_after: float = 1.0
+    hang_seconds: float = 60.0
+    synthetic: bool = False
+    seed: Optional[int] = None
+
+
+def _coords(text: str):
+    lat, lon = text.split(",")
+    return float(lat), float(lon)
+
+
+def synthetic_journey(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> bytes:
+    """A two-leg journey (walk, then tube) in the JourneyResults shape, a few KiB"""
+    minutes = fixture_duration(from_lat, from_lon, to_lat, to_lon)
+    walk = max(1, minutes // 5)
+    mid_lat = from_lat + (to_lat - from_lat) * 0.15
+    mid_lon = from_lon + (to_lon - from_lon) * 0.15
+
+    def path(a_lat, a_lon, b_lat, b_lon, vertices):
+        return json.dumps([
+            [
+                round(a_lat + (b_lat - a_lat) * i / (vertices - 1), 6),
+                round(a_lon + (b_lon - a_lon) * i / (vertices - 1), 6)
+            ]
+            for i in range(vertices)
+        ])
+
+    def point(name, lat, lon):
+        return {"commonName": name, "lat": lat, "lon": lon}
+
+    legs = [
+        {
+            "duration": walk,
+            "mode": {"id": "walking", "name": "walking"},
+            "instruction": {"summary": "Walk to Interchange"},
+            "departurePoint": point("Origin", from_lat, from_lon),
+            "arrivalPoint": point("Interchange", mid_lat, mid_lon),
+            "distance": round(walk * 80.0),
+            "path": {"lineString": path(from_lat, from_lon, mid_lat, mid_lon, 20)}
+        },
+        {
+            "duration": minutes - walk,
+            "mode": {"id": "tube", "name": "tube"},
+            "instruction": {"summary": "Tube line to Destination"},
+            "departurePoint": point("Interchange", mid_lat, mid_lon),
+            "arrivalPoint": point("Destination", to_lat, to_lon),
+            "routeOptions": [{"name": "Tube", "directions": ["Destination"]}],
+            "path": {
+                "lineString": path(mid_lat, mid_lon, to_lat, to_lon, 120),
+                "stopPoints": [{"name": f"Stop {i}"} for i in range(max(1, minutes // 3))]
+            }
+        }
+    ]
+    start = datetime.now().replace(microsecond=0)
+    return json.dumps({"journeys": [{
+        "startDateTime": start.isoformat(),
+        "duration": minutes,
+        "arrivalDateTime": (start + timedelta(minutes=minutes)).isoformat(),
+        "legs": legs
+    }]}, separators=(",", ":")).encode()
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI(title="Mock TfL Journey Planner")
+    fixtures = TfLFixtures()
+    rng = random.Random(config.seed)
+    outcomes: Counter = Counter()
+
+    def latency() -> float:
+        median = config.latency_ms / 1000
+        if config.latency_sigma <= 0:
+            return median
+        return rng.lognormvariate(0.0, config.latency_sigma) * median
+
+    @app.get("/Journey/JourneyResults/{from_coords}/to/{to_coords}")
+    async def journey_results(from_coords: str, to_coords: str, request: Request):
+        draw = rng.random()
+        if draw < config.rate_timeout:
+            outcomes["timeout"] += 1
+            await asyncio.sleep(config.hang_seconds)
+            return Response(status_code=504)
+        draw -= config.rate_timeout
+
+        await asyncio.sleep(latency())
+        if draw < config.rate_429:
+            outcomes["429"] += 1
+            return Response(status_code=429, headers={"Retry-After": f"{config.retry_after:g}"})
+        draw -= config.rate_429
+        if draw < config.rate_5xx:
+            status = rng.choice((500, 502, 503))
+            outcomes[str(status)] += 1
+            return Response(status_code=status)
+
+        outcomes["200"] += 1
+        if config.synthetic:
+            body = synthetic_journey(*_coords(from_coords), *_coords(to_coords))
+        else:
+            body = fixtures.body(request.url.path)
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/__stats")
+    async def stats() -> Dict:
+        return {
+            "requests": sum(outcomes.values()),
+            "outcomes": dict(outcomes),
+            "config": asdict(config)
+        }
+
+    @app.post("/__config")
+    async def update_config(changes: Dict) -> Dict:
+        names = {field.name for field in fields(MockConfig)}
+        for name, value in changes.items():
+            if name in names:
+                setattr(config, name, value)
+        return asdict(config)
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the TfL Journey Planner")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    for field in fields(MockConfig):
+        flag = "--" + field.name.replace("_", "-")
+        if field.type is bool or field.type == "bool":
+            parser.add_argument(flag, action="store_true")
+        else:
+            parser.add_argument(
+                flag, type=int if field.name == "seed" else float, default=field.default
+            )
+    args = parser.parse_args()
+
+    config = MockConfig(**{field.name: getattr(args, field.name) for field in fields(MockConfig)})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Offline stand-ins for TfL and Nominatim, served from the recorded fixtures.
+
+TfL JourneyResults calls are answered at the ``httpx.AsyncClient`` layer by
+a MockTransport that serves the documents in fixtures/tfl, so the full
+client, scheduler, parsing and caching path still runs. Nominatim lookups
+are answered at the geocoder layer from fixtures/nominatim/search.json
+(Nominatim jsonv2 results keyed by normalized query) by a drop-in for geopy's
+Nominatim. The upstream rate limits are lifted: they model TfL's quota and
+Nominatim's usage policy, not our own cost.
+"""
+
+import json
+import math
+import re
+import zlib
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import httpx
+from geopy.location import Location
+
+from app.services.geocoding_service import GeocodingService, normalize_address
+from app.services.rate_limiter import TokenBucket, UpstreamScheduler
+from app.services.tfl_service import TfLService
+from benchmarks.tfl_fixtures import fixture_names, load_fixture
+
+NOMINATIM_FIXTURES = Path(__file__).parent / "fixtures" / "nominatim" / "search.json"
+
+_JOURNEY_PATH = re.compile(r"/JourneyResults/([-\d.]+),([-\d.]+)/to/([-\d.]+),([-\d.]+)")
+_DURATION = re.compile(rb'"duration":\d+')
+UNLIMITED = 1e9
+
+
+def fixture_duration(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> int:
+    """Minutes for a journey served from a fixture, from its straight-line distance.
+
+    The fixtures' own durations would tie every station; this keeps rankings
+    (and so pruning) behaving as they do against the live API.
+    """
+    dy = (to_lat - from_lat) * 111.32
+    dx = (to_lon - from_lon) * 111.32 * math.cos(math.radians(from_lat))
+    return int(round(8 + 3.5 * math.hypot(dx, dy)))
+
+
+class TfLFixtures:
+    """JourneyResults responses for TfLService's client.
+
+    Each origin/destination pair is served one of the fixture documents,
+    picked by a stable hash of the request path, with its best journey's
+    duration set by ``fixture_duration``.
+    """
+
+    def __init__(self, names: Optional[Sequence[str]] = None):
+        self.names = list(names or fixture_names())
+        self._documents = []
+        for name in self.names:
+            body = load_fixture(name)
+            match = _DURATION.search(body, body.index(b'"journeys":['))
+            self._documents.append((body[:match.start()], body[match.end():]))
+        self.requests = 0
+
+    def body(self, path: str) -> bytes:
+        prefix, suffix = self._documents[zlib.crc32(path.encode()) % len(self._documents)]
+        match = _JOURNEY_PATH.search(path)
+        minutes = fixture_duration(*map(float, match.groups())) if match else 30
+        return b"".join((prefix, b'"duration":%d' % minutes, suffix))
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        return httpx.Response(
+            200,
+            content=self.body(request.url.path),
+            headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+class FixtureGeocoder:
+    """Drop-in for geopy's Nominatim, answering from recorded search results"""
+
+    def __init__(self, path: Path = NOMINATIM_FIXTURES):
+        with open(path, encoding="utf-8") as fixture:
+            self.results = json.load(fixture)
+        self.calls = 0
+
+    @staticmethod
+    def _location(raw: dict) -> Location:
+        return Location(raw["display_name"], (float(raw["lat"]), float(raw["lon"])), raw)
+
+    def geocode(
+        self,
+        query: str,
+        exactly_one: bool = True,
+        timeout: Optional[float] = None,
+        **kwargs
+    ):
+        self.calls += 1
+        results = self.results.get(normalize_address(query))
+        if not results:
+            return None
+        if exactly_one:
+            return self._location(results[0])
+        return [self._location(raw) for raw in results]
+
+    def reverse(self, query, exactly_one: bool = True, timeout: Optional[float] = None, **kwargs):
+        """The closest recorded place to a (lat, lon)"""
+        self.calls += 1
+        lat, lon = (float(value) for value in (
+            query.split(",") if isinstance(query, str) else query
+        ))
+        places: List[dict] = [results[0] for results in self.results.values()]
+        if not places:
+            return None
+        raw = min(places, key=lambda place: (
+            (float(place["lat"]) - lat) ** 2 + (float(place["lon"]) - lon) ** 2
+        ))
+        return self._location(raw)
+
+    def addresses(self) -> List[str]:
+        return list(self.results)
+
+
+def install_tfl(tfl_service: TfLService, fixtures: Optional[TfLFixtures] = None) -> TfLFixtures:
+    """Serve TfLService's journey requests from the fixtures, without rate limiting"""
+    fixtures = fixtures or TfLFixtures()
+    tfl_service.client = fixtures.client()
+    tfl_service.scheduler = UpstreamScheduler(
+        max_concurrency=tfl_service.scheduler.max_concurrency,
+        rate_per_second=UNLIMITED,
+        burst=UNLIMITED
+    )
+    return fixtures
+
+
+def install_geocoder(geocoding_service: GeocodingService) -> FixtureGeocoder:
+    """Answer GeocodingService's Nominatim lookups from the fixtures, without rate limiting"""
+    geocoding_service.geolocator = FixtureGeocoder()
+    geocoding_service._limiter = TokenBucket(rate=UNLIMITED, capacity=UNLIMITED)
+    return geocoding_service.geolocator
+
+
+def install(
+    tfl_service: TfLService,
+    geocoding_service: GeocodingService,
+    fixtures: Optional[TfLFixtures] = None
+) -> TfLFixtures:
+    """Point the services at the fixtures instead of the live APIs"""
+    install_geocoder(geocoding_service)
+    return install_tfl(tfl_service, fixtures)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite with machine-readable results.
+
+Runs entirely against the recorded fixtures (see benchmarks/offline.py):
+
+- scoring: candidate pre-scoring for 2, 10 and 50 participants
+- parsing: TfLService.get_journey_details on each JourneyResults fixture,
+  through the httpx client with the journey cache cleared every call
+- serialization: a 10-participant MeetingPointResponse, per output shape
+- calculate: POST /api/meeting-points/calculate through the ASGI app, cold
+  (every cache cleared), with journeys cached, and as a result-cache hit
+
+Each benchmark reports min/median/p95/mean seconds over its iterations.
+Results are written as JSON with the environment they were measured in.
+Given a baseline, medians are compared, and the run fails if any is slower
+than the threshold allows.
+
+Run from the backend directory:
+    python -m benchmarks.suite --output bench.json [--baseline old.json] [--quick]
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+import pydantic
+
+from app.core.config import settings
+from app.services.journey_parser import JSON_BACKEND
+from app.services.polyline import encode_paths
+from app.services.response_shaping import serialize_response
+from benchmarks.bench_path_simplification import sample_response
+from benchmarks.bench_response_serialization import SHAPES
+from benchmarks.offline import FixtureGeocoder, TfLFixtures, install, install_tfl
+from benchmarks.tfl_fixtures import fixture_names, load_fixture
+
+SCHEMA_VERSION = 1
+SCORING_PARTICIPANTS = (2, 10, 50)
+CALCULATE_PARTICIPANTS = (2, 10)
+DEFAULT_THRESHOLD = 1.25
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "mean": statistics.fmean(ordered)
+    }
+
+
+def measure(
+    fn: Callable[[], object],
+    iterations: int,
+    setup: Optional[Callable[[], None]] = None
+) -> Dict:
+    fn()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def measure_async(
+    fn: Callable[[], Awaitable[object]],
+    iterations: int,
+    setup: Optional[Callable[[], None]] = None
+) -> Dict:
+    await fn()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def result(group: str, params: Dict, stats: Dict, **extra) -> Dict:
+    name = group + "".join(f"/{key}={value}" for key, value in params.items())
+    return {"name": name, "group": group, "params": params, "unit": "seconds", **stats, **extra}
+
+
+def participants(n: int, rng: random.Random, addresses: List[str]) -> List[Dict]:
+    """Half the group by address (served by the geocoder fixtures), half by coordinates"""
+    group = []
+    for i in range(n):
+        if i % 2 and addresses:
+            group.append({"name": f"P{i}", "address": addresses[(i // 2) % len(addresses)]})
+        else:
+            group.append({
+                "name": f"P{i}",
+                "latitude": round(rng.uniform(51.45, 51.58), 6),
+                "longitude": round(rng.uniform(-0.25, 0.0), 6)
+            })
+    return group
+
+
+def clear_caches(tfl_service, geocoding_service, meeting_calculator, journeys: bool = True):
+    meeting_calculator.result_cache.clear()
+    if journeys:
+        tfl_service._cache.clear()
+        geocoding_service._cache.clear()
+
+
+def bench_scoring(meeting_calculator, scale: float) -> List[Dict]:
+    rng = random.Random(42)
+    results = []
+    for n in SCORING_PARTICIPANTS:
+        points = [(rng.uniform(51.38, 51.65), rng.uniform(-0.45, 0.20)) for _ in range(n)]
+        stats = measure(
+            lambda: meeting_calculator._top_candidates(points), max(20, int(500 * scale))
+        )
+        results.append(result("scoring", {"participants": n}, stats))
+    return results
+
+
+async def bench_parsing(scale: float) -> List[Dict]:
+    from app.services.tfl_service import TfLService
+
+    results = []
+    for name in fixture_names():
+        tfl_service = TfLService()
+        install_tfl(tfl_service, TfLFixtures([name]))
+        journey = (51.5432, -0.0061, 51.5308, -0.1238, "Origin", "Station")
+
+        stats = await measure_async(
+            lambda: tfl_service.get_journey_details(*journey),
+            max(10, int(100 * scale)),
+            setup=tfl_service._cache.clear
+        )
+        await tfl_service.close()
+        results.append(result(
+            "parsing", {"fixture": name}, stats, payload_bytes=len(load_fixture(name))
+        ))
+    return results
+
+
+def bench_serialization(scale: float) -> List[Dict]:
+    response = sample_response(settings.path_simplify_tolerance_metres)
+    results = []
+    for detail, path_format, leg_fields in SHAPES:
+        def render():
+            shaped = encode_paths(response) if path_format == "polyline" else response
+            return serialize_response(shaped, detail, leg_fields)
+
+        params = {"detail": detail, "path_format": path_format, "leg_fields": len(leg_fields or [])}
+        stats = measure(render, max(10, int(200 * scale)))
+        results.append(result("serialization", params, stats, response_bytes=len(render())))
+    return results
+
+
+async def bench_calculate(scale: float) -> List[Dict]:
+    from app.main import app
+    from app.api.endpoints.meeting_points import tfl_service, geocoding_service, meeting_calculator
+
+    fixtures = install(tfl_service, geocoding_service)
+    addresses = FixtureGeocoder().addresses()
+    rng = random.Random(7)
+    results = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for n in CALCULATE_PARTICIPANTS:
+            body = {"locations": participants(n, rng, addresses)}
+
+            async def calculate():
+                response = await client.post("/api/meeting-points/calculate", json=body)
+                response.raise_for_status()
+
+            for mode, journeys, iterations in (
+                ("cold", True, max(5, int(30 * scale))),
+                ("journeys_cached", False, max(5, int(50 * scale))),
+                ("result_cached", None, max(20, int(300 * scale)))
+            ):
+                setup = None
+                if journeys is not None:
+                    setup = functools.partial(
+                        clear_caches, tfl_service, geocoding_service, meeting_calculator, journeys
+                    )
+                stats = await measure_async(calculate, iterations, setup)
+                if setup:
+                    setup()
+                requests_before = fixtures.requests
+                await calculate()
+                upstream = fixtures.requests - requests_before
+                results.append(result(
+                    "calculate", {"participants": n, "cache": mode}, stats,
+                    upstream_calls_per_request=upstream
+                ))
+    return results
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "app_version": settings.app_version,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "pydantic": pydantic.VERSION,
+        "json_backend": JSON_BACKEND
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> bool:
+    """Print median ratios against a baseline run; False if any exceeds the threshold"""
+    previous = {entry["name"]: entry for entry in baseline["results"]}
+    ok = True
+    print()
+    commit = baseline['environment'].get('git_commit') or 'baseline'
+    print(f"Against {commit} (fail above {threshold:.2f}x)")
+    print(f"{'benchmark':<66} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for entry in results:
+        before = previous.get(entry["name"])
+        if before is None:
+            print(f"{entry['name']:<66} {'-':>10} {entry['median'] * 1000:>10.3f} {'new':>7}")
+            continue
+        ratio = entry["median"] / before["median"]
+        flag = ""
+        if ratio > threshold:
+            ok = False
+            flag = "  REGRESSED"
+        print(
+            f"{entry['name']:<66} {before['median'] * 1000:>10.3f} {entry['median'] * 1000:>10.3f}"
+            f" {ratio:>6.2f}x{flag}"
+        )
+    return ok
+
+
+async def run(scale: float) -> List[Dict]:
+    from app.api.endpoints.meeting_points import meeting_calculator
+
+    results = bench_scoring(meeting_calculator, scale)
+    results += await bench_parsing(scale)
+    results += bench_serialization(scale)
+    results += await bench_calculate(scale)
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowest acceptable median ratio against the baseline")
+    parser.add_argument("--quick", action="store_true", help="a tenth of the iterations")
+    args = parser.parse_args(argv)
+
+    # Per-request INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    results = asyncio.run(run(0.1 if args.quick else 1.0))
+
+    print(f"{'benchmark':<66} {'median ms':>10} {'p95 ms':>9} {'min ms':>9} {'n':>5}")
+    for entry in results:
+        print(
+            f"{entry['name']:<66} {entry['median'] * 1000:>10.3f} {entry['p95'] * 1000:>9.3f}"
+            f" {entry['min'] * 1000:>9.3f} {entry['iterations']:>5}"
+        )
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "quick": args.quick,
+        "environment": environment(),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            if not compare(results, json.load(baseline), args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+TfL JourneyResults fixtures for offline benchmarks.
+
+The fixtures under benchmarks/fixtures/tfl/ are complete JourneyResults
+documents in the shape the live API returns: several alternative journeys,
+each leg carrying departure/arrival points, routeOptions, turn-by-turn
+instruction steps, fares and a dense ``path.lineString``, plus the top-level
+line statuses and search criteria. Rail geometry follows the bundled line
+sequences, densified to roughly one vertex every 15 m as TfL's paths are.
+
+Regenerate them from the backend directory with:
+    python -m benchmarks.tfl_fixtures
+"""
+
+import json
+import math
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from app.core.constants import LINES_FILE, LONDON_STATIONS
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "tfl"
+
+# Spacing of vertices in the generated lineStrings, in metres
+VERTEX_SPACING_METRES = 15.0
+METRES_PER_DEGREE_LAT = 111320.0
+
+# name -> (origin, destination, alternative routes). Each route is a list of
+# ("walking", from, to) or (mode, line, [stations...]) segments, where a
+# from/to is a station name or a (lat, lon) point.
+ROUTES = {
+    "stratford_to_kings_cross": (
+        (51.5432, -0.0061),
+        (51.5308, -0.1238),
+        [
+            [
+                ("walking", (51.5432, -0.0061), "Stratford"),
+                ("overground", "Mildmay", [
+                    "Stratford", "Hackney Wick", "Homerton", "Hackney Central",
+                    "Dalston Kingsland", "Canonbury", "Highbury & Islington"
+                ]),
+                ("tube", "Victoria", ["Highbury & Islington", "King's Cross St. Pancras"]),
+                ("walking", "King's Cross St. Pancras", (51.5308, -0.1238))
+            ],
+            [
+                ("walking", (51.5432, -0.0061), "Stratford"),
+                ("tube", "Central", ["Stratford", "Mile End", "Bethnal Green", "Liverpool Street"]),
+                ("tube", "Circle", ["Liverpool Street", "Moorgate", "Barbican", "Farringdon",
+                                    "King's Cross St. Pancras"]),
+                ("walking", "King's Cross St. Pancras", (51.5308, -0.1238))
+            ],
+            [
+                ("walking", (51.5432, -0.0061), "Stratford"),
+                ("elizabeth-line", "Elizabeth line", [
+                    "Stratford", "Whitechapel", "Liverpool Street", "Farringdon"
+                ]),
+                ("walking", "Farringdon", (51.5308, -0.1238))
+            ]
+        ]
+    ),
+    "hammersmith_to_canary_wharf": (
+        (51.4927, -0.2248),
+        (51.5054, -0.0235),
+        [
+            [
+                ("walking", (51.4927, -0.2248), "Hammersmith"),
+                ("tube", "District", [
+                    "Hammersmith", "Barons Court", "West Kensington", "Earl's Court",
+                    "Gloucester Road", "South Kensington", "Sloane Square", "Victoria",
+                    "St. James's Park", "Westminster"
+                ]),
+                ("tube", "Jubilee", ["Westminster", "Waterloo", "Southwark", "London Bridge",
+                                     "Bermondsey", "Canada Water", "Canary Wharf"]),
+                ("walking", "Canary Wharf", (51.5054, -0.0235))
+            ],
+            [
+                ("walking", (51.4927, -0.2248), "Hammersmith"),
+                ("tube", "Piccadilly", [
+                    "Hammersmith", "Barons Court", "Earl's Court", "Gloucester Road",
+                    "South Kensington", "Knightsbridge", "Hyde Park Corner", "Green Park"
+                ]),
+                ("tube", "Jubilee", [
+                    "Green Park", "Westminster", "Waterloo", "Southwark", "London Bridge",
+                    "Bermondsey", "Canada Water", "Canary Wharf"
+                ]),
+                ("walking", "Canary Wharf", (51.5054, -0.0235))
+            ],
+            [
+                ("walking", (51.4927, -0.2248), "Hammersmith"),
+                ("tube", "Hammersmith & City", [
+                    "Hammersmith", "Goldhawk Road", "Shepherd's Bush Market", "Wood Lane",
+                    "Latimer Road", "Ladbroke Grove", "Westbourne Park", "Royal Oak", "Paddington"
+                ]),
+                ("elizabeth-line", "Elizabeth line", [
+                    "Paddington", "Bond Street", "Tottenham Court Road", "Farringdon",
+                    "Liverpool Street", "Whitechapel", "Canary Wharf"
+                ]),
+                ("walking", "Canary Wharf", (51.5054, -0.0235))
+            ],
+            [
+                ("walking", (51.4927, -0.2248), "Hammersmith"),
+                ("tube", "District", [
+                    "Hammersmith", "Barons Court", "West Kensington", "Earl's Court",
+                    "Gloucester Road", "South Kensington", "Sloane Square", "Victoria",
+                    "St. James's Park", "Westminster", "Embankment", "Temple", "Blackfriars",
+                    "Mansion House", "Cannon Street", "Monument", "Tower Hill"
+                ]),
+                ("walking", "Tower Hill", "Tower Gateway"),
+                ("dlr", "DLR", [
+                    "Tower Gateway", "Shadwell", "Limehouse", "Westferry", "West India Quay",
+                    "Canary Wharf"
+                ]),
+                ("walking", "Canary Wharf", (51.5054, -0.0235))
+            ]
+        ]
+    ),
+    "camden_to_oxford_circus": (
+        (51.5390, -0.1426),
+        (51.5152, -0.1418),
+        [
+            [
+                ("walking", (51.5390, -0.1426), "Camden Town"),
+                ("tube", "Northern", [
+                    "Camden Town", "Mornington Crescent", "Euston", "Warren Street"
+                ]),
+                ("tube", "Victoria", ["Warren Street", "Oxford Circus"]),
+                ("walking", "Oxford Circus", (51.5152, -0.1418))
+            ],
+            [
+                ("walking", (51.5390, -0.1426), "Camden Town"),
+                ("tube", "Northern", [
+                    "Camden Town", "Mornington Crescent", "Euston", "Warren Street",
+                    "Goodge Street", "Tottenham Court Road"
+                ]),
+                ("walking", "Tottenham Court Road", (51.5152, -0.1418))
+            ],
+            [
+                ("walking", (51.5390, -0.1426), (51.5152, -0.1418))
+            ]
+        ]
+    )
+}
+
+LINE_STATUSES = ["Good Service", "Minor Delays", "Part Closure", "Severe Delays"]
+
+
+def _type(name: str) -> str:
+    """TfL's $type tag for one of its presentation entities"""
+    return f"Tfl.Api.Presentation.Entities.{name}, Tfl.Api.Presentation.Entities"
+
+
+def _coords(point) -> Tuple[float, float]:
+    if isinstance(point, str):
+        return LONDON_STATIONS[point]
+    return point
+
+
+def _metres(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    dlat = (b[0] - a[0]) * METRES_PER_DEGREE_LAT
+    dlon = (b[1] - a[1]) * METRES_PER_DEGREE_LAT * math.cos(math.radians(a[0]))
+    return math.hypot(dlat, dlon)
+
+
+def _densify(points: Sequence[Tuple[float, float]], rng: random.Random) -> List[List[float]]:
+    """Interpolate vertices every VERTEX_SPACING_METRES along a gently curving path"""
+    vertices = [list(points[0])]
+    for a, b in zip(points, points[1:]):
+        steps = max(2, int(_metres(a, b) / VERTEX_SPACING_METRES))
+        bend = rng.uniform(-0.0015, 0.0015)
+        for step in range(1, steps + 1):
+            t = step / steps
+            offset = bend * math.sin(math.pi * t)
+            vertices.append([
+                round(a[0] + (b[0] - a[0]) * t + offset * (b[1] - a[1]) * 10, 11),
+                round(a[1] + (b[1] - a[1]) * t - offset * (b[0] - a[0]) * 10, 11)
+            ])
+    return vertices
+
+
+def _point(name: str, coords: Tuple[float, float], rng: random.Random) -> Dict:
+    naptan = f"940GZZLU{rng.randrange(100, 999)}"
+    return {
+        "$type": _type("StopPoint"),
+        "naptanId": naptan,
+        "platformName": "",
+        "icsCode": str(rng.randrange(1000000, 1009999)),
+        "individualStopId": f"{naptan}1",
+        "commonName": name,
+        "placeType": "StopPoint",
+        "additionalProperties": [],
+        "lat": coords[0],
+        "lon": coords[1]
+    }
+
+
+def _identifier(name: str, kind: str) -> Dict:
+    return {
+        "$type": _type("Identifier"),
+        "id": name.lower().replace(" ", "-"),
+        "name": name,
+        "type": kind,
+        "routeType": "Unknown",
+        "status": "Unknown"
+    }
+
+
+def _walking_steps(vertices: List[List[float]], rng: random.Random) -> List[Dict]:
+    streets = [
+        "High Street", "Station Road", "Church Lane", "Mill Road", "Park Avenue", "Queen's Walk"
+    ]
+    steps = []
+    for i in range(0, len(vertices) - 1, max(1, len(vertices) // 6)):
+        street = rng.choice(streets)
+        steps.append({
+            "$type": _type("InstructionStep"),
+            "description": f"{street} for {rng.randrange(20, 400)} metres",
+            "turnDirection": rng.choice(["STRAIGHT", "LEFT", "RIGHT", "SLIGHT_LEFT"]),
+            "streetName": street,
+            "distance": rng.randrange(20, 400),
+            "cumulativeDistance": rng.randrange(20, 1500),
+            "skyDirection": rng.randrange(0, 360),
+            "skyDirectionDescription": rng.choice(["North", "East", "South", "West"]),
+            "cumulativeTravelTime": rng.randrange(10, 900),
+            "latitude": vertices[i][0],
+            "longitude": vertices[i][1],
+            "pathAttribute": {"$type": _type("PathAttribute")},
+            "descriptionHeading": rng.choice(
+                ["Continue along ", "Turn left on to ", "Turn right on to "]
+            ),
+            "trackType": "None"
+        })
+    return steps
+
+
+def _leg(segment, departure_minute: int, rng: random.Random) -> Tuple[Dict, int]:
+    mode = segment[0]
+    if mode == "walking":
+        start, end = _coords(segment[1]), _coords(segment[2])
+        names = [segment[1] if isinstance(segment[1], str) else "Start",
+                 segment[2] if isinstance(segment[2], str) else "Destination"]
+        vertices = _densify([start, end], rng)
+        distance = _metres(start, end) * 1.25
+        duration = max(1, round(distance / 80))
+        line = None
+        stations = []
+    else:
+        line, stations = segment[1], segment[2]
+        points = [LONDON_STATIONS[name] for name in stations]
+        start, end = points[0], points[-1]
+        names = [stations[0], stations[-1]]
+        vertices = _densify(points, rng)
+        distance = sum(_metres(a, b) for a, b in zip(points, points[1:]))
+        duration = max(2, round(distance / 600 + len(stations)))
+
+    leg = {
+        "$type": _type("JourneyPlanner.Leg"),
+        "duration": duration,
+        "instruction": {
+            "$type": _type("Instruction"),
+            "summary": (f"Walk to {names[1]}" if mode == "walking"
+                        else f"{line} line to {names[1]}"),
+            "detailed": (f"Walk to {names[1]}" if mode == "walking"
+                         else f"{line} line towards {names[1]}"),
+            "steps": _walking_steps(vertices, rng) if mode == "walking" else []
+        },
+        "obstacles": [],
+        "departureTime": f"2026-10-16T18:{departure_minute % 60:02d}:00",
+        "arrivalTime": f"2026-10-16T18:{(departure_minute + duration) % 60:02d}:00",
+        "departurePoint": _point(names[0], start, rng),
+        "arrivalPoint": _point(names[1], end, rng),
+        "path": {
+            "$type": _type("JourneyPlanner.Path"),
+            "lineString": json.dumps(vertices, separators=(",", ":")),
+            "stopPoints": [_identifier(name, "StopPoint") for name in stations[1:]],
+            "elevation": []
+        },
+        "routeOptions": [] if mode == "walking" else [{
+            "$type": _type("JourneyPlanner.RouteOption"),
+            "name": line,
+            "directions": [f"{names[1]} Underground Station"],
+            "lineIdentifier": _identifier(line, "Line"),
+            "direction": names[1]
+        }],
+        "mode": _identifier(mode, "Mode"),
+        "disruptions": [],
+        "plannedWorks": [],
+        "distance": float(round(distance)),
+        "isDisrupted": False,
+        "hasFixedLocations": mode != "walking",
+        "scheduledDepartureTime": f"2026-10-16T18:{departure_minute % 60:02d}:00",
+        "scheduledArrivalTime": f"2026-10-16T18:{(departure_minute + duration) % 60:02d}:00",
+        "interChangeDuration": "",
+        "interChangePosition": ""
+    }
+    return leg, duration
+
+
+def _journey(route, rng: random.Random) -> Dict:
+    legs = []
+    minute = 0
+    for segment in route:
+        leg, duration = _leg(segment, minute, rng)
+        legs.append(leg)
+        minute += duration
+    return {
+        "$type": _type("JourneyPlanner.Journey"),
+        "startDateTime": "2026-10-16T18:00:00",
+        "duration": minute,
+        "arrivalDateTime": f"2026-10-16T{18 + minute // 60:02d}:{minute % 60:02d}:00",
+        "description": " , ".join(leg["instruction"]["summary"] for leg in legs),
+        "alternativeRoute": False,
+        "legs": legs,
+        "fare": {
+            "$type": _type("JourneyPlanner.JourneyFare"),
+            "totalCost": rng.choice([180, 290, 340]),
+            "fares": [{
+                "$type": _type("JourneyPlanner.Fare"),
+                "lowZone": 1,
+                "highZone": rng.randrange(1, 4),
+                "cost": 290,
+                "chargeProfileName": "Peak",
+                "isHopperFare": False,
+                "chargeLevel": "Peak",
+                "peak": 290,
+                "offPeak": 280,
+                "taps": [{
+                    "$type": _type("JourneyPlanner.FareTap"),
+                    "atcoCode": leg["departurePoint"]["naptanId"],
+                    "tapDetails": {
+                        "$type": _type("JourneyPlanner.FareTapDetails"),
+                        "modeType": "Metro",
+                        "validationType": "EntryExit",
+                        "hostDeviceType": "Rail",
+                        "nationalLocationCode": rng.randrange(500, 800),
+                        "tapTimestamp": leg["departureTime"]
+                    }
+                } for leg in legs if leg["mode"]["id"] != "walking"]
+            }],
+            "caveats": [{
+                "$type": _type("JourneyPlanner.FareCaveat"),
+                "text": "Prices shown are for adults paying with contactless or Oyster.",
+                "type": "FareCaveat"
+            }]
+        }
+    }
+
+
+def _line_status(line: Dict, rng: random.Random) -> Dict:
+    status = rng.choice(LINE_STATUSES)
+    return {
+        "$type": _type("Line"),
+        "id": line["name"].lower().replace(" ", "-"),
+        "name": line["name"],
+        "modeName": line["mode"],
+        "disruptions": [],
+        "created": "2026-10-01T12:00:00Z",
+        "modified": "2026-10-01T12:00:00Z",
+        "lineStatuses": [{
+            "$type": _type("LineStatus"),
+            "id": 0,
+            "statusSeverity": LINE_STATUSES.index(status) * 3 + 4,
+            "statusSeverityDescription": status,
+            "reason": "" if status == "Good Service" else (
+                f"{line['name']}: {status.lower()} due to an earlier signal failure. "
+                "Tickets will be accepted on London Buses and other reasonable routes."
+            ),
+            "created": "0001-01-01T00:00:00",
+            "validityPeriods": [],
+            "disruption": None
+        }],
+        "routeSections": [],
+        "serviceTypes": [
+            {"$type": _type("LineServiceTypeInfo"),
+             "name": "Regular", "uri": "/Line/Route?ids=" + line["name"] + "&serviceTypes=Regular"}
+        ],
+        "crowding": {"$type": _type("Crowding")}
+    }
+
+
+def journey_results(name: str, seed: int = 0) -> Dict:
+    """A synthetic JourneyResults document for one of ROUTES"""
+    origin, destination, routes = ROUTES[name]
+    rng = random.Random(f"{name}:{seed}")
+    with open(LINES_FILE, encoding="utf-8") as f:
+        lines = json.load(f)["lines"]
+    return {
+        "$type": _type("JourneyPlanner.ItineraryResult"),
+        "journeys": [_journey(route, rng) for route in routes],
+        "lines": [_line_status(line, rng) for line in lines],
+        "cycleHireDockingStationData": {
+            "$type": _type("JourneyPlanner.JourneyPlannerCycleHireDockingStationData"),
+            "originNumberOfBikes": 0,
+            "destinationNumberOfBikes": 0,
+            "originNumberOfEmptySlots": 0,
+            "destinationNumberOfEmptySlots": 0
+        },
+        "stopMessages": [],
+        "recommendedMaxAgeMinutes": 1,
+        "searchCriteria": {
+            "$type": _type("JourneyPlanner.SearchCriteria"),
+            "dateTime": "2026-10-16T18:00:00",
+            "dateTimeType": "Departing",
+            "timeAdjustments": {}
+        },
+        "journeyVector": {
+            "$type": _type("JourneyPlanner.JourneyVector"),
+            "from": f"{origin[0]},{origin[1]}",
+            "to": f"{destination[0]},{destination[1]}",
+            "via": "",
+            "uri": (
+                f"/journey/journeyresults/{origin[0]},{origin[1]}"
+                f"/to/{destination[0]},{destination[1]}"
+            )
+        }
+    }
+
+
+def fixture_names() -> List[str]:
+    return sorted(path.stem for path in FIXTURES_DIR.glob("*.json"))
+
+
+def load_fixture(name: str) -> bytes:
+    """Raw response body of a fixture, exactly as it would come off the wire"""
+    return (FIXTURES_DIR / f"{name}.json").read_bytes()
+
+
+def main():
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    for name in ROUTES:
+        path = FIXTURES_DIR / f"{name}.json"
+        body = json.dumps(journey_results(name), separators=(",", ":"))
+        path.write_text(body, encoding="utf-8")
+        print(f"{path.name}: {len(body) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
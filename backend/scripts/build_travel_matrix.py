@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Offline build of the station-to-station travel-time matrix.
+
+Routes every station pair over the bundled line sequences (app/data/lines.json)
+and writes app/data/travel_matrix.npy plus its JSON sidecar. Re-run whenever
+stations.json or lines.json change.
+
+Run from the backend directory:
+    python -m scripts.build_travel_matrix [output.npy]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.constants import TRAVEL_MATRIX_FILE
+from app.services.station_graph import StationGraph
+from app.services.travel_matrix import build_travel_matrix, save_travel_matrix
+
+
+def main():
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else TRAVEL_MATRIX_FILE
+
+    start = time.perf_counter()
+    graph = StationGraph.from_bundled_data()
+    seconds = build_travel_matrix(graph)
+    elapsed = time.perf_counter() - start
+
+    unreachable = int(np.count_nonzero(seconds == np.iinfo(np.uint16).max))
+    if unreachable:
+        print(f"WARNING: {unreachable} station pairs are unreachable")
+
+    save_travel_matrix(seconds, graph.names, output)
+    print(f"Built {len(graph)}x{len(graph)} matrix in {elapsed:.1f}s")
+    print(f"Median journey {np.median(seconds) / 60:.1f} min, longest {seconds.max() / 60:.1f} min")
+    print(f"Wrote {output} ({output.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
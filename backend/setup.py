@@ -4,6 +4,7 @@ setup(
     name="where2meet-backend",
     version="0.1.0",
     packages=find_packages(),
+    package_data={"app": ["data/*.json", "data/*.npy"]},
     python_requires=">=3.11",
     install_requires=[
         "fastapi==0.104.1",
@@ -18,5 +19,9 @@ setup(
         "folium==0.15.0",
         "supabase==2.0.2",
         "python-multipart==0.0.6",
-    ]
+    ],
+    extras_require={
+        # Faster TfL response decoding, HTTP/2 to TfL and brotli responses; all have fallbacks
+        "fast": ["orjson==3.9.10", "brotli==1.1.0", "h2==4.1.0"],
+    }
 )
\ No newline at end of file
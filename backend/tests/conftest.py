@@ -0,0 +1,16 @@
+import pytest
+
+from app.services.geocoding_service import GeocodingService
+from app.services.meeting_calculator import MeetingCalculator
+from app.services.result_cache import ResultCache
+from app.services.tfl_service import TfLService
+from benchmarks.offline import install
+
+
+@pytest.fixture
+def calculator():
+    """A MeetingCalculator whose TfL and Nominatim calls are answered from the benchmark fixtures"""
+    tfl_service = TfLService()
+    geocoding_service = GeocodingService()
+    install(tfl_service, geocoding_service)
+    return MeetingCalculator(tfl_service, geocoding_service, result_cache=ResultCache())
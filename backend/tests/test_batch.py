@@ -0,0 +1,113 @@
+import pytest
+
+from app.schemas import BatchSummary, MeetingPointRequest
+
+ALICE = {"name": "Alice", "latitude": 51.4965, "longitude": -0.1447}
+BOB = {"name": "Bob", "latitude": 51.5308, "longitude": -0.1238}
+CAROL = {"name": "Carol", "latitude": 51.5033, "longitude": -0.0195}
+
+
+async def run_batch(calculator, bodies):
+    items = [item async for item in calculator.find_meeting_points_batch(
+        [MeetingPointRequest(**body) for body in bodies]
+    )]
+    summary = items.pop()
+    assert isinstance(summary, BatchSummary)
+    return {item.index: item for item in items}, summary
+
+
+def assert_every_item_answered(items, summary, count):
+    assert sorted(items) == list(range(count))
+    assert all((item.result is None) != (item.error is None) for item in items.values())
+    assert summary.succeeded + summary.failed == summary.requests == count
+
+
+@pytest.mark.asyncio
+async def test_batch_answers_pooled_and_standalone_requests(calculator):
+    bodies = [
+        {"locations": [ALICE, BOB]},
+        {"locations": [BOB, CAROL]},
+        {"locations": [ALICE, CAROL], "strategy": "greedy"},
+        {"locations": [ALICE, {"name": "Nobody"}]}
+    ]
+    items, summary = await run_batch(calculator, bodies)
+
+    assert_every_item_answered(items, summary, 4)
+    assert items[3].error and summary.failed == 1
+    assert summary.unique_journeys <= summary.journeys_requested
+
+
+@pytest.mark.asyncio
+async def test_failing_geocode_only_fails_its_own_request(calculator, monkeypatch):
+    process_locations = calculator.process_locations
+
+    async def flaky(locations):
+        if any(loc.name == "Broken" for loc in locations):
+            raise RuntimeError("geocoder down")
+        return await process_locations(locations)
+
+    monkeypatch.setattr(calculator, "process_locations", flaky)
+    broken = {**CAROL, "name": "Broken"}
+    items, summary = await run_batch(
+        calculator, [{"locations": [ALICE, BOB]}, {"locations": [ALICE, broken]}]
+    )
+
+    assert_every_item_answered(items, summary, 2)
+    assert items[0].result is not None
+    assert "geocoder down" in items[1].error
+
+
+@pytest.mark.asyncio
+async def test_failing_journey_fetch_fails_only_requests_waiting_on_it(calculator, monkeypatch):
+    get_journey_details = calculator.tfl_service.get_journey_details
+
+    async def flaky(from_lat, from_lon, *args, **kwargs):
+        if from_lat == CAROL["latitude"]:
+            raise RuntimeError("connection reset")
+        return await get_journey_details(from_lat, from_lon, *args, **kwargs)
+
+    monkeypatch.setattr(calculator.tfl_service, "get_journey_details", flaky)
+    items, summary = await run_batch(
+        calculator, [{"locations": [ALICE, BOB]}, {"locations": [BOB, CAROL]}]
+    )
+
+    assert_every_item_answered(items, summary, 2)
+    assert items[0].result is not None
+    assert "connection reset" in items[1].error
+
+
+@pytest.mark.asyncio
+async def test_request_without_candidates_is_answered(calculator, monkeypatch):
+    monkeypatch.setattr(calculator, "_top_candidates", lambda points, max_api_calls=None: [])
+    items, summary = await run_batch(calculator, [{"locations": [ALICE, BOB]}])
+
+    assert_every_item_answered(items, summary, 1)
+    assert items[0].error
+
+
+@pytest.mark.asyncio
+async def test_budget_below_one_call_per_participant_is_an_item(calculator):
+    items, summary = await run_batch(calculator, [
+        {"locations": [ALICE, BOB, CAROL], "max_api_calls": 2},
+        {"locations": [ALICE, BOB, CAROL], "max_api_calls": 3}
+    ])
+
+    assert_every_item_answered(items, summary, 2)
+    assert "max_api_calls" in items[0].error
+    assert items[1].result.search_stats.api_calls <= 3
+
+
+@pytest.mark.asyncio
+async def test_unexpected_error_in_standalone_request_is_an_item(calculator, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(calculator, "find_meeting_point", broken)
+    items, summary = await run_batch(
+        calculator,
+        [{"locations": [ALICE, BOB], "strategy": "greedy"}, {"locations": [ALICE, CAROL]}]
+    )
+
+    assert_every_item_answered(items, summary, 2)
+    assert "boom" in items[0].error
+    assert items[1].result is not None
@@ -0,0 +1,84 @@
+from app.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_value_until_it_expires():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, max_entries=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    assert "a" in cache
+
+    clock.now += 0.1
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_per_entry_ttl_overrides_default():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, max_entries=10, clock=clock)
+    cache.set("short", 1, ttl_seconds=1)
+    cache.set("long", 2)
+
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_and_rejects_oversized_values():
+    cache = TTLCache(ttl_seconds=60, max_entries=100, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "yyyy")
+    cache.set("c", "zzzz")
+
+    assert cache.get("a") is None
+    assert cache.current_bytes == 8
+
+    cache.set("huge", "x" * 11)
+    assert cache.get("huge") is None
+    assert cache.current_bytes == 8
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = TTLCache(ttl_seconds=60, max_entries=10, max_bytes=100, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("a", "xx")
+
+    assert len(cache) == 1
+    assert cache.current_bytes == 2
+    cache.delete("a")
+    assert cache.current_bytes == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
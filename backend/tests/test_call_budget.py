@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.core.constants import LONDON_STATIONS
+from app.schemas import LocationInput
+from app.services.travel_matrix import TravelMatrix
+
+GROUP = [
+    LocationInput(name="Alice", latitude=51.4965, longitude=-0.1447),
+    LocationInput(name="Bob", latitude=51.5308, longitude=-0.1238),
+    LocationInput(name="Carol", latitude=51.5033, longitude=-0.0195)
+]
+
+
+@pytest.mark.asyncio
+async def test_budget_below_one_call_per_participant_is_rejected(calculator):
+    with pytest.raises(ValueError, match="max_api_calls"):
+        await calculator.find_meeting_point(GROUP, max_api_calls=2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("budget", [3, 5, 12])
+async def test_calls_made_stay_within_the_budget(calculator, budget):
+    response = await calculator.find_meeting_point(GROUP, max_api_calls=budget)
+    assert 0 < response.search_stats.api_calls <= budget
+
+
+@pytest.mark.asyncio
+async def test_budget_does_not_constrain_other_strategies(calculator):
+    response = await calculator.find_meeting_point(GROUP, strategy="greedy", max_api_calls=2)
+    assert response.optimal_station is not None
+
+    events = [event async for event, _ in calculator.stream_meeting_point(
+        GROUP, strategy="greedy", max_api_calls=2
+    )]
+    assert events[0] == "estimate" and events[-1] == "result"
+
+
+@pytest.mark.asyncio
+async def test_budget_only_limits_the_tfl_fan_out(calculator):
+    names = list(LONDON_STATIONS)[:12]
+    seconds = np.full((len(names), len(names)), 600, dtype=np.uint16)
+    np.fill_diagonal(seconds, 0)
+    calculator.travel_matrix = TravelMatrix(seconds, names)
+
+    for options in ({"use_travel_matrix": True}, {"use_tfl_api": False}):
+        response = await calculator.find_meeting_point(GROUP, max_api_calls=2, **options)
+        assert response.search_stats.api_calls == 0
+
+        events = [event async for event in calculator.stream_meeting_point(
+            GROUP, max_api_calls=2, **options
+        )]
+        assert [name for name, _ in events] == ["estimate", "result"]
+        streamed = events[-1][1].optimal_station.station_name
+        assert streamed == response.optimal_station.station_name
@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+from app.core.constants import LONDON_STATIONS
+from app.services.candidate_scorer import CandidateScorer
+
+
+def random_london_points(n, rng):
+    return [(rng.uniform(51.38, 51.65), rng.uniform(-0.45, 0.20)) for _ in range(n)]
+
+
+def geodesic_top_candidates(points, k):
+    """The original per-pair geodesic ranking: max distance, then average"""
+    candidates = []
+    for name, coords in LONDON_STATIONS.items():
+        distances = [geodesic(point, coords).km for point in points]
+        candidates.append((max(distances), sum(distances) / len(distances), name))
+    candidates.sort()
+    return [name for _, _, name in candidates[:k]]
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return CandidateScorer(LONDON_STATIONS)
+
+
+def test_distances_match_geodesic_within_a_metre(scorer):
+    points = random_london_points(10, random.Random(1)) + [(51.5074, -0.1278)]
+    matrix = scorer.distance_matrix(points)
+
+    assert matrix.shape == (len(points), len(LONDON_STATIONS))
+    for i, point in enumerate(points):
+        for j, name in enumerate(scorer.names):
+            expected = geodesic(point, LONDON_STATIONS[name]).km
+            assert abs(matrix[i, j] - expected) * 1000 < 1.0, (point, name)
+
+
+@pytest.mark.parametrize("participants", [2, 3, 5, 10])
+def test_ranking_matches_geodesic_ranking(scorer, participants):
+    rng = random.Random(participants)
+    for _ in range(5):
+        points = random_london_points(participants, rng)
+        ranked = scorer.top_candidates(points, 7)
+        assert [candidate['name'] for candidate in ranked] == geodesic_top_candidates(points, 7)
+
+
+def test_top_candidates_restricted_to_station_ids(scorer):
+    points = [(51.5074, -0.1278), (51.5308, -0.1238)]
+    station_ids = np.arange(0, len(scorer), 3)
+    ranked = scorer.top_candidates(points, 5, station_ids=station_ids)
+
+    allowed = {scorer.names[i] for i in station_ids}
+    assert len(ranked) == 5
+    assert all(candidate['name'] in allowed for candidate in ranked)
+    keys = [(candidate['max_distance'], candidate['avg_distance']) for candidate in ranked]
+    assert keys == sorted(keys)
+
+
+def test_top_candidates_with_minutes_function(scorer):
+    points = [(51.5074, -0.1278), (51.5308, -0.1238)]
+
+    def minutes(pts, coords):
+        return np.full((len(pts), len(coords)), 20.0)
+
+    ranked = scorer.top_candidates(points, 3, minutes=minutes)
+    assert len(ranked) == 3
+    assert ranked[0]['max_minutes'] == 20.0 and ranked[0]['avg_minutes'] == 20.0
+
+
+def test_nearest_ids_match_full_ranking(scorer):
+    points = random_london_points(4, random.Random(7))
+    ids = scorer.nearest_ids(points, 10)
+
+    assert [scorer.names[i] for i in ids] == [c['name'] for c in scorer.top_candidates(points, 10)]
+    assert len(scorer.nearest_ids(points, len(scorer) + 5)) == len(scorer)
@@ -0,0 +1,58 @@
+import pytest
+
+from app.services.gazetteer import Gazetteer, normalize_place
+
+PLACES = [
+    {
+        "name": "King's Cross St. Pancras", "kind": "station",
+        "latitude": 51.5308, "longitude": -0.1238
+    },
+    {"name": "Kingston", "kind": "area", "latitude": 51.4123, "longitude": -0.3007},
+    {"name": "Victoria", "kind": "station", "latitude": 51.4965, "longitude": -0.1447},
+    {"name": "Victoria Park", "kind": "area", "latitude": 51.5362, "longitude": -0.0388},
+    {
+        "name": "Big Ben", "kind": "landmark", "latitude": 51.5007, "longitude": -0.1246,
+        "aliases": ["Elizabeth Tower"]
+    },
+    {"name": "Victoria", "kind": "area", "latitude": 51.4970, "longitude": -0.1400}
+]
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer(PLACES)
+
+
+def test_normalize_place():
+    assert normalize_place("King's Cross St. Pancras") == "kings cross st pancras"
+    assert normalize_place("  Elephant & Castle ") == "elephant and castle"
+
+
+def test_complete_prefers_stations_and_name_starts(gazetteer):
+    names = [p["name"] for p in gazetteer.complete("king")]
+    assert names == ["King's Cross St. Pancras", "Kingston"]
+    assert [p["name"] for p in gazetteer.complete("vic")] == ["Victoria", "Victoria Park"]
+    # Later words and aliases match too
+    assert [p["name"] for p in gazetteer.complete("pancras")] == ["King's Cross St. Pancras"]
+    assert [p["name"] for p in gazetteer.complete("elizabeth t")] == ["Big Ben"]
+
+
+def test_complete_limits_and_misses(gazetteer):
+    assert len(gazetteer.complete("vic", limit=1)) == 1
+    assert gazetteer.complete("zzz") == []
+    assert gazetteer.complete("   ") == []
+
+
+def test_lookup_ignores_location_and_station_qualifiers(gazetteer):
+    assert gazetteer.lookup("Victoria Station, London") == (51.4965, -0.1447)
+    assert gazetteer.lookup("kings cross st pancras") == (51.5308, -0.1238)
+    assert gazetteer.lookup("Elizabeth Tower, UK") == (51.5007, -0.1246)
+    assert gazetteer.lookup("Victoria Coach Station") is None
+    assert gazetteer.stats()["misses"] == 1
+
+
+def test_bundled_data_resolves_common_queries():
+    gazetteer = Gazetteer.from_bundled_data()
+
+    assert gazetteer.lookup("Oxford Circus") is not None
+    assert gazetteer.complete("oxford c")[0]["name"] == "Oxford Circus"
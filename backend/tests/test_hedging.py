@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.hedging import LatencyTracker
+from app.services.rate_limiter import UpstreamScheduler
+from app.services.tfl_service import TfLService
+
+URL = "https://api.tfl.gov.uk/Journey/JourneyResults/51.5,-0.1/to/51.52,-0.12"
+
+
+def primed_tracker(seconds=0.02, **kwargs):
+    tracker = LatencyTracker(min_samples=10, min_delay=0.01, max_fraction=1.0, **kwargs)
+    for _ in range(10):
+        tracker.observe(seconds)
+    return tracker
+
+
+def test_no_threshold_until_enough_samples():
+    tracker = LatencyTracker(min_samples=3, min_delay=0.0)
+    assert tracker.quantiles() == {0.5: None, 0.9: None, 0.95: None, 0.99: None}
+    tracker.observe(0.2)
+    tracker.observe(0.4)
+    assert tracker.hedge_delay() is None
+    tracker.observe(0.3)
+    assert tracker.hedge_delay() == 0.4
+    assert tracker.quantiles((0.5,)) == {0.5: 0.3}
+
+
+def test_threshold_is_floored_and_recomputed_periodically():
+    tracker = LatencyTracker(quantile=0.5, min_samples=2, min_delay=0.1, recompute_every=3)
+    tracker.observe(0.01)
+    tracker.observe(0.02)
+    assert tracker.hedge_delay() == 0.1
+
+    for _ in range(2):
+        tracker.observe(1.0)
+    assert tracker.hedge_delay() == 0.1
+    tracker.observe(1.0)
+    assert tracker.hedge_delay() == 1.0
+
+
+def test_hedges_are_rationed():
+    tracker = LatencyTracker(max_fraction=0.5, burst=1.0)
+    tracker.hedge_delay()
+    assert not tracker.try_hedge()
+    tracker.hedge_delay()
+    assert tracker.try_hedge()
+    assert not tracker.try_hedge()
+    assert tracker.stats()["hedged"] == 1 and tracker.stats()["rationed"] == 2
+
+
+def hedging_service(handler, max_concurrency=4):
+    service = TfLService(scheduler=UpstreamScheduler(
+        max_concurrency=max_concurrency, rate_per_second=1e9, burst=1e9
+    ))
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.hedge_requests = True
+    service.latency = primed_tracker()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_slow_call_loses_to_its_hedge():
+    calls = []
+    cancelled = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(request)
+                raise
+        return httpx.Response(200, text="hedge")
+
+    service = hedging_service(handler)
+    response = await asyncio.wait_for(service._hedged_send(URL, {}, 0), 1)
+    await asyncio.sleep(0)
+
+    assert response.text == "hedge"
+    assert len(calls) == 2 and len(cancelled) == 1
+    assert service.latency.hedge_wins == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_while_the_call_is_queued_for_a_slot():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(200, text="ok")
+
+    service = hedging_service(handler, max_concurrency=1)
+    await service.scheduler.acquire()
+    send = asyncio.ensure_future(service._hedged_send(URL, {}, 0))
+    # Queued for ten times the hedge threshold behind another call
+    await asyncio.sleep(0.2)
+    service.scheduler.release()
+    response = await asyncio.wait_for(send, 1)
+
+    assert response.text == "ok"
+    assert len(calls) == 1
+    assert service.latency.hedged == 0
+    # Queue time is not TfL latency
+    assert max(service.latency.quantiles().values()) < 0.1
+    await service.close()
@@ -0,0 +1,147 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.core.constants import LONDON_STATIONS
+from app.services.candidate_scorer import ellipsoidal_distance_km
+from app.services.journey_estimator import (
+    DEFAULT_UNCERTAINTY_MINUTES, OBSERVE_BATCH, JourneyEstimator, baseline_minutes
+)
+from app.services.persistent_store import PersistentStore
+from app.services.tfl_service import TfLService
+
+STATIONS = list(LONDON_STATIONS.values())
+
+
+def true_minutes(from_lat, from_lon, to_lat, to_lon):
+    """A travel time the fixed curve gets wrong but the regression can learn"""
+    distance = float(ellipsoidal_distance_km(from_lat, from_lon, to_lat, to_lon))
+    return int(round(12 + 2.2 * distance))
+
+
+def journeys(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        from_lat, from_lon = rng.uniform(51.42, 51.60), rng.uniform(-0.30, 0.05)
+        to_lat, to_lon = rng.choice(STATIONS)
+        rows.append((from_lat, from_lon, to_lat, to_lon,
+                     true_minutes(from_lat, from_lon, to_lat, to_lon)))
+    return rows
+
+
+def mean_error(estimator, rows):
+    return np.mean([abs(estimator.minutes(*row[:4]) - row[4]) for row in rows])
+
+
+async def feed(estimator, rows):
+    """Observe journeys and learn from each full batch, as TfLService does"""
+    for row in rows:
+        estimator.observe(*row)
+        if estimator.ready:
+            await estimator.learn()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PersistentStore(str(tmp_path / "store.db"))
+    yield store
+    store.close()
+
+
+def test_uncalibrated_estimator_uses_the_fixed_curve():
+    estimator = JourneyEstimator()
+    points, stations = [(51.50, -0.12), (51.55, -0.05)], STATIONS[:5]
+    distance = ellipsoidal_distance_km(
+        np.array([[51.50], [51.55]]), np.array([[-0.12], [-0.05]]),
+        np.array([s[0] for s in stations])[np.newaxis, :],
+        np.array([s[1] for s in stations])[np.newaxis, :]
+    )
+    assert not estimator.calibrated
+    assert np.array_equal(estimator.predict_matrix(points, stations), baseline_minutes(distance))
+    assert estimator.uncertainty_minutes() == DEFAULT_UNCERTAINTY_MINUTES
+
+
+@pytest.mark.asyncio
+async def test_observations_are_batched_until_enough_to_fit():
+    estimator = JourneyEstimator(min_samples=50, refit_every=100)
+    for row in journeys(OBSERVE_BATCH - 1):
+        estimator.observe(*row)
+    assert not estimator.ready
+
+    for row in journeys(OBSERVE_BATCH + 1, seed=1):
+        estimator.observe(*row)
+    # Observing only records the journey
+    assert estimator.ready and estimator.stats()["samples"] == 0
+
+    await estimator.learn()
+    assert estimator.stats()["samples"] == 2 * OBSERVE_BATCH and estimator.calibrated
+    assert estimator.fits == 1
+
+
+@pytest.mark.asyncio
+async def test_calibrated_model_beats_the_fixed_curve():
+    estimator = JourneyEstimator(min_samples=50)
+    await feed(estimator, journeys(400))
+    estimator.refit()
+
+    held_out = journeys(200, seed=7)
+    fixed = JourneyEstimator()
+    assert mean_error(estimator, held_out) < mean_error(fixed, held_out) / 2
+
+    # Journeys are scored before they are learned from, by both models
+    mae = estimator.stats()["recent_mae_minutes"]
+    assert mae["calibrated"] is not None and mae["calibrated"] < mae["baseline"]
+    assert estimator.uncertainty_minutes() < DEFAULT_UNCERTAINTY_MINUTES
+
+
+def test_destinations_off_the_catalogue_match_station_lookups():
+    estimator = JourneyEstimator(min_samples=50)
+    for row in journeys(200):
+        estimator.observe(*row)
+    estimator.refit()
+
+    points = [(51.51, -0.10), (51.47, -0.20)]
+    station = STATIONS[10]
+    nudged = (station[0] + 1e-12, station[1])
+    assert estimator.predict_matrix(points, [station]) == pytest.approx(
+        estimator.predict_matrix(points, [nudged]), abs=1e-6
+    )
+    assert estimator.minutes(*points[0], *station) == int(round(
+        float(estimator.predict_matrix(points[:1], [station])[0, 0])
+    ))
+
+
+@pytest.mark.asyncio
+async def test_flushed_journeys_reload_from_the_store(store):
+    estimator = JourneyEstimator(store=store, min_samples=50)
+    rows = journeys(150)
+    await feed(estimator, rows)
+    estimator.flush()
+
+    reloaded = JourneyEstimator(store=store, min_samples=50)
+    assert reloaded.load() == len(rows)
+    assert reloaded.calibrated
+    held_out = journeys(50, seed=3)
+    assert mean_error(reloaded, held_out) == pytest.approx(mean_error(estimator, held_out), abs=0.5)
+
+
+def test_load_without_a_store_does_nothing():
+    estimator = JourneyEstimator()
+    assert estimator.load() == 0
+    assert not estimator.calibrated
+
+
+@pytest.mark.asyncio
+async def test_service_learns_in_the_background(store):
+    service = TfLService()
+    service.estimator = JourneyEstimator(store=store, min_samples=50, refit_every=50)
+    for row in journeys(OBSERVE_BATCH * 2):
+        service._observe(*row)
+    assert service.estimator.fits == 0
+
+    await service._learning
+    assert service.estimator.calibrated and service.estimator.fits == 1
+    assert len(store.recent_journey_observations(1000)) == OBSERVE_BATCH * 2
+    await service.close()
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services import journey_parser
+from app.services.journey_parser import first_journey, parse_journey, resolve_paths
+
+FIXTURES = sorted((Path(__file__).parent.parent / "benchmarks" / "fixtures" / "tfl").glob("*.json"))
+
+
+@pytest.fixture(params=FIXTURES, ids=lambda path: path.stem)
+def payload(request):
+    return request.param.read_bytes()
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(journey_parser, "orjson", None)
+    elif journey_parser.orjson is None:
+        pytest.skip("orjson is not installed")
+
+
+def test_first_journey_matches_full_decode(payload, backend):
+    expected = json.loads(payload)["journeys"][0]
+
+    assert first_journey(payload) == expected
+    assert first_journey(payload.decode()) == expected
+
+
+def test_single_and_missing_journeys(payload, backend):
+    document = json.loads(payload)
+    only = json.dumps({**document, "journeys": document["journeys"][:1]}).encode()
+    assert first_journey(only) == document["journeys"][0]
+
+    assert first_journey(json.dumps({**document, "journeys": []}).encode()) is None
+
+
+def test_unexpected_layout_falls_back_to_full_decode(backend):
+    nested = json.dumps(
+        {"meta": {"journeys": []}, "journeys": [{"duration": 12, "legs": []}]}
+    ).encode()
+
+    assert first_journey(nested) == {"duration": 12, "legs": []}
+
+
+def test_type_tag_inside_a_string_does_not_cut_the_journey(backend):
+    tag = '{"$type":"Journey, X",'
+    document = {"journeys": [
+        {"$type": "Journey, X", "note": "," + tag, "duration": 5, "legs": []},
+        {"$type": "Journey, X", "duration": 9, "legs": []}
+    ]}
+    assert first_journey(json.dumps(document, separators=(",", ":")).encode())["duration"] == 5
+
+
+def test_parse_journey_defers_paths_until_resolved(payload):
+    raw = first_journey(payload)
+    journey = parse_journey(raw, 51.5, -0.1, 51.52, -0.14, "Alice", "Oxford Circus")
+
+    assert journey.duration_minutes == raw["duration"]
+    assert len(journey.legs) == len(raw["legs"])
+    assert journey.total_walking_duration == sum(
+        leg["duration"] for leg in raw["legs"] if leg["mode"]["name"].lower() == "walking"
+    )
+    deferred = [leg for leg in journey.legs if leg._line_string is not None]
+    assert deferred
+
+    resolve_paths(journey)
+    assert all(leg._line_string is None for leg in journey.legs)
+    assert any(leg.intermediate_stops for leg in deferred)
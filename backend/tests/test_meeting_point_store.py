@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.schemas import MeetingPointResponse, MeetingStation, ProcessedLocation, SearchStats
+from app.services import MeetingPointStore, SQLiteMeetingPointStore
+
+
+def meeting_data() -> MeetingPointResponse:
+    station = MeetingStation(
+        station_name="Green Park",
+        latitude=51.5067,
+        longitude=-0.1428,
+        average_journey_time=12.0,
+        max_journey_time=15.0,
+        total_journey_time=24.0,
+        fairness_score="Good",
+        journey_times=[]
+    )
+    return MeetingPointResponse(
+        request_id="request",
+        created_at=datetime(2024, 1, 1),
+        optimal_station=station,
+        alternative_stations=[],
+        processed_locations=[
+            ProcessedLocation(name="Alice", address=None, latitude=51.5, longitude=-0.14)
+        ],
+        map_center=(51.5, -0.14),
+        search_stats=SearchStats(
+            strategy="candidates", iterations=1, stations_evaluated=1, api_calls=0
+        )
+    )
+
+
+@pytest.fixture
+def store():
+    store = SQLiteMeetingPointStore()
+    yield store
+    store.close()
+
+
+def test_base_store_is_abstract():
+    with pytest.raises(TypeError):
+        MeetingPointStore()
+
+
+def test_saved_point_reads_back_by_id(store):
+    saved = store.save(meeting_data(), "Friday drinks", user_id="alice")
+    body = orjson.loads(store.get_json(saved.id))
+    assert body["name"] == "Friday drinks" and body["user_id"] == "alice"
+    assert body["meeting_data"]["optimal_station"]["station_name"] == "Green Park"
+    assert store.count() == 1
+
+
+def test_private_points_have_no_share_token(store):
+    saved = store.save(meeting_data(), "Private")
+    assert saved.share_token is None and not saved.is_public
+
+
+def test_share_tokens_open_public_points_only(store):
+    shared = store.save(meeting_data(), "Shared", is_public=True)
+    assert orjson.loads(store.get_shared_json(shared.share_token))["id"] == shared.id
+    assert store.get_shared_json(shared.id) is None
+    assert store.get_json("missing") is None
+
+
+def test_ids_are_unguessable(store):
+    ids = {store.save(meeting_data(), f"Point {i}").id for i in range(20)}
+    assert len(ids) == 20
+    # 16 random bytes, URL-safe base64
+    assert all(len(saved_id) >= 22 for saved_id in ids)
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.schemas import JourneyLeg, JourneyTime
+from app.services.journey_parser import first_journey, parse_journey, resolve_paths
+from app.services.persistent_store import PersistentStore
+from app.services.tfl_service import TfLService
+
+FIXTURE = Path(__file__).parent.parent / "benchmarks" / "fixtures" / "tfl"
+
+
+def make_journey(departure=None, minutes=25):
+    return JourneyTime(
+        from_location="Alice",
+        to_station="Oxford Circus",
+        duration_minutes=minutes,
+        departure_time=departure,
+        arrival_time=departure + timedelta(minutes=minutes) if departure else None,
+        legs=[JourneyLeg(
+            mode="tube",
+            from_name="Victoria",
+            to_name="Oxford Circus",
+            from_coords=(51.4965, -0.1447),
+            to_coords=(51.5152, -0.1415),
+            duration=minutes,
+            instruction="Victoria line towards Walthamstow Central",
+            intermediate_stops=[(51.4965, -0.1447), (51.5152, -0.1415)]
+        )]
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PersistentStore(str(tmp_path / "store.db"))
+    yield store
+    store.close()
+
+
+def test_journey_round_trip_and_expiry(store):
+    journey = make_journey(datetime(2024, 5, 1, 9, 0))
+    store.put_journey("live", journey, ttl_seconds=60)
+    store.put_journey("expired", journey, ttl_seconds=-1)
+
+    stored, _ = store.get_journey("live")
+    assert stored == journey
+    assert store.get_journey("expired") is None
+    assert store.purge_expired() == 1
+
+
+def test_hottest_journeys_ordered_by_hits(store):
+    for key in ("a", "b", "c"):
+        store.put_journey(key, make_journey(), ttl_seconds=60)
+    for _ in range(3):
+        store.get_journey("b")
+    store.get_journey("c")
+    store.flush_hits()
+
+    assert [key for key, _, _ in store.hottest_journeys(2)] == ["b", "c"]
+
+
+def test_geocodes_remember_failed_lookups(store):
+    store.put_geocode("victoria", (51.4965, -0.1447), ttl_seconds=60)
+    store.put_geocode("nowhere", None, ttl_seconds=60)
+
+    assert store.get_geocode("victoria")[0] == (51.4965, -0.1447)
+    assert store.get_geocode("nowhere")[0] is None
+    assert store.get_geocode("unknown") is None
+
+
+def test_journey_observations_keep_newest(store):
+    store.add_journey_observations([(51.5, -0.1, 51.6, -0.2, i) for i in range(5)], keep=3)
+
+    assert [row[4] for row in store.recent_journey_observations(10)] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_persisted_journey_is_moved_to_the_current_day(store):
+    service = TfLService(store=store)
+    departure = datetime.now().replace(microsecond=0) - timedelta(days=3)
+    key = service._cache_key(51.4965, -0.1447, 51.5152, -0.1415)
+    service._store_journey(key, make_journey(departure))
+    await service._saving
+    service._cache.clear()
+
+    journey = service._cached_journey(key)
+    assert journey.departure_time == departure + timedelta(days=3)
+    assert journey.arrival_time - journey.departure_time == timedelta(minutes=25)
+    # From memory too, and without touching the cached copy
+    assert service._cached_journey(key).departure_time == departure + timedelta(days=3)
+    assert service._cache.get(key).departure_time == departure
+
+
+@pytest.mark.asyncio
+async def test_journeys_are_persisted_off_the_request_path_with_raw_paths(store):
+    service = TfLService(store=store)
+    payload = sorted(FIXTURE.glob("*.json"))[0].read_bytes()
+    journey = parse_journey(first_journey(payload), 51.5, -0.1, 51.52, -0.14, "Alice", "Bank")
+    keys = [f"journey-{i}" for i in range(3)]
+    for key in keys:
+        service._store_journey(key, journey)
+    assert store.get_journey(keys[0]) is None
+
+    await service._saving
+    stored = [store.get_journey(key)[0] for key in keys]
+    # Neither the cached journey nor the persisted copies had their paths decoded
+    assert all(leg._line_string is not None for leg in journey.legs)
+    assert all(leg._line_string is not None for leg in stored[0].legs)
+    assert resolve_paths(stored[0]) == resolve_paths(journey)
+    await service.close()
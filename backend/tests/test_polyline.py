@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services.polyline import (
+    METRES_PER_DEGREE, POLYLINE_PRECISION, VECTORIZE_MIN_POINTS,
+    _encode_short, decode, encode, simplify
+)
+
+
+def _segment_distance(point, start, end, cos_lat):
+    """Metres from point to the segment start-end, brute force"""
+    def xy(p):
+        return np.array([p[1] * cos_lat, p[0]]) * METRES_PER_DEGREE
+
+    p, a, b = xy(point), xy(start), xy(end)
+    ab = b - a
+    length_sq = float(ab @ ab)
+    t = 0.0 if length_sq == 0 else min(1.0, max(0.0, float((p - a) @ ab) / length_sq))
+    return float(np.linalg.norm(p - (a + t * ab)))
+
+
+def _wiggly_path(n, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(scale=0.0005, size=(n, 2))
+    return [(51.5 + lat, -0.1 + lon) for lat, lon in np.cumsum(steps, axis=0)]
+
+
+def test_short_paths_are_returned_unchanged():
+    assert simplify([], 10).tolist() == []
+    assert simplify([(51.5, -0.1), (51.6, -0.1)], 10).tolist() == [[51.5, -0.1], [51.6, -0.1]]
+
+
+def test_straight_run_collapses_to_its_ends():
+    path = [(51.5 + i * 0.001, -0.1) for i in range(20)]
+    assert simplify(path, 1).tolist() == [list(path[0]), list(path[-1])]
+
+
+def test_run_doubling_back_past_an_end_is_kept():
+    # The middle vertex lies on the chord's line but 11 km beyond its end
+    path = [(51.5, -0.1), (51.6, -0.1), (51.5001, -0.1)]
+    assert len(simplify(path, 10)) == 3
+
+
+@pytest.mark.parametrize("tolerance", [2.0, 10.0, 50.0])
+def test_every_vertex_stays_within_tolerance(tolerance):
+    path = _wiggly_path(300)
+    kept = simplify(path, tolerance)
+    assert kept[0].tolist() == list(path[0]) and kept[-1].tolist() == list(path[-1])
+    assert len(kept) < len(path)
+
+    cos_lat = math.cos(math.radians(float(np.mean([p[0] for p in path]))))
+    kept_rows = [tuple(row) for row in kept.tolist()]
+    indices = [path.index(row) for row in kept_rows]
+    for start, end in zip(indices, indices[1:]):
+        for point in path[start + 1:end]:
+            assert _segment_distance(point, path[start], path[end], cos_lat) <= tolerance + 1e-6
+
+
+def test_encode_matches_the_reference_example():
+    points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    assert encode(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decode("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == points
+
+
+def test_encode_of_nothing_is_empty():
+    assert encode([]) == ""
+    assert decode("") == []
+
+
+def test_short_and_vectorized_encodings_agree():
+    path = _wiggly_path(VECTORIZE_MIN_POINTS * 2, seed=3)
+    encoded = encode(path)
+    assert encoded == _encode_short(path, POLYLINE_PRECISION)
+    assert decode(encoded) == pytest.approx(
+        [(round(lat, 5), round(lon, 5)) for lat, lon in path], abs=1e-9
+    )
@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas import LocationInput
+from app.services.geocoding_service import GeocodingService
+from app.services.meeting_calculator import MeetingCalculator
+from app.services.result_cache import ResultCache
+from app.services.tfl_service import TfLService
+from benchmarks.offline import TfLFixtures, install
+
+GROUP = [
+    LocationInput(name="Alice", latitude=51.4965, longitude=-0.1447),
+    LocationInput(name="Bob", latitude=51.5308, longitude=-0.1238),
+    LocationInput(name="Carol", latitude=51.5033, longitude=-0.0195)
+]
+
+
+class SlowFixtures(TfLFixtures):
+    """Fixture responses that take longer the longer the journey, as TfL's tend to"""
+
+    def __init__(self):
+        super().__init__()
+        self.completed = 0
+        self.cancelled = 0
+
+    async def handler(self, request):
+        body = self.body(request.url.path)
+        minutes = int(body.split(b'"duration":', 1)[1].split(b",", 1)[0])
+        try:
+            await asyncio.sleep(minutes * 0.005)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.completed += 1
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+
+
+async def search(prune, monkeypatch):
+    monkeypatch.setattr(settings, "prune_dominated_candidates", prune)
+    tfl_service, geocoding_service = TfLService(), GeocodingService()
+    fixtures = SlowFixtures()
+    install(tfl_service, geocoding_service, fixtures=fixtures)
+    tfl_service.hedge_requests = False
+    calculator = MeetingCalculator(tfl_service, geocoding_service, result_cache=ResultCache())
+    response = await calculator.find_meeting_point(GROUP, use_tfl_api=True)
+    answered = fixtures.completed
+    # Long enough for any call left running to come back
+    await asyncio.sleep(0.5)
+    assert fixtures.completed == answered
+    await tfl_service.close()
+    return response, fixtures
+
+
+def ranking(response):
+    return [
+        station.model_dump()
+        for station in [response.optimal_station, *response.alternative_stations]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pruned_search_cancels_calls_without_changing_the_answer(monkeypatch):
+    pruned, slow = await search(True, monkeypatch)
+    full, everything = await search(False, monkeypatch)
+
+    assert pruned.search_stats.pruned_calls > 0
+    assert full.search_stats.pruned_calls == 0 and everything.cancelled == 0
+    # Pruned calls were cancelled, queued or in flight, rather than left to run
+    assert slow.completed < everything.completed
+    assert slow.completed + pruned.search_stats.pruned_calls >= everything.completed
+
+    assert len(ranking(pruned)) == 4
+    assert ranking(pruned) == ranking(full)
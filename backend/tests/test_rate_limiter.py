@@ -0,0 +1,135 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    TokenBucket,
+    UpstreamScheduler,
+    parse_retry_after
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def unlimited_rate(max_concurrency):
+    return UpstreamScheduler(max_concurrency=max_concurrency, rate_per_second=1e9, burst=1e9)
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.delay_until_available() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    clock.now += 100
+    assert sum(bucket.try_acquire() for _ in range(10)) == 3
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7", 1.0) == 7.0
+    assert parse_retry_after(None, 1.5) == 1.5
+    assert parse_retry_after("soon", 2.0) == 2.0
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= parse_retry_after(when, 1.0) <= 30
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(past, 1.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    scheduler = unlimited_rate(2)
+    in_flight = peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with scheduler.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert scheduler.stats()["admitted"] == 6
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_admitted_before_background():
+    scheduler = unlimited_rate(1)
+    order = []
+
+    async def call(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire()
+    waiters = [
+        asyncio.ensure_future(call("background-1", PRIORITY_BACKGROUND)),
+        asyncio.ensure_future(call("interactive", PRIORITY_INTERACTIVE)),
+        asyncio.ensure_future(call("background-2", PRIORITY_BACKGROUND))
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 3
+    scheduler.release()
+    await asyncio.gather(*waiters)
+
+    assert order == ["interactive", "background-1", "background-2"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_admissions():
+    scheduler = UpstreamScheduler(max_concurrency=10, rate_per_second=50, burst=1)
+    start = time.perf_counter()
+
+    async def call():
+        async with scheduler.slot():
+            pass
+
+    await asyncio.gather(*(call() for _ in range(4)))
+    # One token up front, then one every 20 ms
+    assert time.perf_counter() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_backoff_pauses_admissions():
+    scheduler = unlimited_rate(5)
+    scheduler.backoff(0.05)
+    start = time.perf_counter()
+    async with scheduler.slot():
+        waited = time.perf_counter() - start
+
+    assert waited >= 0.045
+    assert scheduler.stats()["backoffs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = unlimited_rate(1)
+    await scheduler.acquire()
+    waiter = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    scheduler.release()
+
+    assert scheduler.in_flight == 0
+    await asyncio.wait_for(scheduler.acquire(), 1)
+    assert scheduler.in_flight == 1
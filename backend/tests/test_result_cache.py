@@ -0,0 +1,88 @@
+import httpx
+import pytest
+
+from app.schemas import LocationInput
+from app.services.result_cache import ResultCache
+
+ALICE = LocationInput(name="Alice", latitude=51.4965, longitude=-0.1447)
+BOB = LocationInput(name="Bob", latitude=51.5308, longitude=-0.1238)
+CAROL = LocationInput(name="Carol", latitude=51.5033, longitude=-0.0195)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_participant_order():
+    cache = ResultCache(ttl_seconds=60, max_entries=10)
+    forward = cache.key(cache.participants([ALICE, BOB, CAROL]), True)
+    backward = cache.key(cache.participants([CAROL, ALICE, BOB]), True)
+    assert forward == backward
+    assert forward != cache.key(cache.participants([ALICE, BOB, CAROL]), False)
+
+
+def test_key_snaps_coordinates_and_normalizes_addresses():
+    cache = ResultCache(ttl_seconds=60, max_entries=10, grid_metres=200)
+    nudged = LocationInput(name="Alice", latitude=51.49655, longitude=-0.14465)
+    assert cache.participant(ALICE) == cache.participant(nudged)
+    moved = LocationInput(name="Alice", latitude=51.51, longitude=-0.1447)
+    assert cache.participant(ALICE) != cache.participant(moved)
+
+    spaced = LocationInput(name="Dan", address="  King's  CROSS, ")
+    tidy = LocationInput(name="Dan", address="king's cross")
+    assert cache.participant(spaced) == cache.participant(tidy)
+
+
+def test_key_moves_to_the_next_time_bucket():
+    clock = FakeClock()
+    cache = ResultCache(ttl_seconds=3600, max_entries=10, time_bucket_minutes=15, clock=clock)
+    participants = cache.participants([ALICE, BOB])
+    key = cache.key(participants)
+    clock.now += 15 * 60
+    assert cache.key(participants) != key
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(ttl_seconds=60, max_entries=0)
+    participants = cache.participants([ALICE, BOB])
+    cache.put(cache.key(participants), participants, object())
+    assert not cache.enabled
+    assert cache.get(cache.key(participants)) is None
+
+
+@pytest.mark.asyncio
+async def test_reordered_request_is_answered_from_the_cache_in_its_own_order(calculator):
+    first = await calculator.find_meeting_point([ALICE, BOB, CAROL], use_tfl_api=True)
+    second = await calculator.find_meeting_point([CAROL, ALICE, BOB], use_tfl_api=True)
+    assert calculator.result_cache.stats()["hits"] == 1
+    assert second.request_id != first.request_id
+    assert [loc.name for loc in second.processed_locations] == ["Carol", "Alice", "Bob"]
+
+    assert second.optimal_station.station_name == first.optimal_station.station_name
+    for before, after in zip(
+        [first.optimal_station, *first.alternative_stations],
+        [second.optimal_station, *second.alternative_stations]
+    ):
+        by_name = {journey.from_location: journey for journey in before.journey_times}
+        order = [journey.from_location for journey in after.journey_times]
+        assert order == ["Carol", "Alice", "Bob"]
+        assert [journey.duration_minutes for journey in after.journey_times] == [
+            by_name[name].duration_minutes for name in ("Carol", "Alice", "Bob")
+        ]
+
+
+@pytest.mark.asyncio
+async def test_answers_with_estimated_journeys_are_not_cached(calculator):
+    async def not_found(request):
+        return httpx.Response(404, json={"message": "No journey found"})
+
+    calculator.tfl_service.client = httpx.AsyncClient(transport=httpx.MockTransport(not_found))
+    response = await calculator.find_meeting_point([ALICE, BOB], use_tfl_api=True)
+
+    journeys = response.optimal_station.journey_times
+    assert any(journey.route_type == "estimated" for journey in journeys)
+    assert calculator.result_cache.stats()["entries"] == 0
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "journey"
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+    assert results == ["journey"] * 5
+    assert calls == 1
+    assert flight.stats()["coalesced"] == 4
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_one_caller_cancelling_does_not_fail_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "journey"
+
+    first = asyncio.ensure_future(flight.do("key", fetch))
+    second = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "journey"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_caller_joining_after_last_waiter_left_gets_a_fresh_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            # Keep unwinding across a few loop iterations, as an HTTP call does
+            await asyncio.sleep(0)
+            raise
+        return calls
+
+    abandoned = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    await asyncio.sleep(0)
+
+    # The abandoned task is still unwinding; a new caller must not join it
+    assert await flight.do("key", fetch) == 2
+    assert abandoned.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0)
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fetch) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
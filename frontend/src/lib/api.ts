@@ -20,6 +20,7 @@ export interface JourneyLeg {
   stops?: number
   instruction: string
   intermediate_stops?: [number, number][]
+  encoded_path?: string
 }
 
 export interface JourneyDetail {
@@ -48,9 +49,25 @@ export interface MeetingStation {
 export interface MeetingPointRequest {
   locations: LocationInput[]
   use_tfl_api?: boolean
+  use_travel_matrix?: boolean
+  strategy?: 'candidates' | 'greedy'
+  max_api_calls?: number
+  path_format?: 'coordinates' | 'polyline'
+  detail?: 'summary' | 'full'
+  leg_fields?: (keyof JourneyLeg)[]
   preferences?: Record<string, any>
 }
 
+export interface SearchStats {
+  strategy: string
+  iterations: number
+  stations_evaluated: number
+  api_calls: number
+  pruned_calls?: number
+  winner_estimate_rank?: number | null
+  estimate_regret_minutes?: number | null
+}
+
 export interface MeetingPointResponse {
   request_id: string
   created_at: string
@@ -63,6 +80,58 @@ export interface MeetingPointResponse {
     longitude: number
   }>
   map_center: [number, number]
+  search_stats?: SearchStats
+}
+
+export interface SaveMeetingPointRequest {
+  name: string
+  description?: string
+  meeting_data: MeetingPointResponse
+  user_id?: string
+  is_public?: boolean
+}
+
+export interface SavedMeetingPoint {
+  id: string
+  user_id: string | null
+  name: string
+  description: string | null
+  meeting_data: MeetingPointResponse
+  created_at: string
+  updated_at: string
+  is_public: boolean
+  share_token: string | null
+}
+
+export type StationScore = Omit<MeetingStation, 'journey_times'>
+
+export interface MeetingPointStreamHandlers {
+  onEstimate?: (estimate: {
+    processed_locations: MeetingPointResponse['processed_locations']
+    map_center: [number, number]
+    stations: StationScore[]
+  }) => void
+  onStation?: (update: StationScore & {
+    resolved_journeys: number
+    completed: number
+    total: number
+  }) => void
+}
+
+export interface GeocodeBatchResult {
+  index: number
+  address: string
+  found: boolean
+  latitude: number | null
+  longitude: number | null
+}
+
+export interface PlaceSuggestion {
+  name: string
+  kind: 'station' | 'landmark' | 'area' | 'postcode'
+  latitude: number
+  longitude: number
+  description: string | null
 }
 
 export class MeetingPointAPI {
@@ -89,6 +158,98 @@ export class MeetingPointAPI {
     return response.json()
   }
 
+  async calculateMeetingPointStream(
+    request: MeetingPointRequest,
+    handlers: MeetingPointStreamHandlers = {}
+  ): Promise<MeetingPointResponse> {
+    const response = await fetch(`${this.baseUrl}/api/meeting-points/calculate/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+      },
+      body: JSON.stringify(request),
+    })
+
+    if (!response.ok || !response.body) {
+      throw new Error('Failed to calculate meeting point')
+    }
+
+    // Server-Sent Events: blocks of "event: <name>" and "data: <json>" lines
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffered = ''
+    let result: MeetingPointResponse | null = null
+
+    const handleEvent = (block: string) => {
+      let event = 'message'
+      let data = ''
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (!data) return
+      const payload = JSON.parse(data)
+      if (event === 'estimate') handlers.onEstimate?.(payload)
+      else if (event === 'station') handlers.onStation?.(payload)
+      else if (event === 'result') result = payload
+      else if (event === 'error') throw new Error(payload.detail || 'Failed to calculate meeting point')
+    }
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffered += decoder.decode(value, { stream: true })
+      const blocks = buffered.split('\n\n')
+      buffered = blocks.pop() ?? ''
+      blocks.forEach(handleEvent)
+    }
+    handleEvent(buffered)
+
+    if (!result) {
+      throw new Error('Meeting point stream ended without a result')
+    }
+    return result
+  }
+
+  async saveMeetingPoint(request: SaveMeetingPointRequest): Promise<SavedMeetingPoint> {
+    const response = await fetch(`${this.baseUrl}/api/saved-meeting-points`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(request),
+    })
+
+    if (!response.ok) {
+      throw new Error('Failed to save meeting point')
+    }
+
+    return response.json()
+  }
+
+  async getSavedMeetingPoint(id: string): Promise<SavedMeetingPoint> {
+    const response = await fetch(`${this.baseUrl}/api/saved-meeting-points/${encodeURIComponent(id)}`)
+
+    if (!response.ok) {
+      throw new Error('Saved meeting point not found')
+    }
+
+    return response.json()
+  }
+
+  async getSharedMeetingPoint(shareToken: string): Promise<SavedMeetingPoint> {
+    const response = await fetch(
+      `${this.baseUrl}/api/saved-meeting-points/shared/${encodeURIComponent(shareToken)}`
+    )
+
+    if (!response.ok) {
+      throw new Error('Shared meeting point not found')
+    }
+
+    return response.json()
+  }
+
   async geocodeAddress(address: string): Promise<{ latitude: number; longitude: number }> {
     const response = await fetch(`${this.baseUrl}/api/meeting-points/geocode`, {
       method: 'POST',
@@ -109,6 +270,60 @@ export class MeetingPointAPI {
     }
   }
 
+  async geocodeAddresses(
+    addresses: string[],
+    onResult?: (result: GeocodeBatchResult) => void
+  ): Promise<GeocodeBatchResult[]> {
+    const response = await fetch(`${this.baseUrl}/api/meeting-points/geocode/batch`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ addresses }),
+    })
+
+    if (!response.ok || !response.body) {
+      throw new Error('Failed to geocode addresses')
+    }
+
+    // Results stream back as NDJSON, one line per address as it resolves
+    const results: GeocodeBatchResult[] = new Array(addresses.length)
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffered = ''
+
+    const handleLine = (line: string) => {
+      if (!line.trim()) return
+      const result: GeocodeBatchResult = JSON.parse(line)
+      results[result.index] = result
+      onResult?.(result)
+    }
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffered += decoder.decode(value, { stream: true })
+      const lines = buffered.split('\n')
+      buffered = lines.pop() ?? ''
+      lines.forEach(handleLine)
+    }
+    handleLine(buffered)
+
+    return results
+  }
+
+  async autocomplete(query: string, limit: number = 8): Promise<PlaceSuggestion[]> {
+    const params = new URLSearchParams({ q: query, limit: String(limit) })
+    const response = await fetch(`${this.baseUrl}/api/meeting-points/autocomplete?${params}`)
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch suggestions')
+    }
+
+    const data = await response.json()
+    return data.results
+  }
+
   async getStations(): Promise<Array<{ name: string; latitude: number; longitude: number }>> {
     const response = await fetch(`${this.baseUrl}/api/meeting-points/stations`)
 